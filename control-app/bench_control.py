@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Serialization throughput of the control path, without Tk or a visualizer.
+
+    python3 bench_control.py [--iterations N]
+
+Times each stage a knob update goes through: dirty-field tracking,
+control.txt formatting, atomic publish, OSC bundle encoding and the
+shared-memory seqlock write (when /dev/shm is available).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from control_protocol import AtomicControlFile, format_control_lines
+from control_state import ControlState
+from osc import control_messages, encode_bundle
+
+
+def bench(name, iterations, func):
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {iterations / elapsed:>12,.0f} ops/s  {elapsed / iterations * 1e6:8.2f} us/op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LUMIUS control serialization")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    state = ControlState()
+    state.take_delta()
+    values = state.snapshot()
+
+    def set_and_delta(i):
+        state.set('speed', (i % 50) / 10.0)
+        state.take_delta()
+
+    bench("state set+delta", n, set_and_delta)
+    bench("format control.txt", n, lambda i: format_control_lines(values))
+    bench("encode OSC bundle", n, lambda i: encode_bundle(control_messages(values)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        publisher = AtomicControlFile(os.path.join(tmp, "control.txt"))
+        bench("atomic file publish", max(1, n // 10), lambda i: publisher.publish(format_control_lines(values)))
+
+    if os.path.isdir("/dev/shm"):
+        from control_shm import ShmControlWriter
+        path = f"/dev/shm/lumius_bench_{os.getpid()}"
+        writer = ShmControlWriter(path)
+        try:
+            bench("shm seqlock publish", n, lambda i: writer.publish(values))
+        finally:
+            writer.close()
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Boot-time spans for lumius_launcher.py's boot report.
+
+When the launcher starts a component it sets LUMIUS_BOOT_TRACE to a
+JSON-lines file; each component appends one line per start-up phase:
+
+    {"component": "control", "phase": "tk_init", "start": 1718900000.12, "end": 1718900000.31, "pid": 812}
+
+Times are wall clock (epoch seconds) so spans from different processes,
+including the visualizer's C++ side, line up. Without the variable every
+call is a no-op. The launcher also passes the spawn time in
+LUMIUS_BOOT_SPAWN, so interpreter start-up and imports can be measured.
+"""
+import json
+import os
+import time
+
+TRACE_ENV = "LUMIUS_BOOT_TRACE"
+SPAWN_ENV = "LUMIUS_BOOT_SPAWN"
+
+
+def record(component, phase, start, end=None):
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return
+    span = {"component": component, "phase": phase, "start": start,
+            "end": time.time() if end is None else end, "pid": os.getpid()}
+    try:
+        # One short O_APPEND write per span: lines from concurrent processes never interleave
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(span) + "\n").encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def spawn_time():
+    """When the launcher started this process (LUMIUS_BOOT_SPAWN), or None."""
+    try:
+        return float(os.environ[SPAWN_ENV])
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Clock offset estimation between the panel and its visualizer nodes.
+
+Scheduled updates carry an "apply at" time, which only lines up across
+Pis if the panel knows how far each node's clock is from its own. A probe
+is a ping answered with the node's clock reading (the OSC listener puts it
+in the reply's bundle timetag; the SSH sink prints it); assuming the reply
+was taken halfway through the round trip:
+
+    offset = remote - (sent + received) / 2     error <= rtt / 2
+
+Network jitter only ever adds delay, so the sample with the lowest round
+trip in the recent window is the most trustworthy one.
+"""
+import collections
+import time
+
+PROBE_WINDOW = 16
+PROBES_PER_SYNC = 5
+
+
+class ClockEstimator:
+    def __init__(self, window=PROBE_WINDOW):
+        self.samples = collections.deque(maxlen=window)  # (rtt, offset)
+
+    def add(self, sent, remote, received):
+        rtt = received - sent
+        if rtt < 0:
+            return
+        self.samples.append((rtt, remote - (sent + received) / 2.0))
+
+    def best(self):
+        return min(self.samples) if self.samples else None
+
+    def offset(self):
+        """Remote clock minus local clock, in seconds (None before the first probe)."""
+        best = self.best()
+        return None if best is None else best[1]
+
+    def uncertainty(self):
+        best = self.best()
+        return None if best is None else best[0] / 2.0
+
+    def to_remote(self, local_time):
+        return local_time + (self.offset() or 0.0)
+
+
+def probe(estimator, ping, count=PROBES_PER_SYNC, clock=time.time):
+    """Run `count` pings (`ping()` returns the remote clock reading) into `estimator`."""
+    for _ in range(count):
+        sent = clock()
+        remote = ping()
+        received = clock()
+        if remote is not None:
+            estimator.add(sent, remote, received)
+    return estimator.offset()
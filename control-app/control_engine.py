@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Headless LUMIUS control engine.
+
+Holds the control state (no Tk involved), coalesces updates to the
+visualizer frame rate and publishes them to any number of transports
+(control.txt, shared memory, SSH stream, OSC/UDP). The Tk panels, the OSC
+listener and plain scripts all drive the visualizer through this class:
+
+    engine = ControlEngine([FileTransport("bin/data/control.txt")])
+    engine.set('effect', 3)
+    engine.flush_now()
+
+Can also be used from the shell:
+
+    python3 control_engine.py effect=3 speed=2.0 --transport udp:192.168.0.17
+    python3 control_engine.py speed=4.0 rgb_b=0 --ramp 3 --easing sine
+"""
+import argparse
+import sys
+import threading
+
+from control_protocol import CONTROL_TYPES
+from control_state import ControlState, DEFAULT_FULL_INTERVAL
+from control_writer import CoalescingWriter, DEFAULT_MAX_RATE
+from transports import FileTransport, ShmTransport, UdpTransport
+
+DEFAULT_CONTROL_FILE = "../openframeworks-visualizer/bin/data/control.txt"
+
+
+class ControlEngine:
+    def __init__(self, transports=(), max_rate=DEFAULT_MAX_RATE, schedule=None,
+                 full_interval=DEFAULT_FULL_INTERVAL, on_error=None):
+        self.state = ControlState(full_interval=full_interval)
+        self.transports = list(transports)
+        self.transports_lock = threading.Lock()
+        self.on_error = on_error
+        self.writer = CoalescingWriter(self._flush, max_rate=max_rate, schedule=schedule)
+        self.errors = 0
+
+    def add_transport(self, transport):
+        with self.transports_lock:
+            self.transports.append(transport)
+        # A new consumer knows nothing yet
+        self.state.force_full()
+
+    def remove_transport(self, transport, close=True):
+        """Stop publishing to `transport`; `close=False` leaves closing (and draining) to the caller."""
+        with self.transports_lock:
+            if transport in self.transports:
+                self.transports.remove(transport)
+        if close:
+            transport.close()
+
+    def set(self, name, value):
+        self.state.set(name, value)
+        self.writer.request()
+
+    def update(self, values):
+        self.state.update(values)
+        self.writer.request()
+
+    def get(self, name):
+        return self.state.get(name)
+
+    def snapshot(self):
+        return self.state.snapshot()
+
+    def request(self):
+        """Publish at the next rate-limited slot."""
+        self.writer.request()
+
+    def flush_now(self, music_action=None, apply_at=None):
+        """
+        Publish immediately (effect switches, music commands). With `apply_at`
+        (Unix time on the consumer's clock) the consumer holds it until then.
+        """
+        self.writer.flush_now(music_action, apply_at)
+
+    def music(self, action):
+        self.writer.flush_now(action)
+
+    def resync(self):
+        self.state.force_full()
+        self.writer.request()
+
+    def system(self, command):
+        for transport in self._transports():
+            try:
+                transport.send_system(command)
+            except Exception as e:
+                self.report_error(transport, e)
+
+    def _transports(self):
+        with self.transports_lock:
+            return list(self.transports)
+
+    def _flush(self, music_action=None, apply_at=None):
+        transports = self._transports()
+        if any(transport.resync_needed() for transport in transports):
+            self.state.force_full()
+
+        full, delta = self.state.take_delta()
+        if not delta and not music_action:
+            return
+        values = self.state.snapshot()
+
+        for transport in transports:
+            try:
+                if apply_at is None:
+                    transport.send(full, delta, values, music_action)
+                else:
+                    transport.send_at(apply_at, full, delta, values, music_action)
+            except Exception as e:
+                self.report_error(transport, e)
+
+    def report_error(self, transport, error):
+        self.errors += 1
+        if self.on_error:
+            self.on_error(transport, error)
+        else:
+            print(f"Control transport {transport.name}: {error}", file=sys.stderr)
+
+    def stats(self):
+        stats = self.writer.stats()
+        stats['errors'] = self.errors
+        return stats
+
+    def close(self):
+        for transport in self._transports():
+            transport.close()
+        with self.transports_lock:
+            self.transports = []
+
+
+def make_transport(spec, owned_fields=None):
+    """
+    file[:path] | shm[:path] | udp:host[:port]. `owned_fields`: the snapshot
+    transports only replace these fields and keep the rest as the consumer has it.
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "file":
+        return FileTransport(arg or DEFAULT_CONTROL_FILE, owned_fields)
+    if kind == "shm":
+        return ShmTransport(arg or None, owned_fields)
+    if kind == "udp":
+        host, _, port = arg.partition(":")
+        if not host:
+            raise ValueError("udp transport needs a host: udp:HOST[:PORT]")
+        return UdpTransport(host, int(port) if port else None)
+    raise ValueError(f"unknown transport: {spec}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Set LUMIUS controls without the GUI")
+    parser.add_argument("assignments", nargs="*", metavar="FIELD=VALUE",
+                        help=f"fields: {', '.join(CONTROL_TYPES)}")
+    parser.add_argument("--transport", action="append", default=[],
+                        help="file[:path] (default), shm[:path] or udp:host[:port]; repeatable")
+    parser.add_argument("--music", choices=["play", "pause"], help="send a music command")
+    parser.add_argument("--ramp", type=float, metavar="SECONDS",
+                        help="glide continuous fields to their new values over this time")
+    parser.add_argument("--easing", default="ease_in_out", help="ramp curve (default: ease_in_out)")
+    args = parser.parse_args()
+
+    engine = ControlEngine([make_transport(spec) for spec in args.transport or ["file"]])
+
+    # Only the given fields change: start from what the visualizer already has
+    for transport in engine.transports:
+        current = transport.current_values()
+        if current:
+            engine.state.update(current)
+    engine.state.mark_synced()
+
+    targets = {}
+    for assignment in args.assignments:
+        name, _, value = assignment.partition("=")
+        if name not in CONTROL_TYPES or not value:
+            parser.error(f"bad assignment: {assignment}")
+        targets[name] = CONTROL_TYPES[name](value)
+
+    if args.ramp:
+        from ramps import DISCRETE_FIELDS, EASINGS, RampEngine
+        if args.easing not in EASINGS:
+            parser.error(f"unknown easing: {args.easing} (choose from {', '.join(EASINGS)})")
+        for name in DISCRETE_FIELDS:
+            if name in targets:
+                engine.state.set(name, targets.pop(name))
+        ramps = RampEngine(engine)
+        ramps.ramp_many(targets, args.ramp, args.easing)
+        ramps.wait()
+    else:
+        engine.state.update(targets)
+    engine.flush_now(args.music)
+    engine.close()
+    return 1 if engine.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
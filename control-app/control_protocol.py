@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+LUMIUS control file format and atomic publication.
+
+A published snapshot looks like:
+
+    seq:42
+    effect:1
+    rgb_r:255
+    ...
+    end:42
+
+Snapshots are written to a temporary file in the same directory and renamed
+over `control.txt`, so the visualizer never observes a half-written file.
+The `seq`/`end` pair lets the reader reject incomplete snapshots from
+writers that cannot rename (legacy in-place writers) and skip duplicates.
+Each writer continues from the seq on disk, so several processes can
+publish to the same file.
+"""
+import os
+
+CONTROL_FIELDS = ('effect', 'rgb_r', 'rgb_g', 'rgb_b', 'speed', 'intensity', 'volume')
+
+# Same defaults the visualizer writes into its initial control.txt
+CONTROL_DEFAULTS = {
+    'effect': 1,
+    'rgb_r': 255,
+    'rgb_g': 255,
+    'rgb_b': 255,
+    'speed': 1.0,
+    'intensity': 1.0,
+    'volume': 50.0,
+}
+
+CONTROL_TYPES = {
+    'effect': int,
+    'rgb_r': int,
+    'rgb_g': int,
+    'rgb_b': int,
+    'speed': float,
+    'intensity': float,
+    'volume': float,
+}
+
+
+CONTROL_FORMATS = {
+    'effect': '{}',
+    'rgb_r': '{}',
+    'rgb_g': '{}',
+    'rgb_b': '{}',
+    'speed': '{:.1f}',
+    'intensity': '{:.1f}',
+    'volume': '{:.0f}',
+}
+
+
+def format_control_lines(values, music_action=None):
+    """key:value lines in canonical order; `values` may hold any subset of the fields."""
+    lines = [f"{name}:{CONTROL_FORMATS[name].format(values[name])}"
+             for name in CONTROL_FIELDS if name in values]
+    if music_action:
+        lines.append(f"music:{music_action}")
+    return lines
+
+
+def parse_control_lines(text):
+    """Known control fields from a control.txt snapshot (framing and one-shots ignored)."""
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.strip().partition(":")
+        if key in CONTROL_TYPES and value:
+            values[key] = CONTROL_TYPES[key](float(value))
+    return values
+
+
+class AtomicControlFile:
+    def __init__(self, path, seq=None):
+        self.path = path
+        # Per process: several writers (panel, sink, OSC listener, bridges) share one control.txt
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        # Continue after the last published snapshot so a restarted writer is not taken for a duplicate
+        self.seq = self.read_seq() if seq is None else seq
+
+    def read_seq(self):
+        try:
+            with open(self.path) as f:
+                key, _, value = f.readline().strip().partition(":")
+            return int(value) if key == "seq" else 0
+        except (OSError, ValueError):
+            return 0
+
+    def publish(self, lines):
+        # Continue after whatever another writer published since our last snapshot
+        self.seq = max(self.seq, self.read_seq()) + 1
+        content = [f"seq:{self.seq}"] + list(lines) + [f"end:{self.seq}"]
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.tmp_path, 'w') as f:
+            f.write("\n".join(content) + "\n")
+        # rename() is atomic: readers see either the old or the new snapshot
+        os.replace(self.tmp_path, self.path)
+        return self.seq
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Shared-memory control block for local (same machine) panels.
+
+The panel maps a small fixed-layout file under /dev/shm and updates it in
+place; the visualizer maps the same file once and, per frame, only compares
+the sequence counter. Must stay in sync with `src/controlShm.h`.
+
+Layout (little-endian, 64 bytes, LAYOUT_VERSION 1):
+
+    offset  type  field
+         0  u32   magic        'LUMC'
+         4  u16   version      LAYOUT_VERSION
+         6  u16   size         BLOCK_SIZE
+         8  u32   seq          seqlock counter, odd while a write is in progress
+        12  i32   effect
+        16  i32   rgb_r        0-255
+        20  i32   rgb_g
+        24  i32   rgb_b
+        28  f32   speed
+        32  f32   intensity
+        36  f32   volume       0-100
+        40  u32   music_cmd    0 none, 1 play, 2 pause
+        44  u32   music_seq    bumped on every music command
+        48  u32   writer_pid
+        52  u32   apply_sec    scheduled apply time (Unix seconds), 0 = now
+        56  u32   apply_usec
+        60  -     reserved (4 bytes)
+"""
+import mmap
+import os
+import struct
+
+SHM_PATH = "/dev/shm/lumius_control"
+
+MAGIC = 0x434D554C  # b'LUMC' read as little-endian u32
+LAYOUT_VERSION = 1
+
+HEADER_FORMAT = '<IHH'
+SEQ_FORMAT = '<I'
+PAYLOAD_FORMAT = '<iiiifffIIIII'
+BLOCK_FORMAT = '<IHHIiiiifffIIIII4x'
+BLOCK_SIZE = struct.calcsize(BLOCK_FORMAT)
+
+SEQ_OFFSET = 8
+PAYLOAD_OFFSET = 12
+
+MUSIC_COMMANDS = {None: 0, 'play': 1, 'pause': 2}
+
+assert BLOCK_SIZE == 64
+
+
+class ShmControlWriter:
+    def __init__(self, path=SHM_PATH):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            if os.fstat(fd).st_size < BLOCK_SIZE:
+                os.ftruncate(fd, BLOCK_SIZE)
+            self.block = mmap.mmap(fd, BLOCK_SIZE, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+
+        magic, version, _ = struct.unpack_from(HEADER_FORMAT, self.block, 0)
+        if magic == MAGIC and version == LAYOUT_VERSION:
+            # Continue the existing sequence so a running visualizer sees our first write
+            seq, = struct.unpack_from(SEQ_FORMAT, self.block, SEQ_OFFSET)
+            music_seq = struct.unpack_from(PAYLOAD_FORMAT, self.block, PAYLOAD_OFFSET)[8]
+            self.seq = (seq + 1) & ~1
+            self.music_seq = music_seq
+        else:
+            self.seq = 0
+            self.music_seq = 0
+            struct.pack_into(SEQ_FORMAT, self.block, SEQ_OFFSET, 0)
+            struct.pack_into(HEADER_FORMAT, self.block, 0, MAGIC, LAYOUT_VERSION, BLOCK_SIZE)
+
+    def publish(self, values, music_action=None, apply_at=None):
+        music_cmd = MUSIC_COMMANDS.get(music_action, 0)
+        apply_sec, apply_usec = divmod(int(round(apply_at * 1e6)), 1000000) if apply_at else (0, 0)
+        # Continue after whatever another writer (panel, pico_bridge, tempo) published since our
+        # last write: a reused seq or music_seq would be taken for one the visualizer already has
+        seq, = struct.unpack_from(SEQ_FORMAT, self.block, SEQ_OFFSET)
+        self.seq = max(self.seq, (seq + 1) & ~1)
+        self.music_seq = max(self.music_seq, struct.unpack_from(PAYLOAD_FORMAT, self.block, PAYLOAD_OFFSET)[8])
+        if music_cmd:
+            self.music_seq = (self.music_seq + 1) & 0xFFFFFFFF
+
+        payload = struct.pack(PAYLOAD_FORMAT,
+                              int(values['effect']),
+                              int(values['rgb_r']), int(values['rgb_g']), int(values['rgb_b']),
+                              float(values['speed']), float(values['intensity']), float(values['volume']),
+                              music_cmd, self.music_seq, os.getpid(), apply_sec, apply_usec)
+
+        # Seqlock: odd while writing, even once the payload is complete
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        struct.pack_into(SEQ_FORMAT, self.block, SEQ_OFFSET, self.seq)
+        self.block[PAYLOAD_OFFSET:PAYLOAD_OFFSET + len(payload)] = payload
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        struct.pack_into(SEQ_FORMAT, self.block, SEQ_OFFSET, self.seq)
+        return self.seq
+
+    def read(self):
+        (magic, version, size, seq, effect, rgb_r, rgb_g, rgb_b,
+         speed, intensity, volume, music_cmd, music_seq, writer_pid,
+         apply_sec, apply_usec) = struct.unpack_from(BLOCK_FORMAT, self.block, 0)
+        return {
+            'seq': seq,
+            'effect': effect,
+            'rgb_r': rgb_r,
+            'rgb_g': rgb_g,
+            'rgb_b': rgb_b,
+            'speed': speed,
+            'intensity': intensity,
+            'volume': volume,
+            'music_cmd': music_cmd,
+            'music_seq': music_seq,
+            'writer_pid': writer_pid,
+            'apply_at': apply_sec + apply_usec / 1e6 if apply_sec else None,
+        }
+
+    def close(self):
+        self.block.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+LUMIUS control sink - remote end of the persistent SSH control channel.
+
+Uploaded to the Raspberry Pi and started once per session by the remote
+control panel. Reads control frames from stdin (key:value lines followed by
+an empty line). Frames are deltas: only changed fields are sent, and a
+frame starting with `full:1` replaces the whole state. The merged state is
+published atomically (temp file + rename) with a seq/end pair, exactly like
+the local panel does.
+
+Group commit (several Pis switching on the same frame): a frame starting
+with `stage:<id>` is held back, and a later `commit:<id>` frame applies
+every held frame up to that id as one publication.
+
+Scheduled updates carry an `apply_at:<unix time>` line, passed through to
+the snapshot for the visualizer. A `ping:<n>` frame is answered on stdout
+with `pong:<n>:<unix time>` so the panel can estimate this Pi's clock offset.
+
+With `--telemetry`, a `telemetry:<field>=<value>,...` line (see
+telemetry.py) is printed twice a second for the panel's status display.
+"""
+import sys
+import threading
+import time
+
+from control_protocol import AtomicControlFile, CONTROL_FIELDS
+from telemetry import TelemetryPublisher, format_telemetry, status_path_for
+
+
+def merge_frame(state, lines):
+    """Apply a frame to state; returns the one-shot lines (music, system) it carried."""
+    if lines[0] == "full:1":
+        state.clear()
+        lines = lines[1:]
+
+    one_shot = []
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key in CONTROL_FIELDS:
+            state[key] = value
+        else:
+            one_shot.append(line)
+    return one_shot
+
+
+def split_stage(lines):
+    """(stage id, remaining lines) for a staged frame, (None, lines) otherwise."""
+    key, _, value = lines[0].partition(":")
+    if key == "stage":
+        return int(value), lines[1:]
+    return None, lines
+
+
+def snapshot_lines(state, one_shot):
+    return [f"{key}:{state[key]}" for key in CONTROL_FIELDS if key in state] + one_shot
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--telemetry"]
+    if len(args) != 1:
+        print("usage: control_sink.py <control_file> [--telemetry]", file=sys.stderr)
+        return 2
+
+    publisher = AtomicControlFile(args[0])
+    output_lock = threading.Lock()
+
+    def reply(line):
+        # Pongs and telemetry come from different threads; keep lines whole
+        with output_lock:
+            print(line, flush=True)
+
+    # Tell the panel we are up before the first frame arrives
+    reply("ready")
+    if "--telemetry" in sys.argv[1:]:
+        TelemetryPublisher(status_path_for(args[0]),
+                           lambda values: reply(f"telemetry:{format_telemetry(values)}")).start()
+
+    state = {}
+    staged = []
+    lines = []
+
+    def apply(frame):
+        key, _, value = frame[0].partition(":")
+        if key == "ping":
+            reply(f"pong:{value}:{time.time():.6f}")
+            return
+        if key == "commit":
+            ready = [rest for stage_id, rest in staged if stage_id <= int(value)]
+            staged[:] = [(stage_id, rest) for stage_id, rest in staged if stage_id > int(value)]
+            if not ready:
+                return
+            one_shot = []
+            for rest in ready:
+                one_shot += merge_frame(state, rest)
+            publisher.publish(snapshot_lines(state, one_shot))
+            return
+        stage_id, frame = split_stage(frame)
+        if stage_id is not None:
+            staged.append((stage_id, frame))
+        elif frame:
+            publisher.publish(snapshot_lines(state, merge_frame(state, frame)))
+
+    for raw in sys.stdin:
+        line = raw.strip()
+        if line:
+            lines.append(line)
+        elif lines:
+            apply(lines)
+            lines = []
+
+    if lines:
+        apply(lines)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Control model with dirty-field tracking.
+
+Producers set values as often as they like; consumers call `take_delta()`
+to get only the fields that changed since their last call. Every
+`full_interval` seconds (and on the first call, or after `force_full()`)
+the full state is returned instead, so a consumer that missed a message
+(dropped datagram, reconnect) converges again.
+"""
+import threading
+import time
+
+from control_protocol import CONTROL_DEFAULTS, CONTROL_FIELDS, CONTROL_TYPES
+
+DEFAULT_FULL_INTERVAL = 2.0
+
+
+class ControlState:
+    def __init__(self, values=None, full_interval=DEFAULT_FULL_INTERVAL, clock=time.monotonic):
+        self.values = dict(CONTROL_DEFAULTS)
+        if values:
+            self.values.update(values)
+        self.full_interval = full_interval
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        self.dirty = set()
+        self.need_full = True
+        self.last_full = None
+
+    def set(self, name, value):
+        if name not in CONTROL_TYPES:
+            raise KeyError(f"unknown control field: {name}")
+        value = CONTROL_TYPES[name](value)
+        with self.lock:
+            if self.values[name] != value:
+                self.values[name] = value
+                self.dirty.add(name)
+
+    def update(self, values):
+        for name, value in values.items():
+            self.set(name, value)
+
+    def get(self, name):
+        with self.lock:
+            return self.values[name]
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.values)
+
+    def mark_synced(self):
+        """Consumers already hold the current values: next delta starts from here."""
+        with self.lock:
+            self.dirty.clear()
+            self.need_full = False
+            self.last_full = self.clock()
+
+    def force_full(self):
+        with self.lock:
+            self.need_full = True
+
+    def take_delta(self):
+        """Return (is_full, values): changed fields only, or everything when a resync is due."""
+        with self.lock:
+            now = self.clock()
+            if self.need_full or self.last_full is None or now - self.last_full >= self.full_interval:
+                self.need_full = False
+                self.last_full = now
+                self.dirty.clear()
+                return True, dict(self.values)
+
+            delta = {name: self.values[name] for name in CONTROL_FIELDS if name in self.dirty}
+            self.dirty.clear()
+            return False, delta
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Rate-limited, coalescing control writer.
+
+Rotary drags fire hundreds of motion events per second while the visualizer
+only reads its controls once per frame. `CoalescingWriter` collapses bursts
+of update requests into at most `max_rate` flushes per second. The flush
+callback always reads the latest values, so the last change wins. Discrete
+events (effect or music changes) bypass the limit with `flush_now`.
+"""
+import threading
+import time
+
+DEFAULT_MAX_RATE = 30.0  # visualizer runs at 30 fps
+
+
+def thread_scheduler(delay, callback):
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+
+
+def tk_scheduler(root):
+    # Keep flushes on the Tk thread so the callback may touch widgets
+    return lambda delay, callback: root.after(int(delay * 1000), callback)
+
+
+class CoalescingWriter:
+    def __init__(self, flush, max_rate=DEFAULT_MAX_RATE, schedule=None, clock=time.monotonic):
+        self.flush_fn = flush
+        self.min_interval = 1.0 / max_rate
+        self.schedule = schedule or thread_scheduler
+        self.clock = clock
+
+        self.lock = threading.RLock()
+        self.pending = False
+        self.timer_armed = False
+        self.last_flush = None
+
+        self.requests = 0
+        self.writes = 0
+        self.suppressed = 0
+
+    def request(self):
+        """Mark the controls dirty; they are written at the next allowed slot."""
+        with self.lock:
+            self.requests += 1
+            if self.pending:
+                # Absorbed by the flush that is already scheduled
+                self.suppressed += 1
+                return
+
+            now = self.clock()
+            if self.last_flush is None or now - self.last_flush >= self.min_interval:
+                self._flush()
+                return
+
+            self.pending = True
+            if not self.timer_armed:
+                self.timer_armed = True
+                self.schedule(self.last_flush + self.min_interval - now, self._on_timer)
+
+    def flush_now(self, *args, **kwargs):
+        """Write immediately, folding in any pending request."""
+        with self.lock:
+            if self.pending:
+                self.suppressed += 1
+            self._flush(*args, **kwargs)
+
+    def _on_timer(self):
+        with self.lock:
+            self.timer_armed = False
+            if self.pending:
+                self._flush()
+
+    def _flush(self, *args, **kwargs):
+        self.pending = False
+        self.last_flush = self.clock()
+        self.writes += 1
+        self.flush_fn(*args, **kwargs)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'writes': self.writes,
+                'suppressed': self.suppressed,
+            }
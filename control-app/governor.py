@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+LUMIUS quality governor - runs on the Pi next to the visualizer.
+
+When the Pi gets hot or throttles, the visualizer just drops frames. The
+governor watches the frame time the visualizer reports (frame_ms_p95 in
+visualizer_status.txt) and the SoC temperature and throttle flags
+(metrics.py), and lowers the render cost before that happens. It publishes
+quality caps to bin/data/quality.txt, which ofApp applies on top of
+whatever the panel asks for:
+
+    level  render_scale  intensity_cap  effects
+    0      1.0           -              as selected
+    1      0.75          2.0            as selected
+    2      0.5           1.5            6, 7 -> 5 (two-pass camera effects -> one pass)
+    3      0.5           1.0            5-8 -> 1 (camera off)
+
+The caps have their own file (same seq/end snapshot format as control.txt)
+so the governor never races the panel's writes, and the panel's values
+come back untouched when quality is restored.
+
+Hysteresis: one step cheaper after DEGRADE_AFTER seconds of pressure
+(frame p95 over budget, temperature at TEMP_HIGH or the firmware
+throttling now); one step back after RECOVER_AFTER seconds of headroom
+(frames on budget and temperature under TEMP_LOW). A level that has to be
+left again soon after it was restored waits twice as long next time.
+Every transition is logged with its reason.
+
+    python3 governor.py [--target-fps 30] [--log governor.log]
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+
+from control_protocol import AtomicControlFile
+from metrics import MetricsCollector
+from telemetry import TELEMETRY_INTERVAL, sample
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(APP_DIR, "..", "openframeworks-visualizer", "bin", "data")
+DEFAULT_STATUS_FILE = os.path.join(DATA_DIR, "visualizer_status.txt")
+DEFAULT_QUALITY_FILE = os.path.join(DATA_DIR, "quality.txt")
+DEFAULT_LOG_FILE = os.path.join(DATA_DIR, "governor.log")
+
+QUALITY_LEVELS = [
+    {'render_scale': 1.0, 'intensity_cap': None, 'effect_map': {}},
+    {'render_scale': 0.75, 'intensity_cap': 2.0, 'effect_map': {}},
+    {'render_scale': 0.5, 'intensity_cap': 1.5, 'effect_map': {6: 5, 7: 5}},
+    {'render_scale': 0.5, 'intensity_cap': 1.0, 'effect_map': {5: 1, 6: 1, 7: 1, 8: 1}},
+]
+
+DEFAULT_TARGET_FPS = 30.0  # ofApp::setup ofSetFrameRate
+FRAME_OVER_BUDGET = 1.25   # p95 above this many frame budgets: frames are being dropped
+FRAME_ON_BUDGET = 1.05     # p95 within this: the renderer keeps up
+TEMP_HIGH = 75.0           # firmware soft-throttles from 80 C; act before it
+TEMP_LOW = 68.0
+DEGRADE_AFTER = 2.0
+RECOVER_AFTER = 30.0
+RECOVER_BACKOFF_MAX = 8    # at most 8x RECOVER_AFTER
+RELAPSE_WINDOW = 60.0      # degrading within this of a recovery doubles that level's wait
+STALE_STATUS = 3.0         # visualizer not writing its status: hold the level
+
+
+class QualityGovernor:
+    """The decision logic: feed it samples, it returns transitions."""
+
+    def __init__(self, target_fps=DEFAULT_TARGET_FPS, levels=QUALITY_LEVELS, clock=time.monotonic):
+        self.budget_ms = 1000.0 / target_fps
+        self.levels = levels
+        self.clock = clock
+        self.level = 0
+        self.pressure_since = None
+        self.headroom_since = None
+        self.recovered_at = {}   # level -> when it was last restored
+        self.backoff = {}        # level -> recovery wait multiplier
+
+    def pressure(self, values):
+        """Reason the Pi is struggling, or None."""
+        p95 = values.get('frame_ms_p95')
+        if p95 is not None and p95 > self.budget_ms * FRAME_OVER_BUDGET:
+            return f"frame p95 {p95:.1f} ms over {self.budget_ms * FRAME_OVER_BUDGET:.1f} ms"
+        temp = values.get('cpu_temp')
+        if temp is not None and temp >= TEMP_HIGH:
+            return f"temperature {temp:.1f} C"
+        flags = values.get('throttled')
+        if flags is not None and flags & 0xF:
+            return f"firmware throttling (0x{flags:x})"
+        return None
+
+    def headroom(self, values):
+        p95 = values.get('frame_ms_p95')
+        temp = values.get('cpu_temp')
+        flags = values.get('throttled') or 0
+        return (p95 is None or p95 <= self.budget_ms * FRAME_ON_BUDGET) and \
+            (temp is None or temp < TEMP_LOW) and not flags & 0xF
+
+    def recover_after(self, level):
+        return RECOVER_AFTER * self.backoff.get(level, 1)
+
+    def update(self, values):
+        """Next sample; returns (new level, reason) on a transition, else None."""
+        now = self.clock()
+        if values.get('visualizer_age', 0.0) > STALE_STATUS or 'frame_ms_p95' not in values:
+            # No frames to judge (visualizer starting, restarting or hung)
+            self.pressure_since = self.headroom_since = None
+            return None
+
+        reason = self.pressure(values)
+        if reason:
+            self.headroom_since = None
+            if self.pressure_since is None:
+                self.pressure_since = now
+            if now - self.pressure_since >= DEGRADE_AFTER and self.level < len(self.levels) - 1:
+                self.pressure_since = now
+                restored = self.recovered_at.get(self.level)
+                if restored is not None and now - restored < RELAPSE_WINDOW:
+                    # This level did not hold last time: be slower to come back to it
+                    self.backoff[self.level] = min(self.backoff.get(self.level, 1) * 2, RECOVER_BACKOFF_MAX)
+                self.level += 1
+                return self.level, reason
+            return None
+
+        self.pressure_since = None
+        if not self.headroom(values) or self.level == 0:
+            self.headroom_since = None
+            return None
+        if self.headroom_since is None:
+            self.headroom_since = now
+        wait = self.recover_after(self.level - 1)
+        if now - self.headroom_since >= wait:
+            self.headroom_since = now
+            self.level -= 1
+            self.recovered_at[self.level] = now
+            return self.level, f"headroom for {wait:.0f} s"
+        return None
+
+
+def quality_lines(level, settings):
+    lines = [f"quality:{level}", f"render_scale:{settings['render_scale']:.2f}"]
+    if settings['intensity_cap'] is not None:
+        lines.append(f"intensity_cap:{settings['intensity_cap']:.1f}")
+    if settings['effect_map']:
+        lines.append("effect_map:" + ",".join(f"{src}={dst}" for src, dst in sorted(settings['effect_map'].items())))
+    return lines
+
+
+class GovernorService:
+    """Samples telemetry, runs the governor and publishes/logs its transitions."""
+
+    def __init__(self, governor, status_path, quality_path, log_path=None, interval=TELEMETRY_INTERVAL):
+        self.governor = governor
+        self.status_path = status_path
+        self.publisher = AtomicControlFile(quality_path)
+        self.log_path = log_path
+        self.interval = interval
+        self.collector = MetricsCollector()
+        self.running = False
+
+    def publish(self, level):
+        self.publisher.publish(quality_lines(level, self.governor.levels[level]))
+
+    def log(self, old, new, reason, values):
+        entry = {'time': time.time(), 'from': old, 'to': new, 'reason': reason,
+                 'frame_ms_p95': values.get('frame_ms_p95'), 'cpu_temp': values.get('cpu_temp'),
+                 'throttled': values.get('throttled')}
+        print(f"[governor] {time.strftime('%H:%M:%S')} quality {old} -> {new}: {reason}", flush=True)
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def run(self):
+        self.running = True
+        self.collector.start()
+        # Start from full quality whatever a previous run left behind
+        self.publish(0)
+        next_sample = time.monotonic()
+        try:
+            while self.running:
+                values = sample(self.status_path, self.collector)
+                old = self.governor.level
+                transition = self.governor.update(values)
+                if transition:
+                    level, reason = transition
+                    self.publish(level)
+                    self.log(old, level, reason, values)
+                next_sample += self.interval
+                time.sleep(max(0.0, next_sample - time.monotonic()))
+        finally:
+            self.collector.stop()
+            if self.governor.level != 0:
+                # A stopped governor must not leave the visualizer degraded
+                self.log(self.governor.level, 0, "governor stopped", {})
+            self.publish(0)
+
+    def stop(self):
+        self.running = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LUMIUS adaptive quality governor")
+    parser.add_argument("--target-fps", type=float, default=DEFAULT_TARGET_FPS, help="frame rate to hold")
+    parser.add_argument("--status-file", default=DEFAULT_STATUS_FILE, help="visualizer_status.txt")
+    parser.add_argument("--quality-file", default=DEFAULT_QUALITY_FILE, help="quality.txt read by the visualizer")
+    parser.add_argument("--log", default=DEFAULT_LOG_FILE, help="transition log (JSON lines)")
+    args = parser.parse_args()
+
+    service = GovernorService(QualityGovernor(args.target_fps), args.status_file, args.quality_file, args.log)
+    # Supervisor stop (SIGTERM) restores full quality like Ctrl+C does
+    signal.signal(signal.SIGTERM, lambda signum, frame: service.stop())
+    print(f"◢ LUMIUS GOVERNOR ◣ holding {args.target_fps:g} fps, caps in {args.quality_file}")
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Background worker for blocking network I/O.
+
+Tk runs everything on one thread, so a slow SSH connect or write freezes
+the panel and queued drag events replay in a burst afterwards. `IoWorker`
+runs jobs on its own thread from a bounded queue; completion callbacks are
+queued back and only run when the owner calls `poll()` - from the Tk
+thread via `root.after`, so they may touch widgets.
+
+node_pool.PoolNode runs each visualizer node's transport on one of these.
+"""
+import queue
+import threading
+
+DEFAULT_QUEUE_SIZE = 16
+
+
+class IoWorker:
+    def __init__(self, maxsize=DEFAULT_QUEUE_SIZE, name="lumius-io"):
+        self.jobs = queue.Queue(maxsize=maxsize)
+        self.results = queue.Queue()
+        self.running = True
+        self.completed = 0
+        self.rejected = 0
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args, on_done=None, on_error=None):
+        """Queue a job; returns False (and drops it) when the queue is full."""
+        if not self.running:
+            return False
+        try:
+            self.jobs.put_nowait((func, args, on_done, on_error))
+        except queue.Full:
+            self.rejected += 1
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            func, args, on_done, on_error = job
+            try:
+                result = func(*args)
+            except Exception as e:
+                if on_error:
+                    self.results.put((on_error, e))
+            else:
+                if on_done:
+                    self.results.put((on_done, result))
+            self.completed += 1
+
+    def poll(self):
+        """Run completion callbacks on the calling thread."""
+        while True:
+            try:
+                callback, value = self.results.get_nowait()
+            except queue.Empty:
+                return
+            callback(value)
+
+    def stop(self, timeout=None):
+        """Finish queued jobs, then stop; waits at most `timeout` seconds."""
+        if not self.running:
+            return
+        self.running = False
+        try:
+            self.jobs.put(None, timeout=timeout)
+        except queue.Full:
+            # Stuck on a dead link with a full queue; the thread is a daemon
+            return
+        self.thread.join(timeout)
+
+    def stats(self):
+        return {'completed': self.completed, 'rejected': self.rejected, 'queued': self.jobs.qsize()}
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Low-overhead system metrics for the Pi (Python port of rpi_monitor.sh).
+
+rpi_monitor.sh forked vcgencmd, top and free every two seconds, which cost
+CPU on the same Pi that renders the shaders and kept nothing. This
+collector reads the kernel's files directly through descriptors opened
+once (one pread per sample, no process spawned), samples each group of
+metrics at its own rate and keeps the samples in fixed-size ring buffers:
+
+    temp      /sys/class/thermal/thermal_zone0/temp     cpu_temp (C)
+    cpu       /proc/stat, /proc/loadavg                 cpu_percent, load1
+    memory    /proc/meminfo                             mem_used_mb, mem_total_mb, mem_percent
+    throttle  firmware get_throttled (sysfs)            throttled (vcgencmd get_throttled bits)
+
+The latest values feed the panel's telemetry (telemetry.py) and can be
+exported as Prometheus text. The time spent sampling is accounted as
+collector_cpu_percent.
+
+    python3 metrics.py                        # live view (what rpi_monitor.sh showed)
+    python3 metrics.py --serve 9100           # Prometheus endpoint at /metrics
+    python3 metrics.py --textfile lumius.prom # node_exporter textfile collector
+    python3 metrics.py --bench 30             # measure the collector's own overhead
+"""
+import argparse
+import collections
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+THERMAL_PATH = "/sys/class/thermal/thermal_zone0/temp"
+THROTTLED_PATH = "/sys/devices/platform/soc/soc:firmware/get_throttled"
+STAT_PATH = "/proc/stat"
+LOADAVG_PATH = "/proc/loadavg"
+MEMINFO_PATH = "/proc/meminfo"
+
+DEFAULT_RATES = {'temp': 1.0, 'cpu': 1.0, 'memory': 5.0, 'throttle': 5.0}  # seconds between samples
+DEFAULT_CAPACITY = 600  # samples kept per metric
+
+# get_throttled bits: 0-3 happening now, 16-19 happened since boot
+THROTTLE_FLAGS = ((0, "UNDER-VOLTAGE"), (1, "FREQ CAPPED"), (2, "THROTTLED"), (3, "SOFT TEMP LIMIT"))
+
+# metric -> (Prometheus name, help)
+PROMETHEUS_METRICS = {
+    'cpu_temp': ("lumius_cpu_temperature_celsius", "SoC temperature"),
+    'cpu_percent': ("lumius_cpu_usage_percent", "CPU busy time over the last sample interval, all cores"),
+    'load1': ("lumius_load1", "1-minute load average"),
+    'mem_used_mb': ("lumius_memory_used_megabytes", "Memory in use (total minus available)"),
+    'mem_total_mb': ("lumius_memory_total_megabytes", "Total memory"),
+    'mem_percent': ("lumius_memory_used_percent", "Memory in use"),
+    'throttled': ("lumius_throttled_flags", "Firmware get_throttled bits (0 = never throttled)"),
+    'collector_cpu_percent': ("lumius_collector_cpu_percent", "CPU time spent by this collector"),
+}
+
+
+def throttle_text(flags):
+    """Short description of get_throttled flags ("OK" when clean)."""
+    now = [name for bit, name in THROTTLE_FLAGS if flags & (1 << bit)]
+    if now:
+        return " ".join(now)
+    if any(flags & (1 << (bit + 16)) for bit, _ in THROTTLE_FLAGS):
+        return "OK (THROTTLED SINCE BOOT)"
+    return "OK"
+
+
+class KernelFile:
+    """A /proc or /sys file opened once and re-read from the start with pread."""
+
+    def __init__(self, path, size=4096):
+        self.path = path
+        self.size = size
+        try:
+            self.fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            self.fd = None  # not on this machine (no thermal zone, not a Pi)
+
+    def read(self):
+        if self.fd is None:
+            return None
+        try:
+            return os.pread(self.fd, self.size, 0)
+        except OSError:
+            return None
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class MetricsCollector:
+    def __init__(self, rates=None, capacity=DEFAULT_CAPACITY, clock=time.time):
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.capacity = capacity
+        self.clock = clock
+
+        self.thermal = KernelFile(THERMAL_PATH)
+        self.throttle = KernelFile(THROTTLED_PATH)
+        self.stat = KernelFile(STAT_PATH)
+        self.loadavg = KernelFile(LOADAVG_PATH)
+        self.meminfo = KernelFile(MEMINFO_PATH)
+        self.last_cpu = None  # (busy, total) jiffies at the previous sample
+
+        self.groups = {
+            'temp': self.sample_temp,
+            'cpu': self.sample_cpu,
+            'memory': self.sample_memory,
+            'throttle': self.sample_throttle,
+        }
+        self.lock = threading.Lock()
+        self.history = {}  # metric -> deque of (time, value)
+        self.samples = collections.Counter()
+        self.sample_cpu_time = collections.Counter()  # group -> thread CPU seconds spent sampling
+        self.started_at = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    # Sources
+
+    def sample_temp(self):
+        raw = self.thermal.read()
+        return {'cpu_temp': int(raw) / 1000.0} if raw else {}
+
+    def sample_cpu(self):
+        values = {}
+        raw = self.stat.read()
+        if raw:
+            # cpu  user nice system idle iowait irq softirq steal ...
+            fields = [int(field) for field in raw[:raw.index(b"\n")].split()[1:9]]
+            total = sum(fields)
+            busy = total - fields[3] - fields[4]
+            if self.last_cpu and total > self.last_cpu[1]:
+                values['cpu_percent'] = 100.0 * (busy - self.last_cpu[0]) / (total - self.last_cpu[1])
+            self.last_cpu = (busy, total)
+        raw = self.loadavg.read()
+        if raw:
+            values['load1'] = float(raw.split(None, 1)[0])
+        return values
+
+    def sample_memory(self):
+        raw = self.meminfo.read()
+        if not raw:
+            return {}
+        fields = {}
+        for line in raw.split(b"\n"):
+            if line.startswith((b"MemTotal:", b"MemAvailable:")):
+                name, value = line.split()[:2]
+                fields[name] = int(value) / 1024.0
+                if len(fields) == 2:
+                    break
+        total = fields.get(b"MemTotal:")
+        available = fields.get(b"MemAvailable:")
+        if not total or available is None:
+            return {}
+        used = total - available
+        return {'mem_used_mb': used, 'mem_total_mb': total, 'mem_percent': 100.0 * used / total}
+
+    def sample_throttle(self):
+        raw = self.throttle.read()
+        return {'throttled': int(raw.strip(), 16)} if raw else {}
+
+    # Sampling
+
+    def sample(self, group):
+        start = time.thread_time()
+        try:
+            values = self.groups[group]()
+        except ValueError:
+            values = {}  # a malformed read; the next sample tries again
+        now = self.clock()
+        with self.lock:
+            self.sample_cpu_time[group] += time.thread_time() - start
+            self.samples[group] += 1
+            for name, value in values.items():
+                if name not in self.history:
+                    self.history[name] = collections.deque(maxlen=self.capacity)
+                self.history[name].append((now, value))
+        return values
+
+    def start(self):
+        """Sample every group at its own rate on a background thread."""
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name="lumius-metrics", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        due = {group: time.monotonic() for group in self.groups}
+        while not self.stopped.is_set():
+            now = time.monotonic()
+            for group, when in due.items():
+                if when <= now:
+                    self.sample(group)
+                    # Fixed rate; after a long stall skip ahead instead of bursting
+                    due[group] = max(when + self.rates[group], now)
+            self.stopped.wait(max(0.0, min(due.values()) - time.monotonic()))
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(1.0)
+        for source in (self.thermal, self.throttle, self.stat, self.loadavg, self.meminfo):
+            source.close()
+
+    # Reading
+
+    def overhead(self):
+        """CPU time spent sampling, as a percentage of one core since start()."""
+        if self.started_at is None:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        with self.lock:
+            spent = sum(self.sample_cpu_time.values())
+        return 100.0 * spent / elapsed if elapsed > 0 else 0.0
+
+    def latest(self):
+        with self.lock:
+            values = {name: samples[-1][1] for name, samples in self.history.items() if samples}
+        overhead = self.overhead()
+        if overhead is not None:
+            values['collector_cpu_percent'] = overhead
+        return values
+
+    def samples_of(self, name):
+        """[(time, value), ...] kept for a metric, oldest first."""
+        with self.lock:
+            return list(self.history.get(name, ()))
+
+    def prometheus_text(self):
+        lines = []
+        for name, value in self.latest().items():
+            metric, help_text = PROMETHEUS_METRICS[name]
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value:.6g}")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(collector, path):
+    # Temp file + rename, like control.txt: the scraper never reads half a file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(collector.prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def serve_prometheus(collector, port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = collector.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    threading.Thread(target=server.serve_forever, name="lumius-metrics-http", daemon=True).start()
+    return server
+
+
+def show_status(collector):
+    values = collector.latest()
+    temps = [value for _, value in collector.samples_of('cpu_temp')]
+    # ANSI clear instead of forking `clear`
+    print("\033[H\033[J", end="")
+    print("🔥 LUMIUS - Monitor Raspberry Pi")
+    print("===============================")
+    print(f"⏰ {time.strftime('%c')}")
+    print("")
+    if temps:
+        print(f"🌡️  Temperatura: {temps[-1]:.1f}°C (min {min(temps):.1f}, max {max(temps):.1f})")
+    else:
+        print("🌡️  Temperatura: indisponível")
+    if 'cpu_percent' in values:
+        print(f"💻 CPU Usage: {values['cpu_percent']:.1f}% (load {values.get('load1', 0.0):.2f})")
+    if 'mem_total_mb' in values:
+        print(f"🧠 Memória: {values['mem_used_mb']:.0f}M / {values['mem_total_mb']:.0f}M")
+    if 'throttled' in values:
+        if values['throttled']:
+            print(f"⚠️  THROTTLING DETECTADO: {throttle_text(values['throttled'])} (0x{values['throttled']:x})")
+        else:
+            print("✅ Sistema estável")
+    print(f"📉 Coletor: {values.get('collector_cpu_percent', 0.0):.3f}% CPU")
+    print("")
+    print("Pressione Ctrl+C para sair")
+
+
+def spawn_cost(commands, repeat=5):
+    """Average seconds to run each command (what the shell monitor paid per refresh)."""
+    costs = {}
+    for command in commands:
+        if not shutil.which(command[0]):
+            continue
+        start = time.perf_counter()
+        for _ in range(repeat):
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        costs[" ".join(command)] = (time.perf_counter() - start) / repeat
+    return costs
+
+
+def bench(collector, seconds):
+    cpu_start = time.process_time()
+    collector.start()
+    time.sleep(seconds)
+    collector.stop()
+    process_cpu = time.process_time() - cpu_start
+    print(f"Collector over {seconds:.0f} s: {collector.overhead():.4f}% of one core sampling, "
+          f"{100.0 * process_cpu / seconds:.4f}% whole process")
+    with collector.lock:
+        for group, count in sorted(collector.samples.items()):
+            cost = collector.sample_cpu_time[group] / count * 1e6
+            print(f"  {group:<9} {count:5d} samples  {cost:8.1f} us CPU each  (every {collector.rates[group]:g} s)")
+    print("Shell monitor, per refresh (every 2 s):")
+    for command, cost in spawn_cost([["vcgencmd", "measure_temp"], ["vcgencmd", "get_throttled"],
+                                     ["top", "-bn1"], ["free", "-h"]]).items():
+        print(f"  {command:<22} {cost * 1000:8.1f} ms wall")
+
+
+def parse_rates(text):
+    rates = {}
+    for item in text.split(","):
+        group, _, seconds = item.partition("=")
+        if group not in DEFAULT_RATES:
+            raise argparse.ArgumentTypeError(f"unknown group: {group} (choose from {', '.join(DEFAULT_RATES)})")
+        rates[group] = float(seconds)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LUMIUS low-overhead system metrics")
+    parser.add_argument("--rates", type=parse_rates, default={}, metavar="GROUP=SECONDS,...",
+                        help="sample interval per group (temp, cpu, memory, throttle)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="samples kept per metric")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between screen/textfile updates")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve Prometheus text at /metrics")
+    parser.add_argument("--textfile", metavar="PATH", help="write Prometheus text to this file")
+    parser.add_argument("--quiet", action="store_true", help="no live view (with --serve/--textfile)")
+    parser.add_argument("--bench", type=float, metavar="SECONDS", help="measure the collector's overhead")
+    args = parser.parse_args()
+
+    collector = MetricsCollector(args.rates, args.capacity)
+    if args.bench:
+        bench(collector, args.bench)
+        return
+
+    collector.start()
+    if args.serve:
+        serve_prometheus(collector, args.serve)
+    try:
+        while True:
+            time.sleep(args.interval)
+            if args.textfile:
+                write_textfile(collector, args.textfile)
+            if not args.quiet:
+                show_status(collector)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Fan-out of control updates to several visualizer nodes.
+
+An installation can have several Pis, each driving its own projector.
+`NodePool` is a single transport for the engine that forwards every update
+to all nodes. Each node has its own I/O thread and merges the updates that
+arrive while its previous send is still on the wire, so a slow or stalled
+Pi falls behind on its own without holding up the others.
+
+Every node reports its state (connecting, ok, stalled, failed), the
+latency of its last sends (time from hand-off to delivered) and its
+failure count. A node whose connect failed is tried again on a later
+send, with backoff, and gets the full state once it is up.
+
+Group commit makes all nodes apply a change on the same frame. The update
+is first staged on every node (`Transport.send_staged`); once all of them
+hold it, or after `commit_timeout` if some node is stuck, a tiny commit
+message goes to every node at once, and each node applies its staged
+update when the commit arrives. A node that is already behind is not
+waited for; it applies its queued stage and commit when it catches up.
+
+Scheduled apply (`schedule_ahead`) goes further: every update carries a
+target time slightly in the future, converted to each node's clock with
+its clock_sync estimate, and the visualizers apply it on their first frame
+at or after that time. No round of acknowledgements is needed, so this is
+the mode to use when the clocks can be probed (OSC and SSH nodes).
+"""
+import threading
+import time
+
+from clock_sync import PROBES_PER_SYNC, ClockEstimator, probe
+from io_worker import IoWorker
+from transports import Transport
+
+STALL_TIMEOUT = 1.0     # a send in flight longer than this marks the node stalled
+COMMIT_TIMEOUT = 0.25   # group commit waits at most this long for slow nodes
+SCHEDULE_AHEAD = 0.1    # scheduled apply: lead over the slowest expected delivery
+LATENCY_SMOOTHING = 0.2
+CONNECT_RETRY_MIN = 1.0   # first reconnect delay after a failed connect, doubling...
+CONNECT_RETRY_MAX = 30.0  # ...up to this
+
+
+class PoolNode:
+    def __init__(self, name, pool, clock=time.monotonic):
+        self.name = name
+        self.pool = pool
+        self.clock = clock
+        self.transport = None
+        self.factory = None
+        self.connect_args = ()
+        self.connecting = False
+        self.connect_failures = 0
+        self.retry_at = None
+        self.worker = IoWorker(name=f"lumius-node-{name}")
+
+        self.lock = threading.Lock()
+        self.pending = None
+        self.scheduled = False
+        self.needs_full = True
+        self.clock_estimator = ClockEstimator()
+
+        self.state = "connecting"
+        self.in_flight_since = None
+        self.latency = None       # smoothed, seconds
+        self.last_latency = None
+        self.sends = 0
+        self.merged = 0
+        self.failures = 0
+        self.last_error = None
+
+    def connect(self, factory, *args):
+        """Build the transport on this node's thread (connecting can take seconds)."""
+        self.factory = factory
+        self.connect_args = args
+        self._connect()
+
+    def _connect(self):
+        def job():
+            try:
+                transport = self.factory(*self.connect_args)
+            except Exception:
+                self.connect_failures += 1
+                self.retry_at = self.clock() + min(CONNECT_RETRY_MIN * 2 ** (self.connect_failures - 1),
+                                                   CONNECT_RETRY_MAX)
+                raise
+            finally:
+                self.connecting = False
+            self.connect_failures = 0
+            self.transport = transport
+            self.state = "ok"
+        self.connecting = True
+        if not self.worker.submit(job, on_error=self.failed):
+            self.connecting = False
+
+    def retry_connect(self):
+        """Connect again if the last attempt failed and its backoff has passed."""
+        if self.transport is not None or self.connecting or self.factory is None:
+            return
+        if self.retry_at is not None and self.clock() < self.retry_at:
+            return
+        self.mark_full()
+        self._connect()
+
+    def mark_full(self):
+        """Send the complete values next time (the node missed updates)."""
+        with self.lock:
+            self.needs_full = True
+
+    def run(self, func, *args):
+        """Queue `func(*args)` on this node's thread, timing it from now."""
+        queued = self.clock()
+
+        def job():
+            self.in_flight_since = self.clock()
+            try:
+                func(*args)
+            finally:
+                self.in_flight_since = None
+            latency = self.clock() - queued
+            self.last_latency = latency
+            self.latency = latency if self.latency is None else \
+                self.latency + LATENCY_SMOOTHING * (latency - self.latency)
+            self.sends += 1
+            if self.state != "ok":
+                self.state = "ok"
+
+        if not self.worker.submit(job, on_error=self.failed):
+            # Queue full: the node is far behind; give it a full snapshot once it recovers
+            self.mark_full()
+            return False
+        return True
+
+    def send(self, full, delta, values, music_action=None, apply_at=None):
+        """`apply_at`: Unix time on the panel's clock, or None to apply on arrival."""
+        with self.lock:
+            if self.pending is None:
+                self.pending = [full or self.needs_full, dict(delta), values, music_action, apply_at]
+            else:
+                # Previous update still waiting: fold this one into it
+                self.pending[0] = self.pending[0] or full
+                self.pending[1].update(delta)
+                self.pending[2] = values
+                self.pending[3] = music_action or self.pending[3]
+                self.pending[4] = apply_at
+                self.merged += 1
+            self.needs_full = False
+            if self.scheduled:
+                return
+            self.scheduled = True
+        if not self.run(self._drain):
+            with self.lock:
+                self.scheduled = False
+
+    def _drain(self):
+        with self.lock:
+            update, self.pending = self.pending, None
+            self.scheduled = False
+        if update:
+            full, delta, values, music_action, apply_at = update
+            # A node that missed updates gets the complete values
+            delta = values if full else delta
+            if apply_at is None or self.clock_estimator.offset() is None:
+                # Not probed yet: a guessed schedule could be off by the whole skew
+                self.transport.send(full, delta, values, music_action)
+            else:
+                self.transport.send_at(self.clock_estimator.to_remote(apply_at), full, delta, values, music_action)
+
+    def sync_clock(self, count=PROBES_PER_SYNC):
+        """Probe the node's clock on its own thread, one ping per job so sends go out in between."""
+        if not self.transport or count <= 0:
+            return
+
+        def job():
+            probe(self.clock_estimator, self.transport.ping, count=1)
+            self.sync_clock(count - 1)
+        self.worker.submit(job, on_error=self.failed)
+
+    def send_staged(self, stage_id, full, delta, values, music_action, on_staged):
+        with self.lock:
+            full = full or self.needs_full
+            self.needs_full = False
+
+        def stage():
+            try:
+                self.transport.send_staged(stage_id, full, values if full else delta, values, music_action)
+            finally:
+                on_staged(self)
+        if not self.run(stage):
+            on_staged(self)
+
+    def failed(self, error):
+        # Runs on the owner's thread (IoWorker.poll)
+        self.failures += 1
+        self.last_error = error
+        self.state = "failed"
+        self.mark_full()
+        self.pool.report_error(self, error)
+
+    def ready(self):
+        return self.transport is not None
+
+    def behind(self, limit):
+        """True while a send has been stuck for over `limit` seconds or work piles up."""
+        since = self.in_flight_since
+        return (since is not None and self.clock() - since > limit) or self.worker.jobs.qsize() > 2
+
+    def current_state(self):
+        since = self.in_flight_since
+        if since is not None and self.clock() - since > STALL_TIMEOUT:
+            return "stalled"
+        return self.state
+
+    def status(self):
+        return {
+            'name': self.name,
+            'state': self.current_state(),
+            'latency_ms': self._ms(self.latency),
+            'last_latency_ms': self._ms(self.last_latency),
+            'sends': self.sends,
+            'merged': self.merged,
+            'failures': self.failures,
+            'last_error': str(self.last_error) if self.last_error else None,
+            'queued': self.worker.jobs.qsize(),
+            'clock_offset_ms': self._ms(self.clock_estimator.offset()),
+            'clock_error_ms': self._ms(self.clock_estimator.uncertainty()),
+        }
+
+    @staticmethod
+    def _ms(seconds):
+        return None if seconds is None else seconds * 1000
+
+    def close(self):
+        if self.transport:
+            self.worker.submit(self.transport.close)
+        # Queued sends still go out; NodePool.close decides how long to wait
+        self.worker.stop(timeout=0)
+
+
+class NodePool(Transport):
+    name = "pool"
+
+    def __init__(self, group_commit=False, commit_timeout=COMMIT_TIMEOUT, schedule_ahead=0.0,
+                 on_error=None):
+        self.group_commit = group_commit
+        self.commit_timeout = commit_timeout
+        self.schedule_ahead = schedule_ahead  # > 0: scheduled apply (takes precedence over group commit)
+        self.on_error = on_error  # on_error(node, error), on the polling thread
+
+        self.lock = threading.Lock()
+        self.nodes = {}
+        self.stage_id = 0
+        self.group = None           # stage id of the group waiting for its commit
+        self.waiting = set()
+        self.pending_group = None   # updates merged while a group is in flight
+        self.commits = 0
+        self.timed_out_commits = 0
+
+    # Membership
+
+    def add(self, name, factory, *args):
+        """Add a node and connect it in the background: `factory(*args)` returns its transport."""
+        self.remove(name)
+        node = PoolNode(name, self)
+        with self.lock:
+            self.nodes[name] = node
+        node.connect(factory, *args)
+        return node
+
+    def remove(self, name):
+        with self.lock:
+            node = self.nodes.pop(name, None)
+            self.waiting.discard(node)
+        if node:
+            node.close()
+
+    def ready_nodes(self):
+        with self.lock:
+            return [node for node in self.nodes.values() if node.ready()]
+
+    def status(self):
+        with self.lock:
+            nodes = list(self.nodes.values())
+        return [node.status() for node in nodes]
+
+    # Transport interface
+
+    def send(self, full, delta, values, music_action=None):
+        self.retry_connects()
+        if self.schedule_ahead > 0:
+            self.send_at(time.time() + self.schedule_ahead, full, delta, values, music_action)
+            return
+        if not self.group_commit:
+            for node in self.ready_nodes():
+                node.send(full, delta, values, music_action)
+            return
+
+        with self.lock:
+            if self.pending_group is None:
+                self.pending_group = [full, dict(delta), values, music_action]
+            else:
+                self.pending_group[0] = self.pending_group[0] or full
+                self.pending_group[1].update(delta)
+                self.pending_group[2] = values
+                self.pending_group[3] = music_action or self.pending_group[3]
+            if self.group is not None:
+                # Previous group not committed yet: this goes out with the next one
+                return
+        self._start_group()
+
+    def send_at(self, apply_at, full, delta, values, music_action=None):
+        self.retry_connects()
+        for node in self.ready_nodes():
+            node.send(full, delta, values, music_action, apply_at)
+
+    def retry_connects(self):
+        with self.lock:
+            nodes = [node for node in self.nodes.values() if not node.ready()]
+        for node in nodes:
+            node.retry_connect()
+
+    def sync_clocks(self):
+        for node in self.ready_nodes():
+            node.sync_clock()
+
+    def _start_group(self):
+        nodes = self.ready_nodes()
+        with self.lock:
+            update, self.pending_group = self.pending_group, None
+            if update is None or not nodes:
+                self.group = None
+                return
+            self.stage_id += 1
+            stage_id = self.group = self.stage_id
+            # Only wait for nodes keeping up; the others get stage and commit queued
+            self.waiting = set(node for node in nodes if not node.behind(self.commit_timeout))
+            if not self.waiting:
+                self.waiting = set(nodes)
+
+        timer = threading.Timer(self.commit_timeout, self._commit, (stage_id, True))
+        timer.daemon = True
+        timer.start()
+        for node in nodes:
+            node.send_staged(stage_id, *update, on_staged=lambda node: self._staged(stage_id, node))
+
+    def _staged(self, stage_id, node):
+        with self.lock:
+            if stage_id != self.group:
+                return
+            self.waiting.discard(node)
+            complete = not self.waiting
+        if complete:
+            self._commit(stage_id)
+
+    def _commit(self, stage_id, timed_out=False):
+        with self.lock:
+            if stage_id != self.group:
+                # Already committed
+                return
+            self.group = None
+            self.waiting = set()
+            self.commits += 1
+            if timed_out:
+                self.timed_out_commits += 1
+        # Same instant for every node; a late node applies it after its stage lands
+        for node in self.ready_nodes():
+            node.run(node.transport.commit, stage_id)
+        self._start_group()
+
+    def send_system(self, command):
+        for node in self.ready_nodes():
+            node.run(node.transport.send_system, command)
+
+    def exec(self, command):
+        """Run a shell command on every node that supports it (SSH)."""
+        for node in self.ready_nodes():
+            if hasattr(node.transport, "exec"):
+                node.run(node.transport.exec, command)
+
+    def subscribe_telemetry(self, listener):
+        """Have every node that streams telemetry on request (OSC) send it to `listener`."""
+        for node in self.ready_nodes():
+            if hasattr(node.transport, "subscribe_telemetry"):
+                node.run(node.transport.subscribe_telemetry, listener, node.name)
+
+    def resync_needed(self):
+        # Handled per node: only the one that reconnected gets the full snapshot
+        for node in self.ready_nodes():
+            if node.transport.resync_needed():
+                node.mark_full()
+        return False
+
+    def poll(self):
+        """Deliver connection results and errors on the calling thread."""
+        with self.lock:
+            nodes = list(self.nodes.values())
+        for node in nodes:
+            node.worker.poll()
+
+    def report_error(self, node, error):
+        if self.on_error:
+            self.on_error(node, error)
+
+    def stats(self):
+        return {'nodes': len(self.nodes), 'commits': self.commits,
+                'timed_out_commits': self.timed_out_commits}
+
+    def close(self, timeout=0.0):
+        """Stop every node; waits up to `timeout` seconds in total for queued sends."""
+        with self.lock:
+            nodes = list(self.nodes.values())
+            self.nodes = {}
+        for node in nodes:
+            node.close()
+        deadline = time.monotonic() + timeout
+        for node in nodes:
+            node.worker.thread.join(max(0.0, deadline - time.monotonic()))
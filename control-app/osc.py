@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Minimal OSC 1.0 codec and UDP client for LUMIUS control messages.
+
+Only what the control protocol needs: int32 ('i'), float32 ('f') and
+string ('s') arguments, plus bundles so one control update travels in a
+single datagram. No third-party OSC package is required.
+
+Bundle timetags (NTP format) carry "apply at" times for scheduled updates
+and the node's clock in ping replies.
+"""
+import socket
+import struct
+
+BUNDLE_TAG = b"#bundle\0"
+IMMEDIATELY = 1  # OSC timetag meaning "apply on receipt"
+DEFAULT_PORT = 9000
+NTP_EPOCH_OFFSET = 2208988800  # seconds from 1900-01-01 to 1970-01-01
+
+
+def to_timetag(seconds):
+    """Unix time (float seconds) to a 64-bit NTP timetag."""
+    return int(round((seconds + NTP_EPOCH_OFFSET) * (1 << 32)))
+
+
+def from_timetag(timetag):
+    return timetag / float(1 << 32) - NTP_EPOCH_OFFSET
+
+
+class OscError(Exception):
+    pass
+
+
+def _pad(data):
+    return data + b"\0" * (4 - len(data) % 4)
+
+
+def _encode_string(value):
+    return _pad(value.encode())
+
+
+def _decode_string(data, offset):
+    end = data.index(b"\0", offset)
+    value = data[offset:end].decode()
+    return value, (end // 4 + 1) * 4
+
+
+def encode_message(address, *args):
+    tags = ","
+    payload = b""
+    for arg in args:
+        if isinstance(arg, bool):
+            arg = int(arg)
+        if isinstance(arg, int):
+            tags += "i"
+            payload += struct.pack(">i", arg)
+        elif isinstance(arg, float):
+            tags += "f"
+            payload += struct.pack(">f", arg)
+        elif isinstance(arg, str):
+            tags += "s"
+            payload += _encode_string(arg)
+        else:
+            raise OscError(f"unsupported OSC argument type: {type(arg).__name__}")
+    return _encode_string(address) + _encode_string(tags) + payload
+
+
+def encode_bundle(messages, timetag=IMMEDIATELY):
+    """messages: iterable of (address, args) pairs."""
+    data = BUNDLE_TAG + struct.pack(">Q", timetag)
+    for address, args in messages:
+        element = encode_message(address, *args)
+        data += struct.pack(">i", len(element)) + element
+    return data
+
+
+def decode_message(data):
+    try:
+        address, offset = _decode_string(data, 0)
+        tags, offset = _decode_string(data, offset)
+        if not tags.startswith(","):
+            raise OscError("missing type tag string")
+        args = []
+        for tag in tags[1:]:
+            if tag == "i":
+                args.append(struct.unpack_from(">i", data, offset)[0])
+                offset += 4
+            elif tag == "f":
+                args.append(struct.unpack_from(">f", data, offset)[0])
+                offset += 4
+            elif tag == "s":
+                value, offset = _decode_string(data, offset)
+                args.append(value)
+            else:
+                raise OscError(f"unsupported OSC type tag: {tag}")
+    except (ValueError, struct.error, UnicodeDecodeError) as e:
+        raise OscError(f"malformed OSC message: {e}")
+    return address, args
+
+
+def decode_packet(data):
+    """Return (timetag, [(address, args), ...]) for a message or bundle."""
+    if not data.startswith(BUNDLE_TAG):
+        return IMMEDIATELY, [decode_message(data)]
+
+    try:
+        timetag, = struct.unpack_from(">Q", data, len(BUNDLE_TAG))
+        offset = len(BUNDLE_TAG) + 8
+        messages = []
+        while offset < len(data):
+            size, = struct.unpack_from(">i", data, offset)
+            offset += 4
+            # Nested bundles are flattened; their timetags are not used by LUMIUS
+            messages.extend(decode_packet(data[offset:offset + size])[1])
+            offset += size
+    except struct.error as e:
+        raise OscError(f"malformed OSC bundle: {e}")
+    return timetag, messages
+
+
+def control_messages(values, music_action=None):
+    """OSC messages for a set of control values (any subset of the fields)."""
+    messages = [(f"/lumius/{name}", (value,)) for name, value in values.items()]
+    if music_action:
+        messages.append(("/lumius/music", (music_action,)))
+    return messages
+
+
+class OscClient:
+    def __init__(self, host, port):
+        self.address = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, address, *args):
+        self.sock.sendto(encode_message(address, *args), self.address)
+
+    def send_bundle(self, messages, timetag=IMMEDIATELY):
+        self.sock.sendto(encode_bundle(messages, timetag), self.address)
+
+    def ping(self, seq, timeout=0.5):
+        """The listener's clock (Unix time) from its /lumius/pong reply, or None on timeout."""
+        self.send("/lumius/ping", seq)
+        self.sock.settimeout(timeout)
+        try:
+            while True:
+                data, _ = self.sock.recvfrom(512)
+                timetag, messages = decode_packet(data)
+                if messages == [("/lumius/pong", [seq])]:
+                    return from_timetag(timetag)
+        except socket.timeout:
+            return None
+        finally:
+            self.sock.settimeout(None)
+
+    def close(self):
+        self.sock.close()
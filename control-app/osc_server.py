@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+LUMIUS OSC control listener - runs on the Raspberry Pi next to the visualizer.
+
+Receives OSC messages over UDP and applies them to the control state, which
+is then published to the visualizer (control.txt or shared memory) at most
+once per frame. Lets the remote panel send fire-and-forget updates without
+SSH, passwords or a remote shell.
+
+Addresses:
+    /lumius/effect i          /lumius/speed f
+    /lumius/rgb_r i (g, b)    /lumius/intensity f
+    /lumius/rgb i i i         /lumius/volume f
+    /lumius/music s           play | pause
+    /lumius/system s          shutdown
+    /lumius/ramp s f f [s]    field, target, seconds, easing (default ease_in_out)
+    /lumius/stage i           first in a bundle: hold the bundle until...
+    /lumius/commit i          ...this id; all held bundles apply as one update
+    /lumius/ping i            answered with /lumius/pong i, bundle timetag = this Pi's clock
+    /lumius/telemetry i       stream telemetry to the sender's address on this port (0: the
+                              sender's own port) for the next 10 s; the panel renews it
+
+A bundle whose timetag is a time (not "immediately") is published with an
+apply_at line: the visualizer applies it on its first frame at or after
+that time, so several Pis with synchronized clocks switch together.
+"""
+import argparse
+import math
+import os
+import socket
+import sys
+import threading
+import time
+
+from control_engine import ControlEngine
+from control_protocol import CONTROL_TYPES
+from control_writer import DEFAULT_MAX_RATE
+from osc import DEFAULT_PORT, IMMEDIATELY, OscError, decode_packet, encode_bundle, from_timetag, to_timetag
+from ramps import DISCRETE_FIELDS, EASINGS, RampEngine
+from telemetry import TELEMETRY_LEASE, TelemetryPublisher, status_path_for, telemetry_messages
+from transports import FileTransport, ShmTransport
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CONTROL_FILE = os.path.join(APP_DIR, "..", "openframeworks-visualizer", "bin", "data", "control.txt")
+ADDRESS_PREFIX = "/lumius/"
+
+
+def check_finite(address, values):
+    # NaN/inf would crash the int fields and publish speed:inf for the others
+    for value in values:
+        if not math.isfinite(value):
+            raise OscError(f"{address}: {value} is not a finite number")
+
+
+class LumiusOscServer:
+    def __init__(self, host="0.0.0.0", port=DEFAULT_PORT, control_file=DEFAULT_CONTROL_FILE,
+                 backend='file', max_rate=DEFAULT_MAX_RATE, clock=time.time):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.5)
+        self.address = self.sock.getsockname()
+
+        self.clock = clock  # Unix time as this Pi sees it (answered to pings)
+        self.running = False
+        self.received = 0
+        self.rejected = 0
+        self.staged = []  # (stage id, messages) waiting for /lumius/commit
+        self.status_path = status_path_for(control_file)
+        self.subscribers = {}  # (host, port) -> lease expiry, for telemetry
+        self.subscribers_lock = threading.Lock()
+        self.telemetry = None
+
+        if backend == 'shm':
+            transport = ShmTransport()
+        else:
+            transport = FileTransport(control_file)
+        # Periodic full resyncs from the panel often change nothing; the engine skips those
+        self.engine = ControlEngine([transport], max_rate=max_rate)
+        self.state = self.engine.state
+        # Start from what the visualizer has, not the defaults: the first message must not reset it
+        current = transport.current_values()
+        if current:
+            self.state.update(current)
+        self.state.mark_synced()
+        self.ramps = RampEngine(self.engine)
+
+    def handle_message(self, address, args):
+        """Apply one message to the state; returns how it should be flushed."""
+        if not address.startswith(ADDRESS_PREFIX):
+            raise OscError(f"unknown address: {address}")
+        name = address[len(ADDRESS_PREFIX):]
+
+        if name in CONTROL_TYPES:
+            if len(args) != 1 or isinstance(args[0], str):
+                raise OscError(f"{address} expects one number")
+            check_finite(address, args)
+            # A direct value overrides a glide in progress
+            self.ramps.cancel(name)
+            self.state.set(name, args[0])
+            # Effect switches are discrete; knob values are coalesced
+            return 'now' if name == 'effect' else 'request'
+        elif name == 'rgb':
+            if len(args) != 3 or any(isinstance(arg, str) for arg in args):
+                raise OscError("/lumius/rgb expects three numbers")
+            check_finite(address, args)
+            for channel in ('rgb_r', 'rgb_g', 'rgb_b'):
+                self.ramps.cancel(channel)
+            self.state.update(dict(zip(('rgb_r', 'rgb_g', 'rgb_b'), args)))
+            return 'request'
+        elif name == 'ramp':
+            if (len(args) not in (3, 4) or not isinstance(args[0], str) or
+                    any(isinstance(arg, str) for arg in args[1:3]) or
+                    (len(args) == 4 and not isinstance(args[3], str))):
+                raise OscError("/lumius/ramp expects field, target, seconds[, easing]")
+            check_finite(address, args[1:3])
+            field, target, duration = args[:3]
+            easing = args[3] if len(args) == 4 else 'ease_in_out'
+            if field not in CONTROL_TYPES or field in DISCRETE_FIELDS:
+                raise OscError(f"/lumius/ramp: cannot ramp {field}")
+            if easing not in EASINGS:
+                raise OscError(f"/lumius/ramp: unknown easing {easing}")
+            # Ticks publish through the engine on their own
+            self.ramps.ramp(field, target, max(0.0, duration), easing)
+            return None
+        elif name == 'music':
+            if args not in (['play'], ['pause']):
+                raise OscError("/lumius/music expects 'play' or 'pause'")
+            return args[0]
+        elif name == 'system':
+            if args != ['shutdown']:
+                raise OscError("/lumius/system expects 'shutdown'")
+            self.engine.system("shutdown")
+            return None
+        raise OscError(f"unknown address: {address}")
+
+    def handle_datagram(self, data, sender=None):
+        """Apply one datagram; returns a reply datagram for the sender, or None."""
+        timetag, messages = decode_packet(data)
+
+        if messages and messages[0][0] == ADDRESS_PREFIX + "ping":
+            return encode_bundle([(ADDRESS_PREFIX + "pong", (self.id_arg(messages[0]),))],
+                                 to_timetag(self.clock()))
+        if messages and messages[0][0] == ADDRESS_PREFIX + "telemetry":
+            port = self.id_arg(messages[0])
+            if sender is not None:
+                self.subscribe((sender[0], port or sender[1]))
+            return None
+
+        if messages and messages[0][0] == ADDRESS_PREFIX + "stage":
+            # Group commit: keep the update until the panel commits it on every node
+            self.staged.append((self.id_arg(messages[0]), messages[1:]))
+            return
+        if messages and messages[0][0] == ADDRESS_PREFIX + "commit":
+            stage_id = self.id_arg(messages[0])
+            ready = [staged for staged_id, staged in self.staged if staged_id <= stage_id]
+            self.staged = [(staged_id, staged) for staged_id, staged in self.staged if staged_id > stage_id]
+            messages = [message for staged in ready for message in staged]
+        apply_at = None if timetag == IMMEDIATELY else from_timetag(timetag)
+        self.apply_messages(messages, apply_at)
+        return None
+
+    def subscribe(self, address):
+        with self.subscribers_lock:
+            self.subscribers[address] = time.monotonic() + TELEMETRY_LEASE
+        if self.telemetry is None:
+            # Sampling starts with the first panel that asks for it
+            self.telemetry = TelemetryPublisher(self.status_path, self.publish_telemetry).start()
+
+    def publish_telemetry(self, values):
+        now = time.monotonic()
+        with self.subscribers_lock:
+            self.subscribers = {address: expiry for address, expiry in self.subscribers.items()
+                                if expiry > now}
+            addresses = list(self.subscribers)
+        if not addresses or not values:
+            return
+        packet = encode_bundle(telemetry_messages(values))
+        for address in addresses:
+            try:
+                self.sock.sendto(packet, address)
+            except OSError:
+                pass  # one unreachable panel does not starve the others
+
+    def id_arg(self, message):
+        address, args = message
+        if len(args) != 1 or not isinstance(args[0], int):
+            raise OscError(f"{address} expects an int id")
+        return args[0]
+
+    def apply_messages(self, messages, apply_at=None):
+        # A bundle is one update: apply every message, then flush once
+        flush_now = False
+        dirty = False
+        music_action = None
+        for address, args in messages:
+            action = self.handle_message(address, args)
+            if action == 'request':
+                dirty = True
+            elif action == 'now':
+                flush_now = True
+            elif action in ('play', 'pause'):
+                music_action = action
+
+        if apply_at is not None:
+            # Scheduled: goes out now, tagged with when the visualizer should apply it
+            self.engine.flush_now(music_action, apply_at)
+        elif flush_now or music_action:
+            self.engine.flush_now(music_action)
+        elif dirty:
+            self.engine.request()
+
+    def serve_forever(self):
+        self.running = True
+        while self.running:
+            try:
+                data, sender = self.sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.received += 1
+            try:
+                reply = self.handle_datagram(data, sender)
+                if reply:
+                    self.sock.sendto(reply, sender)
+            except (OscError, ValueError, OverflowError) as e:
+                # One bad datagram must never stop the listener
+                self.rejected += 1
+                print(f"OSC: {e}", file=sys.stderr)
+
+    def stop(self):
+        self.running = False
+        if self.telemetry:
+            self.telemetry.stop()
+        self.sock.close()
+        self.ramps.cancel()
+        self.engine.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LUMIUS OSC control listener")
+    parser.add_argument("--host", default="0.0.0.0", help="address to bind (default: all interfaces)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="UDP port (default: 9000)")
+    parser.add_argument("--control-file", default=DEFAULT_CONTROL_FILE, help="visualizer control.txt")
+    parser.add_argument("--backend", choices=["file", "shm"], default="file",
+                        help="publish to control.txt (default) or the shared-memory block")
+    parser.add_argument("--max-rate", type=float, default=DEFAULT_MAX_RATE,
+                        help="maximum publications per second")
+    parser.add_argument("--clock-offset", type=float, default=0.0, metavar="SECONDS",
+                        help="pretend this Pi's clock is off by this much (clock sync tests)")
+    args = parser.parse_args()
+
+    clock = (lambda: time.time() + args.clock_offset) if args.clock_offset else time.time
+    server = LumiusOscServer(args.host, args.port, args.control_file, args.backend, args.max_rate, clock)
+    print(f"◢ LUMIUS OSC ◣ listening on {server.address[0]}:{server.address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        stats = server.engine.stats()
+        print(f"Datagrams: {server.received} ({server.rejected} rejected), "
+              f"writes: {stats['writes']} ({stats['suppressed']} suppressed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Shared Tk front end for the LUMIUS control panels.
+
+Builds the effect, audio, RGB and system-control widgets and forwards every
+change to a headless ControlEngine; the local and remote panels only add
+their status area, connection handling and choice of transports.
+"""
+import tkinter as tk
+import time
+
+import boot_trace
+from control_engine import ControlEngine
+from control_writer import DEFAULT_MAX_RATE, tk_scheduler
+from presets import PresetBank, PresetError, crossfade
+from ramps import RampEngine
+from rotary_knob import RotaryKnob
+
+RGB_COLORS = {'r': '#ff0000', 'g': '#00ff00', 'b': '#0066ff'}
+
+class LumiusPanelBase:
+    SPEED_MAX = 5.0
+    INTENSITY_MAX = 3.0
+    
+    def __init__(self, title, transports=(), max_write_rate=DEFAULT_MAX_RATE):
+        # Boot report: interpreter start-up and imports, measured from the launcher's spawn
+        init_start = time.time()
+        spawned = boot_trace.spawn_time()
+        if spawned:
+            boot_trace.record("control", "python_imports", spawned, init_start)
+        
+        self.root = tk.Tk()
+        self.root.title(title)
+        self.root.configure(bg='#0a0a0a')
+        self.root.resizable(True, True)
+        
+        # Variables
+        self.current_effect = tk.IntVar(value=1)
+        self.rgb_r = tk.IntVar(value=255)
+        self.rgb_g = tk.IntVar(value=255)
+        self.rgb_b = tk.IntVar(value=255)
+        self.rgb_active = tk.StringVar(value="r")
+        self.speed = tk.DoubleVar(value=1.0)
+        self.intensity = tk.DoubleVar(value=1.0)
+        self.volume = tk.DoubleVar(value=50)
+        self.preset_name = tk.StringVar()
+        self.preset_fade = tk.DoubleVar(value=2.0)
+        
+        # Headless control core: state, delta tracking, coalescing and transports
+        self.engine = ControlEngine(transports, max_rate=max_write_rate,
+                                    schedule=tk_scheduler(self.root),
+                                    on_error=self.on_transport_error)
+        # Crossfades tick on the Tk loop and mirror their values into the knobs
+        self.ramps = RampEngine(self.engine, schedule=tk_scheduler(self.root), on_tick=self.on_ramp_tick)
+        self.presets = PresetBank()
+        boot_trace.record("control", "tk_init", init_start)
+        
+    def setup_ui(self):
+        ui_start = time.time()
+        # Main title with Lumius branding
+        title_frame = tk.Frame(self.root, bg='#0a0a0a', height=60)
+        title_frame.pack(fill=tk.X, pady=10)
+        title_frame.pack_propagate(False)
+        
+        title = tk.Label(title_frame, text="◢ LUMIUS VISUAL SYNTHESIS ◣", 
+                        font=('Orbitron', 18, 'bold'), 
+                        bg='#0a0a0a', fg='#00ffff')
+        title.pack(expand=True)
+        
+        subtitle1 = tk.Label(title_frame, text="GENERATIVE & CAMERA REACTIVE VISUALS", 
+                            font=('Orbitron', 12), 
+                            bg='#0a0a0a', fg='#666666')
+        subtitle1.pack()
+        
+        subtitle2 = tk.Label(title_frame, text="REAL-TIME AUDIO VISUAL SYNTHESIS", 
+                            font=('Orbitron', 10), 
+                            bg='#0a0a0a', fg='#555555')
+        subtitle2.pack()
+        
+        # Main grid container
+        main_grid = tk.Frame(self.root, bg='#0a0a0a')
+        main_grid.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # Configure grid weights for equal distribution
+        main_grid.grid_rowconfigure(0, weight=2)  # Effects panel gets more space
+        main_grid.grid_rowconfigure(1, weight=1)
+        main_grid.grid_rowconfigure(2, weight=0)
+        main_grid.grid_columnconfigure(0, weight=1)
+        main_grid.grid_columnconfigure(1, weight=1)
+        main_grid.grid_columnconfigure(2, weight=1)
+        
+        # Create modular panels - separate generative and camera
+        self.create_generative_panel(main_grid, 0, 0, 1, 1)
+        self.create_camera_panel(main_grid, 0, 1, 1, 1)
+        self.create_audio_panel(main_grid, 0, 2, 1, 1)
+        self.create_rgb_panel(main_grid, 1, 0, 1, 1)
+        self.create_control_panel(main_grid, 1, 1, 1, 1)
+        self.create_status_panel(main_grid, 1, 2, 1, 1)
+        self.create_preset_panel(main_grid, 2, 0, 3, 1)
+        
+        # Initialize LEDs
+        self.update_rgb_leds()
+        boot_trace.record("control", "setup_ui", ui_start)
+        
+    def create_panel_frame(self, parent, title, color):
+        """Create a standardized panel frame"""
+        frame = tk.LabelFrame(parent, text=f"◆ {title}", 
+                             font=('Orbitron', 12, 'bold'),
+                             bg='#1a1a1a', fg=color, bd=3, relief=tk.RAISED,
+                             padx=10, pady=10)
+        return frame
+        
+    def create_generative_panel(self, parent, row, col, colspan, rowspan):
+        panel = self.create_panel_frame(parent, "GENERATIVE ART", '#00ff00')
+        panel.grid(row=row, column=col, columnspan=colspan, rowspan=rowspan, 
+                  padx=5, pady=5, sticky='nsew')
+        
+        effects_container = tk.Frame(panel, bg='#1a1a1a')
+        effects_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Configure grid for 4 effects
+        for i in range(4):
+            effects_container.grid_rowconfigure(i, weight=1)
+        effects_container.grid_columnconfigure(0, weight=1)
+        
+        effects_gen = [
+            ("NEURAL WAVES", 1),
+            ("CHLADNI PATTERNS", 2), 
+            ("BURST MATRIX", 3),
+            ("QUANTUM FIELD", 4)
+        ]
+        
+        for i, (name, value) in enumerate(effects_gen):
+            btn = tk.Radiobutton(effects_container, text=name, variable=self.current_effect, 
+                               value=value, command=self.on_effect_change,
+                               font=('Orbitron', 10, 'bold'), bg='#2a2a2a', fg='#00ff00',
+                               selectcolor='#444444', activebackground='#3a3a3a',
+                               indicatoron=0, width=18, height=2,
+                               relief=tk.RAISED, bd=2)
+            btn.grid(row=i, column=0, padx=3, pady=3, sticky='nsew')
+            
+    def create_camera_panel(self, parent, row, col, colspan, rowspan):
+        panel = self.create_panel_frame(parent, "CAMERA REACTIVE", '#ff6600')
+        panel.grid(row=row, column=col, columnspan=colspan, rowspan=rowspan, 
+                  padx=5, pady=5, sticky='nsew')
+        
+        effects_container = tk.Frame(panel, bg='#1a1a1a')
+        effects_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Configure grid for 3 effects
+        for i in range(3):
+            effects_container.grid_rowconfigure(i, weight=1)
+        effects_container.grid_columnconfigure(0, weight=1)
+        
+        effects_cam = [
+            ("CAMERA DISTORT", 5),
+            ("DEPTH SCANNER", 6),
+            ("FACE MORPH", 7)
+        ]
+        
+        for i, (name, value) in enumerate(effects_cam):
+            btn = tk.Radiobutton(effects_container, text=name, variable=self.current_effect, 
+                               value=value, command=self.on_effect_change,
+                               font=('Orbitron', 10, 'bold'), bg='#2a2a2a', fg='#ff6600',
+                               selectcolor='#444444', activebackground='#3a3a3a',
+                               indicatoron=0, width=18, height=2,
+                               relief=tk.RAISED, bd=2)
+            btn.grid(row=i, column=0, padx=3, pady=3, sticky='nsew')
+            
+    def create_audio_panel(self, parent, row, col, colspan, rowspan):
+        panel = self.create_panel_frame(parent, "AUDIO MATRIX", '#ff8000')
+        panel.grid(row=row, column=col, columnspan=colspan, rowspan=rowspan, 
+                  padx=5, pady=5, sticky='nsew')
+        
+        # Music buttons
+        music_buttons = tk.Frame(panel, bg='#1a1a1a')
+        music_buttons.pack(pady=10)
+        
+        tk.Button(music_buttons, text="PLAY", command=lambda: self.music_control('play'),
+                 font=('Orbitron', 10, 'bold'), bg='#003300', fg='#00ff00',
+                 activebackground='#006600', width=8, height=2).pack(side=tk.TOP, pady=2)
+        
+        tk.Button(music_buttons, text="PAUSE", command=lambda: self.music_control('pause'),
+                 font=('Orbitron', 10, 'bold'), bg='#330000', fg='#ff6600',
+                 activebackground='#660000', width=8, height=2).pack(side=tk.TOP, pady=2)
+        
+        # Volume control
+        self.create_rotary_control(panel, "VOLUME", self.volume, 0, 100, size=80, step=1)
+        
+    def create_rgb_panel(self, parent, row, col, colspan, rowspan):
+        panel = self.create_panel_frame(parent, "RGB MATRIX", '#ff00ff')
+        panel.grid(row=row, column=col, columnspan=colspan, rowspan=rowspan, 
+                  padx=5, pady=5, sticky='nsew')
+        
+        # RGB Selector with LEDs
+        rgb_selector = tk.Frame(panel, bg='#1a1a1a')
+        rgb_selector.pack(pady=10)
+        
+        # R, G, B buttons with LEDs in horizontal layout
+        for color, var_name, color_code in [('R', 'r', '#ff0000'), ('G', 'g', '#00ff00'), ('B', 'b', '#0066ff')]:
+            btn_frame = tk.Frame(rgb_selector, bg='#1a1a1a')
+            btn_frame.pack(side=tk.LEFT, padx=8)
+            
+            # LED
+            led = tk.Canvas(btn_frame, width=16, height=16, bg='#1a1a1a', highlightthickness=0)
+            led.pack()
+            setattr(self, f'{var_name}_led', led)
+            
+            # Button
+            tk.Radiobutton(btn_frame, text=color, variable=self.rgb_active, value=var_name,
+                          command=self.update_rgb_leds, font=('Orbitron', 10, 'bold'),
+                          bg='#1a1a1a', fg=color_code, selectcolor='#333333',
+                          indicatoron=0, width=3).pack()
+        
+        # RGB Rotary Control - special handling for dynamic updates
+        self.create_rgb_rotary_control(panel)
+        
+    def create_control_panel(self, parent, row, col, colspan, rowspan):
+        panel = self.create_panel_frame(parent, "SYSTEM CONTROL", '#ffff00')
+        panel.grid(row=row, column=col, columnspan=colspan, rowspan=rowspan, 
+                  padx=5, pady=5, sticky='nsew')
+        
+        # Speed and Intensity controls
+        self.create_rotary_control(panel, "SPEED", self.speed, 0.1, self.SPEED_MAX, size=70)
+        self.create_rotary_control(panel, "INTENSITY", self.intensity, 0.1, self.INTENSITY_MAX, size=70)
+        
+    def create_status_panel(self, parent, row, col, colspan, rowspan):
+        raise NotImplementedError
+        
+    def create_preset_panel(self, parent, row, col, colspan, rowspan):
+        panel = self.create_panel_frame(parent, "SCENES", '#00ffff')
+        panel.grid(row=row, column=col, columnspan=colspan, rowspan=rowspan, 
+                  padx=5, pady=5, sticky='nsew')
+        
+        editor = tk.Frame(panel, bg='#1a1a1a')
+        editor.pack(side=tk.LEFT, padx=5)
+        
+        tk.Entry(editor, textvariable=self.preset_name, width=14, font=('Orbitron', 10),
+                bg='#0a0a0a', fg='#00ffff', insertbackground='#00ffff').pack(side=tk.LEFT, padx=3)
+        
+        tk.Button(editor, text="SAVE", command=self.save_preset,
+                 font=('Orbitron', 9, 'bold'), bg='#003333', fg='#00ffff',
+                 activebackground='#006666', width=6).pack(side=tk.LEFT, padx=2)
+        
+        tk.Button(editor, text="DELETE", command=self.delete_preset,
+                 font=('Orbitron', 9, 'bold'), bg='#330000', fg='#ff6600',
+                 activebackground='#660000', width=6).pack(side=tk.LEFT, padx=2)
+        
+        tk.Label(editor, text="FADE s", font=('Orbitron', 9),
+                bg='#1a1a1a', fg='#ffffff').pack(side=tk.LEFT, padx=(10, 2))
+        tk.Spinbox(editor, textvariable=self.preset_fade, from_=0, to=30, increment=0.5, width=4,
+                  font=('Orbitron', 10), bg='#0a0a0a', fg='#00ffff').pack(side=tk.LEFT)
+        
+        # One button per stored scene: click to recall (or fade, if FADE > 0)
+        self.preset_buttons = tk.Frame(panel, bg='#1a1a1a')
+        self.preset_buttons.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+        self.refresh_preset_buttons()
+        
+    def refresh_preset_buttons(self):
+        for child in self.preset_buttons.winfo_children():
+            child.destroy()
+        for name in self.presets.names():
+            tk.Button(self.preset_buttons, text=name.upper(), command=lambda name=name: self.recall_preset(name),
+                     font=('Orbitron', 9, 'bold'), bg='#2a2a2a', fg='#00ffff',
+                     activebackground='#3a3a3a').pack(side=tk.LEFT, padx=2)
+        
+    def create_rotary_control(self, parent, label, variable, min_val, max_val, size=100, step=0.1):
+        knob = RotaryKnob(parent, label, variable, min_val, max_val, size=size, step=step,
+                          enabled=self.controls_enabled)
+        # The engine coalesces these into at most one write per frame
+        knob.bind_change(lambda knob: self.push_controls())
+        return knob
+        
+    def get_active_rgb_var(self):
+        active = self.rgb_active.get()
+        return {'r': self.rgb_r, 'g': self.rgb_g, 'b': self.rgb_b}[active]
+            
+    def update_rgb_leds(self):
+        active = self.rgb_active.get()
+        
+        for color, led_name in [('r', 'r_led'), ('g', 'g_led'), ('b', 'b_led')]:
+            led = getattr(self, led_name)
+            led.delete("all")
+            
+            if color == active:
+                fill_color = RGB_COLORS[color]
+            else:
+                fill_color = {'r': '#330000', 'g': '#003300', 'b': '#000033'}[color]
+                
+            led.create_oval(2, 2, 14, 14, fill=fill_color, outline='#666666')
+        
+        # Update RGB rotary control to reflect current active component
+        self.update_rgb_rotary()
+        self.push_controls()
+        
+    def create_rgb_rotary_control(self, parent):
+        # One knob for the active RGB component; selecting R/G/B retargets it
+        self.rgb_knob = RotaryKnob(parent, "RGB VALUE", self.get_active_rgb_var(), 0, 255, size=80,
+                                   color=RGB_COLORS[self.rgb_active.get()], step=1,
+                                   enabled=self.controls_enabled)
+        self.rgb_knob.bind_change(lambda knob: self.push_controls())
+        
+    def update_rgb_rotary(self):
+        # Reflect the new active component
+        active = self.rgb_active.get()
+        self.rgb_knob.set_variable(self.get_active_rgb_var(), RGB_COLORS[active])
+        
+    def on_effect_change(self):
+        self.push_controls(immediate=True)
+        
+    def music_control(self, action):
+        self.push_controls(music_action=action)
+        
+    def control_vars(self):
+        return {
+            'effect': self.current_effect,
+            'rgb_r': self.rgb_r,
+            'rgb_g': self.rgb_g,
+            'rgb_b': self.rgb_b,
+            'speed': self.speed,
+            'intensity': self.intensity,
+            'volume': self.volume,
+        }
+        
+    def control_values(self):
+        return {name: var.get() for name, var in self.control_vars().items()}
+        
+    def on_ramp_tick(self, values):
+        # Knobs follow their variables, so a fade redraws them at most once per frame
+        variables = self.control_vars()
+        for name, value in values.items():
+            variable = variables[name]
+            variable.set(round(value) if isinstance(variable, tk.IntVar) else value)
+            
+    def save_preset(self):
+        try:
+            self.presets.save(self.preset_name.get(), self.control_values())
+        except (PresetError, OSError) as e:
+            print(f"Preset: {e}")
+            return
+        self.refresh_preset_buttons()
+        
+    def delete_preset(self):
+        try:
+            self.presets.delete(self.preset_name.get().strip())
+        except OSError as e:
+            print(f"Preset: {e}")
+        self.refresh_preset_buttons()
+        
+    def recall_preset(self, name):
+        self.preset_name.set(name)
+        if not self.controls_enabled():
+            return
+        values = self.presets.get(name)
+        try:
+            fade = self.preset_fade.get()
+        except tk.TclError:
+            fade = 0.0
+        if fade > 0:
+            crossfade(self.engine, self.ramps, values, fade)
+        else:
+            # Every field at once, published as a single update
+            self.on_ramp_tick(values)
+            self.push_controls(immediate=True)
+        
+    def controls_enabled(self):
+        return True
+        
+    def push_controls(self, immediate=False, music_action=None):
+        # A hand on the controls takes over from a running crossfade
+        self.ramps.cancel()
+        # Latest Tk values into the engine; it decides what (and when) to publish
+        if immediate or music_action:
+            self.engine.state.update(self.control_values())
+            self.engine.flush_now(music_action)
+        else:
+            self.engine.update(self.control_values())
+            
+    def on_transport_error(self, transport, error):
+        print(f"Control transport {transport.name}: {error}")
+        
+    def print_stats(self):
+        stats = self.engine.stats()
+        print(f"Control writes: {stats['writes']} ({stats['suppressed']} suppressed)")
+        
+    def run(self):
+        # Configure window close behavior to shutdown entire system
+        self.root.protocol("WM_DELETE_WINDOW", self.shutdown_system)
+        # First idle callback: the window has been mapped and drawn
+        loop_start = time.time()
+        self.root.after_idle(lambda: boot_trace.record("control", "first_paint", loop_start))
+        self.root.mainloop()
+        
+    def shutdown_system(self):
+        raise NotImplementedError
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+LUMIUS Pico bridge - feeds the HSV encoder into the visualizer's RGB controls.
+
+Reads the Pico's USB serial stream (pico-firmware/quadrature_encoder.c),
+either 16-byte binary packets (default firmware output, layout documented
+in the firmware) or the text fallback:
+
+    Hue: 120.0
+    S: 100.0
+    V: 50.0
+    Mode: HUE
+    ---
+
+converts each reading to rgb_r/rgb_g/rgb_b and publishes through a
+ControlEngine, coalesced to the visualizer frame rate. Only the RGB fields
+are sent: OSC carries just the changed fields, and control.txt / shared
+memory are re-read before each publication so effect, speed etc. stay as
+the panel last set them.
+
+The source can be the real device, a pseudo-tty or a recorded capture:
+
+    python3 pico_bridge.py --device /dev/ttyACM0
+    python3 pico_bridge.py --device capture.txt --line-delay 0.05
+    python3 pico_bridge.py --device /dev/ttyACM0 --record capture.bin
+    python3 pico_bridge.py --device /dev/ttyACM0 --framing text
+"""
+import argparse
+import binascii
+import colorsys
+import os
+import stat
+import struct
+import sys
+import termios
+import time
+import tty
+
+from control_engine import ControlEngine, make_transport
+from control_writer import DEFAULT_MAX_RATE
+
+DEFAULT_DEVICE = "/dev/ttyACM0"
+DEFAULT_BAUD = 115200
+READ_SIZE = 256
+
+PICO_FIELDS = {"Hue": "hue", "S": "saturation", "V": "value"}
+PICO_MODES = ("HUE", "SAT", "VAL", "DISABLE")
+RGB_FIELDS = ("rgb_r", "rgb_g", "rgb_b")
+
+# Binary packet: sync, seq, mode, buttons, delta, hue/sat/val in tenths, crc
+FRAME_SYNC = b"\xa5\x5a"
+FRAME_FORMAT = "<2sHbBhHHHH"
+FRAME_SIZE = struct.calcsize(FRAME_FORMAT)
+FRAME_BODY = slice(2, FRAME_SIZE - 2)  # bytes covered by the CRC
+FRAMING_COMMANDS = {"binary": b"b", "text": b"t"}
+
+
+def hsv_to_rgb(hue, saturation, value):
+    """Pico units (0-360 degrees, 0-100 %, 0-100 %) to 0-255 RGB."""
+    r, g, b = colorsys.hsv_to_rgb((hue % 360.0) / 360.0,
+                                  min(max(saturation, 0.0), 100.0) / 100.0,
+                                  min(max(value, 0.0), 100.0) / 100.0)
+    return round(r * 255), round(g * 255), round(b * 255)
+
+
+class PicoTextParser:
+    """Collects `key: value` lines into one reading per `---` separator."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.current = {}
+        self.readings = 0
+        self.malformed = 0
+
+    def feed(self, data):
+        """Returns the readings completed by this chunk of bytes."""
+        self.buffer += data
+        readings = []
+        start = 0
+        while True:
+            end = self.buffer.find(b"\n", start)
+            if end < 0:
+                break
+            reading = self.feed_line(self.buffer[start:end].decode(errors="replace"))
+            if reading:
+                readings.append(reading)
+            start = end + 1
+        del self.buffer[:start]
+        return readings
+
+    def feed_line(self, line):
+        """Returns a complete reading dict at a separator, otherwise None."""
+        line = line.strip()
+        if not line:
+            return None
+        if line == "---":
+            reading, self.current = self.current, {}
+            if not all(field in reading for field in PICO_FIELDS.values()):
+                # Started mid-block or lost bytes: wait for the next one
+                self.malformed += 1
+                return None
+            self.readings += 1
+            return reading
+
+        key, sep, value = line.partition(":")
+        key, value = key.strip(), value.strip()
+        if not sep:
+            # Banner ("HSV Controller Ready") or noise
+            return None
+        if key in PICO_FIELDS:
+            try:
+                self.current[PICO_FIELDS[key]] = float(value)
+            except ValueError:
+                self.malformed += 1
+        elif key == "Mode" and value in PICO_MODES:
+            self.current["mode"] = value
+        return None
+
+
+class PicoFrameDecoder:
+    """
+    Decodes binary packets straight out of the receive buffer.
+
+    Fields are read with struct.unpack_from and the CRC is computed over a
+    memoryview, so no per-packet copies are made; consumed bytes are
+    dropped once per chunk. A bad CRC skips one byte and resyncs on the
+    next sync pattern.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.readings = 0
+        self.malformed = 0
+        self.lost = 0
+        self.last_seq = None
+
+    def feed(self, data):
+        self.buffer += data
+        buf = self.buffer
+        view = memoryview(buf)
+        readings = []
+        offset = 0
+        try:
+            while True:
+                offset = buf.find(FRAME_SYNC, offset)
+                if offset < 0:
+                    # Keep a trailing sync byte that may be half of the next pattern
+                    offset = len(buf) - 1 if buf.endswith(FRAME_SYNC[:1]) else len(buf)
+                    break
+                if len(buf) - offset < FRAME_SIZE:
+                    break
+
+                (_, seq, mode, buttons, delta,
+                 hue, saturation, value, crc) = struct.unpack_from(FRAME_FORMAT, buf, offset)
+                with view[offset + FRAME_BODY.start:offset + FRAME_BODY.stop] as body:
+                    valid = binascii.crc_hqx(body, 0xFFFF) == crc
+                if not valid:
+                    self.malformed += 1
+                    offset += 1
+                    continue
+
+                if self.last_seq is not None:
+                    self.lost += (seq - self.last_seq - 1) & 0xFFFF
+                self.last_seq = seq
+                self.readings += 1
+                readings.append({
+                    "hue": hue / 10.0,
+                    "saturation": saturation / 10.0,
+                    "value": value / 10.0,
+                    "mode": PICO_MODES[mode] if 0 <= mode <= 2 else "DISABLE",
+                    "seq": seq,
+                    "delta": delta,
+                    "buttons": buttons,
+                })
+                offset += FRAME_SIZE
+        finally:
+            view.release()
+        del buf[:offset]
+        return readings
+
+
+def encode_frame(seq, mode, buttons, delta, hue, saturation, value):
+    """Build a packet as the firmware does (captures, pty simulation)."""
+    body = struct.pack(FRAME_FORMAT[:-1], FRAME_SYNC, seq & 0xFFFF, mode, buttons, delta,
+                       round(hue * 10), round(saturation * 10), round(value * 10))
+    return body + struct.pack("<H", binascii.crc_hqx(body[FRAME_BODY], 0xFFFF))
+
+
+def detect_framing(data):
+    """'binary', 'text' or None while the stream is still ambiguous."""
+    if FRAME_SYNC in data:
+        return "binary"
+    if b"---" in data or b"Hue:" in data:
+        return "text"
+    return None
+
+
+def open_source(path, baud=DEFAULT_BAUD, writable=False):
+    """Raw file descriptor for a serial device, pty, FIFO or capture file."""
+    fd = os.open(path, (os.O_RDWR if writable else os.O_RDONLY) | os.O_NOCTTY)
+    if stat.S_ISCHR(os.fstat(fd).st_mode) and os.isatty(fd):
+        # No line discipline: echo, CR translation and buffering off
+        tty.setraw(fd)
+        attrs = termios.tcgetattr(fd)
+        speed = getattr(termios, f"B{baud}", termios.B115200)
+        attrs[4] = attrs[5] = speed
+        termios.tcsetattr(fd, termios.TCSANOW, attrs)
+    return fd
+
+
+class PicoBridge:
+    def __init__(self, engine, fd, record=None, line_delay=0.0, framing=None):
+        self.engine = engine
+        self.fd = fd
+        self.record = record
+        self.line_delay = line_delay
+        self.framing = framing
+        self.decoder = self._make_decoder(framing)
+        self.pending = bytearray()
+        self.running = False
+        self.mode = None
+
+    def _make_decoder(self, framing):
+        if framing == "binary":
+            return PicoFrameDecoder()
+        if framing == "text":
+            return PicoTextParser()
+        return None
+
+    def handle_reading(self, reading):
+        self.mode = reading.get("mode", self.mode)
+        r, g, b = hsv_to_rgb(reading["hue"], reading["saturation"], reading["value"])
+        self.engine.update({'rgb_r': r, 'rgb_g': g, 'rgb_b': b})
+
+    def feed(self, data):
+        if self.record:
+            self.record.write(data)
+        if self.decoder is None:
+            # Auto-detect from the first bytes (text never contains the sync byte)
+            self.pending += data
+            self.framing = detect_framing(self.pending)
+            if self.framing is None:
+                return
+            self.decoder = self._make_decoder(self.framing)
+            data, self.pending = bytes(self.pending), bytearray()
+
+        for reading in self.decoder.feed(data):
+            self.handle_reading(reading)
+            if self.line_delay:
+                # Replaying a capture: keep roughly the device's pace
+                time.sleep(self.line_delay)
+
+    def run(self):
+        self.running = True
+        while self.running:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except OSError:
+                # pty master closed or device unplugged
+                break
+            if not data:
+                break
+            self.feed(data)
+        # Make sure the last reading is published before exiting
+        self.engine.flush_now()
+
+    def stop(self):
+        self.running = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bridge the Pico HSV encoder to LUMIUS RGB controls")
+    parser.add_argument("--device", default=DEFAULT_DEVICE,
+                        help="serial device, pty or recorded capture (default: /dev/ttyACM0)")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD)
+    parser.add_argument("--transport", action="append", default=[],
+                        help="file[:path] (default), shm[:path] or udp:host[:port]; repeatable")
+    parser.add_argument("--max-rate", type=float, default=DEFAULT_MAX_RATE,
+                        help="maximum publications per second")
+    parser.add_argument("--record", help="also write the raw stream to this file")
+    parser.add_argument("--line-delay", type=float, default=0.0,
+                        help="pause after each reading (for replaying captures)")
+    parser.add_argument("--framing", choices=["auto", "binary", "text"], default="auto",
+                        help="expect this stream format; on a device, also switch the Pico to it")
+    args = parser.parse_args()
+
+    # Never resend the full state: other fields belong to the panel, and the
+    # snapshot transports re-read them before every publication
+    engine = ControlEngine([make_transport(spec, RGB_FIELDS) for spec in args.transport or ["file"]],
+                           max_rate=args.max_rate, full_interval=float("inf"))
+    for transport in engine.transports:
+        current = transport.current_values()
+        if current:
+            engine.state.update(current)
+    engine.state.mark_synced()
+
+    framing = None if args.framing == "auto" else args.framing
+    try:
+        fd = open_source(args.device, args.baud, writable=framing is not None)
+        if framing and os.isatty(fd):
+            os.write(fd, FRAMING_COMMANDS[framing])
+    except OSError as e:
+        print(f"Cannot open {args.device}: {e}", file=sys.stderr)
+        return 1
+
+    record = open(args.record, "ab") if args.record else None
+    bridge = PicoBridge(engine, fd, record, args.line_delay, framing)
+    print(f"◢ LUMIUS PICO ◣ reading {args.device}")
+    try:
+        bridge.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.close(fd)
+        if record:
+            record.close()
+        stats = engine.stats()
+        engine.close()
+        decoder = bridge.decoder
+        if decoder:
+            lost = f", {decoder.lost} lost" if bridge.framing == "binary" else ""
+            print(f"Readings ({bridge.framing}): {decoder.readings} ({decoder.malformed} malformed{lost}), "
+                  f"writes: {stats['writes']} ({stats['suppressed']} suppressed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
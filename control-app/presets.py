@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Scene presets: named snapshots of every control field.
+
+The bank is one small JSON file, each preset stored as a list of values in
+CONTROL_FIELDS order:
+
+    {"fields": ["effect", "rgb_r", ...], "presets": {"batuque": [1, 255, 120, 0, 1.5, 2.0, 80]}}
+
+Recall puts the whole snapshot into the engine state and publishes it as a
+single update. A crossfade glides the continuous fields with the ramp
+engine (still at most one publication per frame) and switches the effect
+halfway through.
+
+    python3 presets.py list
+    python3 presets.py recall batuque [--fade 4]
+"""
+import argparse
+import json
+import os
+import sys
+
+from control_protocol import CONTROL_DEFAULTS, CONTROL_FIELDS, CONTROL_TYPES
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PRESET_FILE = os.path.join(APP_DIR, "presets.json")
+
+
+class PresetError(Exception):
+    pass
+
+
+class PresetBank:
+    def __init__(self, path=DEFAULT_PRESET_FILE):
+        self.path = path
+        self.presets = {}
+        self.load()
+
+    def load(self):
+        self.presets = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("not a preset bank")
+            fields = data.get("fields", list(CONTROL_FIELDS))
+            presets = {}
+            for name, row in data.get("presets", {}).items():
+                # Tolerate banks written with fewer/other fields
+                values = dict(CONTROL_DEFAULTS)
+                values.update({field: CONTROL_TYPES[field](value)
+                               for field, value in zip(fields, row) if field in CONTROL_TYPES})
+                presets[name] = values
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            # Corrupt or truncated bank: start empty, the next save writes a clean file
+            print(f"Preset bank {self.path} unreadable, starting empty: {e}", file=sys.stderr)
+            return
+        self.presets = presets
+
+    def store(self):
+        data = {
+            "fields": list(CONTROL_FIELDS),
+            "presets": {name: [values[field] for field in CONTROL_FIELDS]
+                        for name, values in sorted(self.presets.items())},
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def names(self):
+        return sorted(self.presets)
+
+    def get(self, name):
+        if name not in self.presets:
+            raise PresetError(f"no preset named {name!r}")
+        return dict(self.presets[name])
+
+    def save(self, name, values):
+        name = name.strip()
+        if not name:
+            raise PresetError("preset name is empty")
+        self.presets[name] = {field: CONTROL_TYPES[field](values[field]) for field in CONTROL_FIELDS}
+        self.store()
+
+    def delete(self, name):
+        if self.presets.pop(name, None) is not None:
+            self.store()
+
+
+def recall(engine, values):
+    """Publish a whole snapshot as one update."""
+    engine.state.update(values)
+    engine.flush_now()
+
+
+def crossfade(engine, ramps, values, duration, easing='ease_in_out', from_values=None, on_done=None,
+              elapsed=0.0):
+    """
+    Glide from the current (or `from_values`) state to a preset over `duration` seconds.
+    `elapsed` joins a fade already that far along (the sequencer's seek).
+    """
+    if from_values:
+        recall(engine, from_values)
+    if duration <= elapsed:
+        ramps.cancel()
+        recall(engine, values)
+        if on_done:
+            on_done()
+        return
+
+    # The effect is discrete: switch it at the midpoint of the fade
+    effect = values['effect']
+    fade = ramps.begin_fade()
+
+    def switch_effect():
+        # Skipped if the fade was cancelled (e.g. a knob was moved) or a newer one started
+        if ramps.fade_current(fade):
+            engine.state.set('effect', effect)
+            if ramps.on_tick:
+                ramps.on_tick({'effect': effect})
+            engine.flush_now()
+
+    ramps.ramp_many(values, duration, easing, on_done=on_done, elapsed=elapsed)
+    if effect != engine.get('effect'):
+        ramps.schedule(max(duration / 2 - elapsed, 0.0), switch_effect)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LUMIUS scene presets")
+    parser.add_argument("--file", default=DEFAULT_PRESET_FILE, help="preset bank (default: presets.json)")
+    parser.add_argument("--transport", action="append", default=[],
+                        help="file[:path] (default), shm[:path] or udp:host[:port]; repeatable")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="show stored presets")
+    save = sub.add_parser("save", help="store what the visualizer currently has")
+    save.add_argument("name")
+    delete = sub.add_parser("delete")
+    delete.add_argument("name")
+    recall_cmd = sub.add_parser("recall")
+    recall_cmd.add_argument("name")
+    recall_cmd.add_argument("--fade", type=float, default=0.0, metavar="SECONDS", help="crossfade time")
+    recall_cmd.add_argument("--easing", default="ease_in_out")
+    args = parser.parse_args()
+
+    bank = PresetBank(args.file)
+    if args.command == "list":
+        for name in bank.names():
+            values = bank.get(name)
+            print(f"{name:<20} " + " ".join(f"{field}={values[field]}" for field in CONTROL_FIELDS))
+        return 0
+    if args.command == "delete":
+        bank.delete(args.name)
+        return 0
+
+    from control_engine import ControlEngine, make_transport
+    from ramps import RampEngine
+    engine = ControlEngine([make_transport(spec) for spec in args.transport or ["file"]])
+    for transport in engine.transports:
+        current = transport.current_values()
+        if current:
+            engine.state.update(current)
+    engine.state.mark_synced()
+
+    try:
+        if args.command == "save":
+            bank.save(args.name, engine.snapshot())
+        else:
+            ramps = RampEngine(engine)
+            crossfade(engine, ramps, bank.get(args.name), args.fade, args.easing)
+            ramps.wait()
+    except PresetError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        engine.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
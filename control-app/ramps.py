@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Parameter ramps for the control engine.
+
+Moves continuous controls (speed, intensity, volume, RGB) from their
+current value to a target over a duration, along an easing curve, instead
+of jumping. Ramps tick at `tick_rate` and write into the engine's state;
+the engine's coalescing writer still limits publications to the
+visualizer frame rate, so a ramp never floods a transport.
+
+A new target for a field cancels the running ramp and starts from the
+value reached so far:
+
+    ramps = RampEngine(engine)
+    ramps.ramp('speed', 3.0, duration=2.0, easing='ease_in_out')
+    ramps.ramp_many({'rgb_r': 0, 'rgb_b': 255}, duration=1.5)
+"""
+import math
+import threading
+import time
+
+from control_protocol import CONTROL_TYPES
+from control_writer import thread_scheduler
+
+DEFAULT_TICK_RATE = 60.0
+
+EASINGS = {
+    'linear': lambda t: t,
+    'ease_in': lambda t: t * t,
+    'ease_out': lambda t: t * (2 - t),
+    'ease_in_out': lambda t: t * t * (3 - 2 * t),
+    'sine': lambda t: 0.5 - 0.5 * math.cos(math.pi * t),
+    'exponential': lambda t: 0.0 if t <= 0 else 2 ** (10 * (t - 1)),
+}
+
+# Discrete controls switch, they never ramp
+DISCRETE_FIELDS = ('effect',)
+
+
+class Ramp:
+    def __init__(self, name, start, target, duration, easing, started_at, on_done=None):
+        self.name = name
+        self.start = start
+        self.target = target
+        self.duration = duration
+        self.easing = EASINGS[easing]
+        self.started_at = started_at
+        self.on_done = on_done
+
+    def value_at(self, now):
+        """(value, finished) at time `now`."""
+        t = (now - self.started_at) / self.duration if self.duration > 0 else 1.0
+        if t >= 1.0:
+            return self.target, True
+        return self.start + (self.target - self.start) * self.easing(max(t, 0.0)), False
+
+
+class RampEngine:
+    def __init__(self, engine, tick_rate=DEFAULT_TICK_RATE, schedule=None, clock=time.monotonic,
+                 on_tick=None):
+        self.engine = engine
+        self.on_tick = on_tick  # on_tick(values): mirror ramped values (e.g. into Tk variables)
+        self.tick_interval = 1.0 / tick_rate
+        self.schedule = schedule or thread_scheduler
+        self.clock = clock
+
+        self.lock = threading.RLock()
+        self.ramps = {}
+        self.ticking = False
+        self.ticks = 0
+        self.fade = 0  # generation of the current crossfade (presets.crossfade)
+
+    def ramp(self, name, target, duration, easing='ease_in_out', on_done=None, elapsed=0.0):
+        """
+        Start (or retarget) a ramp; `on_done(name)` is called when it lands.
+        `elapsed` joins a ramp already that far along (e.g. after a seek).
+        """
+        if name not in CONTROL_TYPES:
+            raise KeyError(f"unknown control field: {name}")
+        if name in DISCRETE_FIELDS:
+            raise ValueError(f"{name} is discrete and cannot be ramped")
+        if easing not in EASINGS:
+            raise ValueError(f"unknown easing: {easing} (choose from {', '.join(EASINGS)})")
+
+        with self.lock:
+            # Start from wherever a cancelled ramp left the value
+            self.ramps[name] = Ramp(name, float(self.engine.get(name)), float(target), duration,
+                                    easing, self.clock() - elapsed, on_done)
+            self._start_ticking()
+
+    def ramp_many(self, values, duration, easing='ease_in_out', on_done=None, elapsed=0.0):
+        """Ramp several fields together; `on_done` fires once, when the last one lands."""
+        values = {name: value for name, value in values.items() if name not in DISCRETE_FIELDS}
+        remaining = set(values)
+
+        def landed(name):
+            remaining.discard(name)
+            if not remaining and on_done:
+                on_done()
+
+        with self.lock:
+            for name, value in values.items():
+                self.ramp(name, value, duration, easing, on_done=landed, elapsed=elapsed)
+        if not values and on_done:
+            on_done()
+
+    def set(self, name, value):
+        """Jump straight to a value, cancelling any ramp on that field."""
+        self.cancel(name)
+        self.engine.set(name, value)
+
+    def cancel(self, name=None):
+        with self.lock:
+            if name is None or name in DISCRETE_FIELDS:
+                # Also ends the running crossfade: its pending effect switch must not fire
+                self.fade += 1
+            if name is None:
+                self.ramps.clear()
+            else:
+                self.ramps.pop(name, None)
+
+    def begin_fade(self):
+        """Start a new crossfade generation; any older fade is superseded."""
+        with self.lock:
+            self.fade += 1
+            return self.fade
+
+    def fade_current(self, fade):
+        with self.lock:
+            return fade == self.fade
+
+    def active(self, name=None):
+        with self.lock:
+            return bool(self.ramps) if name is None else name in self.ramps
+
+    def wait(self, timeout=None):
+        """Block until every ramp finished (headless use)."""
+        deadline = None if timeout is None else self.clock() + timeout
+        while self.active():
+            if deadline is not None and self.clock() >= deadline:
+                return False
+            time.sleep(self.tick_interval)
+        return True
+
+    def _start_ticking(self):
+        if not self.ticking:
+            self.ticking = True
+            self._tick()
+
+    def _tick(self):
+        finished = []
+        with self.lock:
+            now = self.clock()
+            values = {}
+            for name, ramp in list(self.ramps.items()):
+                value, done = ramp.value_at(now)
+                values[name] = value
+                if done:
+                    del self.ramps[name]
+                    finished.append(ramp)
+            if values:
+                self.ticks += 1
+                for name, value in values.items():
+                    if CONTROL_TYPES[name] is int:
+                        value = round(value)
+                    self.engine.state.set(name, value)
+            self.ticking = bool(self.ramps)
+            if self.ticking:
+                self.schedule(self.tick_interval, self._tick)
+
+        if values and self.on_tick:
+            self.on_tick(values)
+        # Coalesced by the engine to the consumer's frame rate; the last value lands for sure
+        if finished and not self.ticking:
+            self.engine.flush_now()
+        elif values:
+            self.engine.request()
+        for ramp in finished:
+            if ramp.on_done:
+                ramp.on_done(ramp.name)
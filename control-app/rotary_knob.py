@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Rotary knob widget for the LUMIUS panels.
+
+The canvas items (rings, indicator line, center dot) are created once;
+value changes only move the indicator with `coords` and recolor it with
+`itemconfig`. Redraws follow the Tk variable and are coalesced to the
+display refresh rate, so a fast drag costs at most one canvas update per
+frame however many motion events arrive.
+
+Geometry is precomputed: every quantized value has its indicator end point
+in a table, so a redraw is a lookup rather than trigonometry.
+
+Input:
+    drag up/down        relative change (full range over DRAG_PIXELS), Shift = fine
+    double click        jump to the clicked angle
+    scroll wheel        one step per notch, Shift = ten
+    arrows              one step, Page Up/Down ten steps, Home/End min/max
+                        (click the knob first to give it keyboard focus)
+
+Every user change emits the `<<RotaryChanged>>` virtual event on the knob's
+canvas; bind it with `knob.bind_change(callback)`.
+"""
+import tkinter as tk
+import math
+
+from control_writer import CoalescingWriter, tk_scheduler
+
+DISPLAY_RATE = 60.0   # redraws per second
+START_ANGLE = -135.0  # degrees, minimum value (Tk y axis points down)
+SWEEP = 270.0         # degrees from minimum to maximum
+DRAG_PIXELS = 200     # vertical drag distance covering the whole range
+FINE_FACTOR = 0.1     # Shift while dragging
+PAGE_STEPS = 10       # Page Up/Down, Shift+wheel
+CHANGE_EVENT = "<<RotaryChanged>>"
+
+
+class RotaryKnob:
+    def __init__(self, parent, label, variable, min_val, max_val, size=100,
+                 color='#00ffff', step=0.1, enabled=None):
+        self.variable = variable
+        self.min_val = min_val
+        self.max_val = max_val
+        self.step = step
+        self.size = size
+        self.color = color
+        self.enabled = enabled or (lambda: True)
+
+        # Precomputed geometry
+        self.center = size // 2
+        self.radius = self.center - 10
+        self.indicator_length = self.radius - 15
+        self.steps = max(1, int(round((max_val - min_val) / step)))
+        self.integer = float(step).is_integer() and float(min_val).is_integer()
+        self.decimals = 0 if self.integer else max(0, -int(math.floor(math.log10(step))))
+        self.endpoints = [self.endpoint(START_ANGLE + SWEEP * i / self.steps) for i in range(self.steps + 1)]
+
+        self.drag_origin = None
+
+        self.frame = tk.Frame(parent, bg='#1a1a1a')
+        self.frame.pack(pady=5)
+
+        # Label
+        tk.Label(self.frame, text=label, font=('Orbitron', 9),
+                bg='#1a1a1a', fg='#ffffff').pack()
+
+        # Rotary canvas
+        self.canvas = tk.Canvas(self.frame, width=size, height=size, bg='#0a0a0a',
+                                highlightthickness=0, takefocus=1)
+        self.canvas.pack(pady=3)
+
+        # Value label
+        self.value_label = tk.Label(self.frame, text="",
+                                   font=('Orbitron', 10, 'bold'),
+                                   bg='#1a1a1a', fg='#00ffff')
+        self.value_label.pack()
+
+        self.create_items()
+
+        self.redraws = CoalescingWriter(self.redraw, max_rate=DISPLAY_RATE,
+                                        schedule=tk_scheduler(self.canvas))
+        self.trace_id = self.variable.trace_add("write", self.on_variable_write)
+
+        canvas = self.canvas
+        canvas.bind("<Button-1>", self.on_press)
+        canvas.bind("<B1-Motion>", self.on_drag)
+        canvas.bind("<ButtonRelease-1>", self.on_release)
+        canvas.bind("<Double-Button-1>", self.on_double_click)
+        canvas.bind("<MouseWheel>", self.on_wheel)
+        canvas.bind("<Button-4>", self.on_wheel)  # X11 wheel up
+        canvas.bind("<Button-5>", self.on_wheel)  # X11 wheel down
+        for key, steps in (("Up", 1), ("Right", 1), ("Down", -1), ("Left", -1),
+                           ("Prior", PAGE_STEPS), ("Next", -PAGE_STEPS)):
+            canvas.bind(f"<{key}>", lambda event, steps=steps: self.on_key(steps))
+        canvas.bind("<Home>", lambda event: self.on_key(-self.steps))
+        canvas.bind("<End>", lambda event: self.on_key(self.steps))
+        canvas.bind("<FocusIn>", lambda event: canvas.itemconfig(self.ring, outline='#00ffff'))
+        canvas.bind("<FocusOut>", lambda event: canvas.itemconfig(self.ring, outline='#333333'))
+
+        self.redraw()
+
+    def endpoint(self, angle):
+        rad = math.radians(angle)
+        return (self.center + self.indicator_length * math.cos(rad),
+                self.center + self.indicator_length * math.sin(rad))
+
+    def create_items(self):
+        center = self.center
+        radius = self.radius
+        canvas = self.canvas
+
+        # Outer circle (highlighted while the knob has keyboard focus)
+        self.ring = canvas.create_oval(center-radius, center-radius, center+radius, center+radius,
+                                       outline='#333333', width=2)
+        # Inner circle
+        canvas.create_oval(center-radius+10, center-radius+10, center+radius-10, center+radius-10,
+                         outline='#666666', width=1)
+
+        # Indicator line, moved by redraw()
+        self.indicator = canvas.create_line(center, center, center, center, fill=self.color, width=3)
+
+        # Center dot
+        self.dot = canvas.create_oval(center-3, center-3, center+3, center+3, fill=self.color, outline='#ffffff')
+
+    # Value mapping: everything goes through the step index
+
+    def index_of(self, value):
+        index = int(round((value - self.min_val) / self.step))
+        return min(max(index, 0), self.steps)
+
+    def value_at(self, index):
+        index = min(max(index, 0), self.steps)
+        if index == self.steps:
+            return self.max_val
+        value = self.min_val + index * self.step
+        return int(round(value)) if self.integer else round(value, self.decimals)
+
+    def quantize(self, value):
+        return self.value_at(self.index_of(value))
+
+    def format_value(self, value):
+        return f"{int(value)}" if self.integer else f"{value:.{self.decimals}f}"
+
+    def redraw(self):
+        value = self.variable.get()
+        end_x, end_y = self.endpoints[self.index_of(value)]
+        self.canvas.coords(self.indicator, self.center, self.center, end_x, end_y)
+        self.value_label.config(text=self.format_value(value))
+
+    def on_variable_write(self, *args):
+        self.redraws.request()
+
+    def set_color(self, color):
+        if color != self.color:
+            self.color = color
+            self.canvas.itemconfig(self.indicator, fill=color)
+            self.canvas.itemconfig(self.dot, fill=color)
+
+    def set_variable(self, variable, color=None):
+        """Point the knob at another Tk variable (e.g. the active RGB channel)."""
+        if variable is not self.variable:
+            self.variable.trace_remove("write", self.trace_id)
+            self.variable = variable
+            self.trace_id = variable.trace_add("write", self.on_variable_write)
+        if color:
+            self.set_color(color)
+        self.redraw()
+
+    def bind_change(self, callback):
+        """callback(knob) after every user change."""
+        self.canvas.bind(CHANGE_EVENT, lambda event: callback(self), add="+")
+
+    def set_value(self, value):
+        value = self.quantize(value)
+        if value != self.variable.get():
+            self.variable.set(value)
+            self.canvas.event_generate(CHANGE_EVENT)
+
+    def nudge(self, steps):
+        self.set_value(self.value_at(self.index_of(self.variable.get()) + steps))
+
+    # Input handlers
+
+    def on_press(self, event):
+        self.canvas.focus_set()
+        if not self.enabled():
+            return
+        self.drag_origin = (event.y, self.variable.get())
+
+    def on_drag(self, event):
+        if not self.enabled() or self.drag_origin is None:
+            return
+        start_y, start_value = self.drag_origin
+        per_pixel = (self.max_val - self.min_val) / DRAG_PIXELS
+        if event.state & 0x0001:  # Shift
+            per_pixel *= FINE_FACTOR
+        self.set_value(start_value + (start_y - event.y) * per_pixel)
+
+    def on_release(self, event):
+        self.drag_origin = None
+
+    def on_double_click(self, event):
+        if not self.enabled():
+            return
+        angle = math.degrees(math.atan2(event.y - self.center, event.x - self.center))
+        if angle < START_ANGLE:
+            angle += 360
+        angle = min(max(angle, START_ANGLE), START_ANGLE + SWEEP)
+        self.set_value(self.min_val + (angle - START_ANGLE) / SWEEP * (self.max_val - self.min_val))
+
+    def on_wheel(self, event):
+        if not self.enabled():
+            return
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        steps = PAGE_STEPS if event.state & 0x0001 else 1
+        self.nudge(steps if up else -steps)
+
+    def on_key(self, steps):
+        if self.enabled():
+            self.nudge(steps)
+        return "break"
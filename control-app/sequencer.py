@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Timeline sequencer for scripted LUMIUS shows.
+
+A show is a text file of timestamped cues, one per line:
+
+    # time     command
+    0:00       effect 1
+    0:00       set speed=1.0 rgb_r=255 rgb_g=80 rgb_b=0
+    0:04.5     ramp 3.0 speed=4.0 rgb_b=255          # seconds, then fields
+    0:08       ramp 2 sine intensity=2.5             # optional easing
+    0:10       music play
+    0:20       preset batuque 4                      # optional fade time
+    1:30       end                                   # show length (for --loop)
+
+Times are seconds or [h:]m:ss.sss from the start of the show; cues with the
+same time fire in file order.
+
+The scheduler sleeps until just before each cue and spins the last two
+milliseconds on the high-resolution clock, so cues fire well within one
+visualizer frame. Cue times are absolute (start + offset, plus the show
+length on every loop), so lateness never accumulates. Every firing is
+measured against its target and summarized at the end.
+
+Seeking to a position rebuilds the state the show has there: earlier cues
+are applied silently, ramps and fades that span the position resume
+part-way, and the result is published as one update.
+
+    python3 sequencer.py show.txt
+    python3 sequencer.py show.txt --start 1:00 --loop
+    python3 sequencer.py show.txt --check
+"""
+import argparse
+import bisect
+import sys
+import threading
+import time
+
+from control_protocol import CONTROL_TYPES
+from ramps import DISCRETE_FIELDS, EASINGS, RampEngine
+
+SPIN_TIME = 0.002  # final stretch before a cue is busy-waited instead of slept
+COMMANDS = ("effect", "set", "ramp", "music", "preset", "end")
+
+
+class SequenceError(Exception):
+    pass
+
+
+class Cue:
+    def __init__(self, time, command, line, values=None, duration=0.0, easing='ease_in_out',
+                 action=None, preset=None):
+        self.time = time
+        self.command = command
+        self.line = line
+        self.values = values or {}
+        self.duration = duration
+        self.easing = easing
+        self.action = action
+        self.preset = preset
+
+    @property
+    def end(self):
+        return self.time + self.duration
+
+    def __repr__(self):
+        return f"Cue({self.time:.3f}, {self.command!r}, line {self.line})"
+
+
+def parse_time(text):
+    """'75', '1:15' or '0:01:15.250' to seconds."""
+    seconds = 0.0
+    for part in text.split(":"):
+        seconds = seconds * 60 + float(part)
+    if seconds < 0:
+        raise ValueError(text)
+    return seconds
+
+
+def format_time(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:06.3f}"
+
+
+def parse_assignments(words):
+    values = {}
+    for word in words:
+        name, sep, value = word.partition("=")
+        if not sep or name not in CONTROL_TYPES:
+            raise ValueError(f"bad assignment: {word}")
+        values[name] = CONTROL_TYPES[name](value)
+    return values
+
+
+def parse_cue(text, line):
+    words = text.split()
+    if len(words) < 2:
+        raise ValueError("expected: TIME COMMAND [ARGS]")
+    when, command, args = parse_time(words[0]), words[1], words[2:]
+
+    if command == "effect" and len(args) == 1:
+        return Cue(when, command, line, values={'effect': int(args[0])})
+    if command == "set" and args:
+        return Cue(when, command, line, values=parse_assignments(args))
+    if command == "ramp" and len(args) >= 2:
+        duration, args = float(args[0]), args[1:]
+        easing = 'ease_in_out'
+        if args and "=" not in args[0]:
+            easing, args = args[0], args[1:]
+        if easing not in EASINGS:
+            raise ValueError(f"unknown easing: {easing}")
+        values = parse_assignments(args)
+        if not values or any(name in DISCRETE_FIELDS for name in values):
+            raise ValueError("ramp needs continuous fields (use 'effect' to switch effects)")
+        return Cue(when, command, line, values=values, duration=duration, easing=easing)
+    if command == "music" and args in (["play"], ["pause"]):
+        return Cue(when, command, line, action=args[0])
+    if command == "preset" and 1 <= len(args) <= 2:
+        return Cue(when, command, line, preset=args[0], duration=float(args[1]) if len(args) > 1 else 0.0)
+    if command == "end" and not args:
+        return Cue(when, command, line)
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command: {command}")
+    raise ValueError(f"bad arguments for {command}")
+
+
+def load_show(path):
+    """Cues sorted by time (stable, so same-time cues keep file order)."""
+    cues = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            text = line.split("#", 1)[0].strip()
+            if not text:
+                continue
+            try:
+                cues.append(parse_cue(text, line_no))
+            except ValueError as e:
+                raise SequenceError(f"{path}:{line_no}: {e}")
+    cues.sort(key=lambda cue: cue.time)
+    return cues
+
+
+def show_length(cues):
+    ends = [cue.time for cue in cues if cue.command == "end"]
+    if ends:
+        return min(ends)
+    return max((cue.end for cue in cues), default=0.0)
+
+
+class DriftStats:
+    """Lateness of every cue against its scheduled time, in seconds."""
+
+    def __init__(self):
+        self.samples = []
+
+    def add(self, drift):
+        self.samples.append(drift)
+
+    def summary(self):
+        samples = sorted(self.samples)
+        if not samples:
+            return {"cues": 0}
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+        return {
+            "cues": len(samples),
+            "mean_ms": sum(samples) / len(samples) * 1000,
+            "p50_ms": pick(0.50) * 1000,
+            "p99_ms": pick(0.99) * 1000,
+            "max_ms": samples[-1] * 1000,
+            "min_ms": samples[0] * 1000,
+        }
+
+
+def check_presets(cues, presets):
+    """Every preset cue must name a preset in the bank (SequenceError otherwise)."""
+    from presets import PresetError
+    for cue in cues:
+        if cue.command == "preset":
+            if presets is None:
+                raise SequenceError(f"line {cue.line}: preset cue but no preset bank")
+            try:
+                presets.get(cue.preset)
+            except PresetError as e:
+                raise SequenceError(f"line {cue.line}: {e}")
+
+
+class Sequencer:
+    def __init__(self, engine, cues, ramps=None, presets=None, clock=time.perf_counter,
+                 spin_time=SPIN_TIME, on_cue=None):
+        self.engine = engine
+        self.cues = cues
+        self.times = [cue.time for cue in cues]
+        self.length = show_length(cues)
+        self.ramps = ramps or RampEngine(engine)
+        self.presets = presets
+        self.clock = clock
+        self.spin_time = spin_time
+        self.on_cue = on_cue  # on_cue(cue, drift) after each firing
+
+        self.drift = DriftStats()
+        self.initial = engine.snapshot()
+        self.wake = threading.Event()
+        self.lock = threading.Lock()
+        self.pending_seek = None
+        self.running = False
+        self.origin = None  # clock value at show position 0 of the current pass
+
+        check_presets(cues, presets)
+
+    def position(self):
+        if self.origin is None:
+            return 0.0
+        return self.clock() - self.origin
+
+    def seek(self, position):
+        """Jump to a show position; safe to call from another thread while running."""
+        with self.lock:
+            self.pending_seek = max(0.0, position)
+        self.wake.set()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+
+    # Firing
+
+    def fire(self, cues):
+        """Fire cues sharing one time stamp; instant changes go out as a single publication."""
+        from presets import crossfade
+        engine = self.engine
+        publish = False
+        music = None
+        for cue in cues:
+            if cue.command in ("effect", "set") or (cue.command == "preset" and cue.duration <= 0):
+                values = self.presets.get(cue.preset) if cue.command == "preset" else cue.values
+                for name in values:
+                    self.ramps.cancel(name)
+                engine.state.update(values)
+                publish = True
+            elif cue.command == "ramp":
+                self.ramps.ramp_many(cue.values, cue.duration, cue.easing)
+            elif cue.command == "music":
+                music = cue.action
+                publish = True
+            elif cue.command == "preset":
+                crossfade(engine, self.ramps, self.presets.get(cue.preset), cue.duration)
+        if publish:
+            engine.flush_now(music)
+
+    def chase(self, position):
+        """Rebuild the state at `position` from the cues before it; one publication."""
+        from presets import crossfade
+        engine = self.engine
+        self.ramps.cancel()
+        engine.state.update(self.initial)
+        music = None
+        for cue in self.cues[:bisect.bisect_left(self.times, position)]:
+            if cue.command == "music":
+                music = cue.action
+                continue
+            values = self.presets.get(cue.preset) if cue.command == "preset" else cue.values
+            if cue.end <= position or cue.command in ("effect", "set"):
+                for name in values:
+                    self.ramps.cancel(name)
+                engine.state.update(values)
+            elif cue.command == "ramp":
+                self.ramps.ramp_many(values, cue.duration, cue.easing, elapsed=position - cue.time)
+            elif cue.command == "preset":
+                crossfade(engine, self.ramps, values, cue.duration, elapsed=position - cue.time)
+        engine.flush_now(music)
+
+    def wait_until(self, target):
+        """Sleep until just before `target`, then spin. False if woken by seek/stop."""
+        while True:
+            remaining = target - self.clock()
+            if remaining <= 0:
+                return True
+            if remaining > self.spin_time:
+                if self.wake.wait(remaining - self.spin_time):
+                    return False
+            elif self.wake.is_set():
+                return False
+
+    def run(self, start=0.0, loop=False, loops=None):
+        """Play from `start` (seconds); with `loop`, repeat `loops` times or forever."""
+        if loop and self.length <= 0:
+            raise SequenceError("cannot loop a show without length (add an 'end' cue)")
+        self.running = True
+        passes = 0
+        self.seek(start)
+        index = 0
+        while self.running:
+            with self.lock:
+                seek, self.pending_seek = self.pending_seek, None
+                self.wake.clear()
+            if seek is not None:
+                self.chase(seek)
+                self.origin = self.clock() - seek
+                index = bisect.bisect_left(self.times, seek)
+
+            if index >= len(self.cues) or self.cues[index].time >= self.length > 0:
+                # End of the pass: wait for the show length, then loop or finish
+                if not self.wait_until(self.origin + self.length):
+                    continue
+                passes += 1
+                if not loop or (loops is not None and passes >= loops):
+                    break
+                self.origin += self.length
+                index = 0
+                continue
+
+            when = self.cues[index].time
+            target = self.origin + when
+            if not self.wait_until(target):
+                continue
+            drift = self.clock() - target
+            group = self.cues[index:bisect.bisect_right(self.times, when, index)]
+            self.fire(group)
+            for cue in group:
+                self.drift.add(drift)
+                if self.on_cue:
+                    self.on_cue(cue, drift)
+            index += len(group)
+
+        self.running = False
+        return self.drift.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a LUMIUS show file")
+    parser.add_argument("show", help="cue file")
+    parser.add_argument("--transport", action="append", default=[],
+                        help="file[:path] (default), shm[:path] or udp:host[:port]; repeatable")
+    parser.add_argument("--start", default="0", help="start position, seconds or m:ss (seek)")
+    parser.add_argument("--loop", action="store_true", help="repeat the show (length from the 'end' cue)")
+    parser.add_argument("--loops", type=int, help="stop after this many passes")
+    parser.add_argument("--presets", help="preset bank for 'preset' cues (default: presets.json)")
+    parser.add_argument("--check", action="store_true", help="validate and list the cues, don't play")
+    parser.add_argument("--quiet", action="store_true", help="don't print each cue as it fires")
+    args = parser.parse_args()
+
+    try:
+        cues = load_show(args.show)
+        start = parse_time(args.start)
+    except (OSError, SequenceError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    from control_engine import ControlEngine, make_transport
+    from presets import DEFAULT_PRESET_FILE, PresetBank, PresetError
+    presets = PresetBank(args.presets or DEFAULT_PRESET_FILE)
+
+    if args.check:
+        try:
+            # Same lookup as playback: a typo fails here, not halfway through the show
+            check_presets(cues, presets)
+        except SequenceError as e:
+            print(e, file=sys.stderr)
+            return 1
+        for cue in cues:
+            print(f"{format_time(cue.time)}  line {cue.line:<4} {cue.command}")
+        print(f"{len(cues)} cues, length {format_time(show_length(cues))}")
+        return 0
+
+    engine = ControlEngine([make_transport(spec) for spec in args.transport or ["file"]])
+    for transport in engine.transports:
+        current = transport.current_values()
+        if current:
+            engine.state.update(current)
+    engine.state.mark_synced()
+
+    def report(cue, drift):
+        if not args.quiet:
+            print(f"{format_time(cue.time)}  {cue.command:<7} line {cue.line:<4} {drift * 1000:+.3f} ms")
+
+    try:
+        sequencer = Sequencer(engine, cues, presets=presets, on_cue=report)
+    except (SequenceError, PresetError) as e:
+        print(e, file=sys.stderr)
+        engine.close()
+        return 1
+
+    print(f"◢ LUMIUS SHOW ◣ {args.show}: {len(cues)} cues, length {format_time(sequencer.length)}")
+    try:
+        summary = sequencer.run(start, loop=args.loop, loops=args.loops)
+    except KeyboardInterrupt:
+        sequencer.stop()
+        summary = sequencer.drift.summary()
+    finally:
+        sequencer.ramps.cancel()
+        engine.close()
+
+    if summary["cues"]:
+        print(f"Drift over {summary['cues']} cues: mean {summary['mean_ms']:.3f} ms, "
+              f"p50 {summary['p50_ms']:.3f} ms, p99 {summary['p99_ms']:.3f} ms, "
+              f"max {summary['max_ms']:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Persistent SSH control channel for the LUMIUS remote panel.
+
+Instead of running one `exec_command` per knob movement, a single session
+is kept open for the whole connection: `control_sink.py` (with the
+`control_protocol.py` module it imports) is uploaded to the Pi, started
+once, and every control update is streamed down its stdin as a frame of
+key:value lines terminated by an empty line.
+
+The sink's replies (clock pongs, telemetry) are read continuously by a
+background thread: an SSH stdout nobody reads fills its window and would
+stall the sink.
+"""
+import os
+import queue
+import shlex
+import socket
+import threading
+import time
+
+import paramiko
+
+from telemetry import parse_telemetry
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SINK_MODULES = ("control_sink.py", "control_protocol.py", "telemetry.py", "metrics.py")
+REMOTE_DIR = "/tmp/lumius_control"
+REMOTE_SINK = f"{REMOTE_DIR}/control_sink.py"
+
+
+class ChannelError(Exception):
+    pass
+
+
+class PersistentControlChannel:
+    def __init__(self, host, user, password, control_file,
+                 timeout=10, keepalive=5, reconnect_attempts=3, reconnect_backoff=0.5, on_telemetry=None):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.control_file = control_file
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_backoff = reconnect_backoff
+
+        self.client = None
+        self.channel = None
+        self.last_frame = None
+        self.reconnects = 0
+        self.ping_seq = 0
+        self.pongs = queue.Queue()
+        self.on_telemetry = on_telemetry  # on_telemetry(values), on the reader thread
+
+    def open(self):
+        self.client = paramiko.SSHClient()
+        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.client.connect(self.host, username=self.user, password=self.password,
+                            timeout=self.timeout)
+
+        transport = self.client.get_transport()
+        # Keepalives make a dropped Wi-Fi link surface as a send error
+        transport.set_keepalive(self.keepalive)
+
+        sftp = self.client.open_sftp()
+        try:
+            try:
+                sftp.mkdir(REMOTE_DIR)
+            except IOError:
+                pass  # already exists
+            for module in SINK_MODULES:
+                sftp.put(os.path.join(APP_DIR, module), f"{REMOTE_DIR}/{module}")
+        finally:
+            sftp.close()
+
+        self.channel = transport.open_session()
+        self.channel.settimeout(self.timeout)
+        telemetry = " --telemetry" if self.on_telemetry else ""
+        self.channel.exec_command(f"python3 -u {REMOTE_SINK} {shlex.quote(self.control_file)}{telemetry}")
+
+        # Wait for the sink to report it is reading stdin
+        stdout = self.channel.makefile('r')
+        if stdout.readline().strip() != "ready":
+            raise ChannelError("control sink failed to start")
+        threading.Thread(target=self._read_replies, args=(self.channel, stdout),
+                         name=f"lumius-ssh-replies-{self.host}", daemon=True).start()
+
+    def _read_replies(self, channel, stdout):
+        # One reader per session; it ends with its channel (a reconnect starts a new one)
+        while not channel.closed:
+            try:
+                line = stdout.readline()
+            except socket.timeout:
+                continue
+            except (paramiko.SSHException, socket.error, EOFError):
+                return
+            if not line:
+                return
+            key, _, value = line.strip().partition(":")
+            if key == "pong":
+                self.pongs.put(value)
+            elif key == "telemetry" and self.on_telemetry:
+                self.on_telemetry(parse_telemetry(value))
+
+    def is_open(self):
+        return self.channel is not None and not self.channel.closed and \
+            self.channel.get_transport() is not None and self.channel.get_transport().is_active()
+
+    def send(self, content):
+        frame = content.strip("\n") + "\n\n"
+        self.last_frame = frame
+        try:
+            if not self.is_open():
+                raise ChannelError("channel closed")
+            self.channel.sendall(frame.encode())
+        except (ChannelError, paramiko.SSHException, socket.error, EOFError):
+            self.reconnect()
+            self.channel.sendall(self.last_frame.encode())
+
+    def ping(self):
+        """The Pi's clock (Unix time) as reported by the sink, for clock_sync."""
+        self.ping_seq += 1
+        expected = f"{self.ping_seq}:"
+        try:
+            self.channel.sendall(f"ping:{self.ping_seq}\n\n".encode())
+            while True:
+                value = self.pongs.get(timeout=self.timeout)
+                if value.startswith(expected):
+                    return float(value[len(expected):])
+        except queue.Empty:
+            raise ChannelError("ping failed: no reply from control sink")
+        except (AttributeError, paramiko.SSHException, socket.error, EOFError, ValueError) as e:
+            raise ChannelError(f"ping failed: {e}")
+
+    def reconnect(self):
+        self._close_quietly()
+        delay = self.reconnect_backoff
+        last_error = None
+        for _ in range(self.reconnect_attempts):
+            try:
+                self.open()
+                self.reconnects += 1
+                return
+            except (paramiko.SSHException, socket.error, EOFError, ChannelError) as e:
+                last_error = e
+                self._close_quietly()
+                time.sleep(delay)
+                delay *= 2
+        raise ChannelError(f"reconnect failed: {last_error}")
+
+    def exec(self, command):
+        # One-off commands (pkill on shutdown) still go through exec_command
+        if self.client is None:
+            raise ChannelError("not connected")
+        return self.client.exec_command(command)
+
+    def close(self):
+        if self.channel is not None:
+            try:
+                self.channel.shutdown_write()
+            except Exception:
+                pass
+        self._close_quietly()
+
+    def _close_quietly(self):
+        for resource in (self.channel, self.client):
+            if resource is not None:
+                try:
+                    resource.close()
+                except Exception:
+                    pass
+        self.channel = None
+        self.client = None
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Cross-node apply skew, measured on one machine.
+
+    python3 sync_harness.py [--offsets 0,0.35,-0.2] [--delays 0.002,0.015,0.04] [--updates 30]
+
+Starts one process per emulated Pi: an OSC listener (osc_server.py) with a
+skewed clock behind an emulated network delay, plus a 60 Hz frame loop
+that applies control.txt the way ofApp does (honouring apply_at) and
+reports when each update reached the screen. The parent drives them
+through a NodePool, first applying on arrival, then scheduled on the
+probed shared clock, and prints the skew between nodes for each update.
+"""
+import argparse
+import collections
+import heapq
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MAX_SCHEDULE_AHEAD = 2.0  # same guard as ofApp::queueControl
+
+
+# Emulated node (child process)
+
+class DelayLine:
+    """Runs callbacks after a fixed delay, in order, on one thread."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.queue = []
+        self.count = 0
+        self.cond = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, func, *args):
+        with self.cond:
+            self.count += 1
+            heapq.heappush(self.queue, (time.monotonic() + self.delay, self.count, func, args))
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.queue or self.queue[0][0] > time.monotonic():
+                    self.cond.wait(self.queue[0][0] - time.monotonic() if self.queue else None)
+                _, _, func, args = heapq.heappop(self.queue)
+            func(*args)
+
+
+def read_update(path):
+    """(content, values, apply_at) of the control file, or None while it is missing."""
+    try:
+        with open(path) as f:
+            content = f.read()
+    except OSError:
+        return None
+    values = {}
+    apply_at = 0.0
+    for line in content.splitlines():
+        key, _, value = line.partition(":")
+        if key == "apply_at":
+            apply_at = float(value)
+        else:
+            values[key] = value
+    return content, values, apply_at
+
+
+def frame_loop(path, clock, fps, report):
+    """ofApp's update(): due scheduled updates first, then whatever is new in control.txt."""
+    interval = 1.0 / fps
+    next_frame = time.monotonic() + random.random() * interval
+    pending = collections.deque()
+    last = None
+
+    def apply(values):
+        if 'volume' in values:
+            report(int(values['volume']))
+
+    while True:
+        time.sleep(max(0.0, next_frame - time.monotonic()))
+        next_frame += interval
+        now = clock()
+        while pending and pending[0][0] <= now:
+            apply(pending.popleft()[1])
+        update = read_update(path)
+        if update is None or update[0] == last:
+            continue
+        last, values, apply_at = update
+        if apply_at <= 0.0 or apply_at <= now or apply_at > now + MAX_SCHEDULE_AHEAD:
+            while pending:
+                apply(pending.popleft()[1])
+            apply(values)
+        else:
+            pending.append((apply_at, values))
+
+
+def run_node(args):
+    from osc_server import LumiusOscServer
+
+    def clock():
+        return time.time() + args.offset
+
+    workdir = tempfile.mkdtemp(prefix="lumius-node-")
+    path = os.path.join(workdir, "control.txt")
+    server = LumiusOscServer("127.0.0.1", 0, path, clock=clock)
+    link = DelayLine(args.delay)
+    print(json.dumps({'port': server.address[1]}), flush=True)
+
+    def report(marker):
+        print(json.dumps({'marker': marker, 'time': time.time()}), flush=True)
+
+    def deliver(data, sender):
+        reply = server.handle_datagram(data)
+        if reply:
+            link.submit(server.sock.sendto, reply, sender)
+
+    def receive():
+        while True:
+            try:
+                data, sender = server.sock.recvfrom(2048)
+            except OSError:
+                continue
+            link.submit(deliver, data, sender)
+
+    threading.Thread(target=receive, daemon=True).start()
+    threading.Thread(target=frame_loop, args=(path, clock, args.fps, report), daemon=True).start()
+    # Until the parent closes our stdin
+    sys.stdin.read()
+
+
+# Driver (parent process)
+
+def spawn(offset, delay, fps):
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--node",
+                             "--offset", str(offset), "--delay", str(delay), "--fps", str(fps)],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    port = json.loads(proc.stdout.readline())['port']
+    events = {}
+
+    def collect():
+        for line in proc.stdout:
+            event = json.loads(line)
+            events.setdefault(event['marker'], event['time'])
+
+    threading.Thread(target=collect, daemon=True).start()
+    return proc, port, events
+
+
+def wait_for(condition, pool, timeout):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        pool.poll()
+        time.sleep(0.02)
+    return True
+
+
+def run_updates(engine, markers, interval):
+    sent = {}
+    for marker in markers:
+        sent[marker] = time.time()
+        engine.set('volume', marker)
+        engine.flush_now()
+        time.sleep(interval)
+    return sent
+
+
+def summarize(name, markers, sent, nodes, frame_ms):
+    skews = []
+    delays = []
+    missing = 0
+    for marker in markers:
+        times = [events.get(marker) for _, _, events in nodes]
+        if None in times:
+            missing += 1
+            continue
+        skews.append((max(times) - min(times)) * 1000)
+        delays.append((max(times) - sent[marker]) * 1000)
+    if not skews:
+        print(f"{name:<10} no update reached every node")
+        return
+    skews.sort()
+    within = sum(1 for skew in skews if skew <= frame_ms)
+    print(f"{name:<10} skew mean {sum(skews) / len(skews):6.1f} ms  p95 {skews[int(0.95 * (len(skews) - 1))]:6.1f} ms  "
+          f"max {skews[-1]:6.1f} ms  within 1 frame {within}/{len(skews)}  "
+          f"send->last apply {sum(delays) / len(delays):6.1f} ms  missing {missing}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cross-node apply skew with emulated Pis")
+    parser.add_argument("--offsets", default="0,0.35,-0.2", help="clock offset of each node, seconds")
+    parser.add_argument("--delays", default="0.002,0.015,0.040", help="one-way network delay of each node, seconds")
+    parser.add_argument("--updates", type=int, default=30, help="updates per mode (at most 50)")
+    parser.add_argument("--interval", type=float, default=0.15, help="seconds between updates")
+    parser.add_argument("--ahead", type=float, default=0.1, help="scheduled mode lead time, seconds")
+    parser.add_argument("--fps", type=float, default=60.0)
+    parser.add_argument("--node", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--offset", type=float, default=0.0, help=argparse.SUPPRESS)
+    parser.add_argument("--delay", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.node:
+        run_node(args)
+        return
+
+    from clock_sync import PROBES_PER_SYNC
+    from control_engine import ControlEngine
+    from node_pool import NodePool
+    from transports import UdpTransport
+
+    offsets = [float(value) for value in args.offsets.split(",")]
+    delays = [float(value) for value in args.delays.split(",")]
+    if len(offsets) != len(delays):
+        parser.error("--offsets and --delays need one value per node")
+    updates = min(args.updates, 50)  # markers are volume values, 1..100
+
+    nodes = [spawn(offset, delay, args.fps) for offset, delay in zip(offsets, delays)]
+    pool = NodePool()
+    for i, (_, port, _) in enumerate(nodes):
+        pool.add(f"node{i}", UdpTransport, "127.0.0.1", port)
+    engine = ControlEngine([pool])
+    try:
+        if not wait_for(lambda: len(pool.ready_nodes()) == len(nodes), pool, 5.0):
+            sys.exit("nodes did not come up")
+        frame_ms = 1000.0 / args.fps
+
+        immediate = list(range(1, updates + 1))
+        sent = run_updates(engine, immediate, args.interval)
+        time.sleep(0.5)
+        summarize("immediate", immediate, sent, nodes, frame_ms)
+
+        pool.sync_clocks()
+        probed = lambda: all(len(node.clock_estimator.samples) >= PROBES_PER_SYNC for node in pool.ready_nodes())
+        if not wait_for(probed, pool, 5.0):
+            sys.exit("clock probes got no answer")
+        pool.schedule_ahead = args.ahead
+        scheduled = list(range(51, 51 + updates))
+        sent = run_updates(engine, scheduled, args.interval)
+        time.sleep(0.5 + args.ahead)
+        summarize("scheduled", scheduled, sent, nodes, frame_ms)
+
+        for status, offset in zip(pool.status(), offsets):
+            print(f"{status['name']}: clock offset estimated {status['clock_offset_ms']:+8.2f} ms "
+                  f"(actual {offset * 1000:+8.2f}, error bound {status['clock_error_ms']:.2f} ms)")
+    finally:
+        pool.close(timeout=1.0)
+        engine.close()
+        for proc, _, _ in nodes:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
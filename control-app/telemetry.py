@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Live telemetry from the visualizer nodes back to the remote panel.
+
+On the Pi, a sample merges the visualizer's status file (fps, frame time
+percentiles, shader, camera, audio bands; rewritten twice a second by
+ofApp) with the board's temperature, CPU and memory use and throttling
+flags from metrics.py. A
+`TelemetryPublisher` takes one sample every TELEMETRY_INTERVAL and hands it
+to the link back to the panel:
+
+    OSC   osc_server.py sends a bundle of /lumius/telemetry/<field> messages
+          to every panel that subscribed with /lumius/telemetry i (its port)
+    SSH   control_sink.py prints `telemetry:<field>=<value>,...` lines
+
+On the panel, the latest sample of each node lands in a `TelemetryStore`
+from a background thread; the UI reads it on its own timer and never waits
+for the network.
+"""
+import os
+import socket
+import threading
+import time
+
+TELEMETRY_INTERVAL = 0.5
+TELEMETRY_LEASE = 10.0      # OSC subscriptions expire unless renewed
+STALE_AFTER = 3.0           # the panel ignores samples older than this
+DEFAULT_TELEMETRY_PORT = 9001
+STATUS_FILE = "visualizer_status.txt"
+
+# Field types on the wire (OSC argument types, parsing of the SSH lines)
+TELEMETRY_FIELDS = {
+    'fps': float,
+    'frame_ms_p50': float,
+    'frame_ms_p95': float,
+    'frame_ms_p99': float,
+    'frame_ms_max': float,
+    'effect': int,
+    'shader': int,
+    'camera': int,
+    'music': str,
+    'bass': float,
+    'mid': float,
+    'high': float,
+    'visualizer_age': float,  # seconds since the visualizer last wrote its status
+    'cpu_temp': float,
+    'cpu_percent': float,
+    'mem_percent': float,
+    'throttled': int,
+    'quality': int,           # governor level applied by the visualizer (0 = full)
+}
+
+
+def status_path_for(control_file):
+    """The visualizer writes its status file next to control.txt (bin/data)."""
+    return os.path.join(os.path.dirname(os.path.abspath(control_file)), STATUS_FILE)
+
+
+def read_key_values(path):
+    try:
+        with open(path) as f:
+            content = f.read()
+    except OSError:
+        return {}
+    values = {}
+    for line in content.splitlines():
+        key, _, value = line.partition(":")
+        values[key] = value
+    return values
+
+
+def sample(status_path, collector=None, clock=time.time):
+    """
+    One telemetry sample: whatever is available right now (missing fields
+    are left out). Board metrics come from a running MetricsCollector.
+    """
+    status = read_key_values(status_path)
+    values = {}
+    for name, kind in TELEMETRY_FIELDS.items():
+        if name in status:
+            try:
+                values[name] = kind(status[name])
+            except ValueError:
+                pass
+    if 'time' in status:
+        try:
+            values['visualizer_age'] = round(max(0.0, clock() - float(status['time'])), 3)
+        except ValueError:
+            pass
+
+    if collector:
+        for name, value in collector.latest().items():
+            if name in TELEMETRY_FIELDS:
+                values[name] = round(value, 2) if isinstance(value, float) else value
+    return values
+
+
+def format_telemetry(values):
+    return ",".join(f"{name}={value}" for name, value in values.items())
+
+
+def parse_telemetry(text):
+    values = {}
+    for item in text.split(","):
+        name, _, value = item.partition("=")
+        if name in TELEMETRY_FIELDS:
+            try:
+                values[name] = TELEMETRY_FIELDS[name](value)
+            except ValueError:
+                pass
+    return values
+
+
+def telemetry_messages(values):
+    return [(f"/lumius/telemetry/{name}", (value,)) for name, value in values.items()]
+
+
+class TelemetryPublisher:
+    """Samples at a fixed low rate on its own thread and calls `publish(values)`."""
+
+    def __init__(self, status_path, publish, interval=TELEMETRY_INTERVAL, collector=None):
+        self.status_path = status_path
+        self.publish = publish
+        self.interval = interval
+        self.collector = collector  # None: start our own
+        self.own_collector = collector is None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="lumius-telemetry", daemon=True)
+
+    def start(self):
+        if self.own_collector:
+            from metrics import MetricsCollector
+            self.collector = MetricsCollector().start()
+        self.thread.start()
+        return self
+
+    def _run(self):
+        next_sample = time.monotonic()
+        while not self.stopped.is_set():
+            try:
+                self.publish(sample(self.status_path, self.collector))
+            except OSError:
+                pass  # panel unreachable for now; the next sample tries again
+            # Fixed rate, not fixed gap: a slow publish does not drift the schedule
+            next_sample += self.interval
+            self.stopped.wait(max(0.0, next_sample - time.monotonic()))
+
+    def stop(self):
+        self.stopped.set()
+        if self.own_collector and self.collector:
+            self.collector.stop()
+
+
+class TelemetryStore:
+    """Latest sample per node, written by network threads, read by the UI."""
+
+    def __init__(self, stale_after=STALE_AFTER, clock=time.monotonic):
+        self.stale_after = stale_after
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def update(self, node, values):
+        with self.lock:
+            self.samples[node] = (self.clock(), values)
+
+    def latest(self, node):
+        """The node's last sample, or None if it has not reported recently."""
+        with self.lock:
+            received, values = self.samples.get(node, (None, None))
+        if received is None or self.clock() - received > self.stale_after:
+            return None
+        return values
+
+    def clear(self):
+        with self.lock:
+            self.samples = {}
+
+
+class TelemetryListener:
+    """Receives OSC telemetry bundles for the panel on its own thread."""
+
+    def __init__(self, store, port=DEFAULT_TELEMETRY_PORT):
+        self.store = store
+        self.names = {}  # sender IP -> node name
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.sock.bind(("0.0.0.0", port))
+        except OSError:
+            # Port taken (a second panel on this machine): any free port works, it is announced
+            self.sock.bind(("0.0.0.0", 0))
+        self.port = self.sock.getsockname()[1]
+        self.sock.settimeout(0.5)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="lumius-telemetry-listener", daemon=True)
+        self.thread.start()
+
+    def watch(self, host, name):
+        """Map a node's datagrams to its name; resolves `host` (call off the UI thread)."""
+        self.names[socket.gethostbyname(host)] = name
+
+    def _run(self):
+        from osc import OscError, decode_packet
+        prefix = "/lumius/telemetry/"
+        while self.running:
+            try:
+                data, sender = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                _, messages = decode_packet(data)
+            except OscError:
+                continue
+            values = {address[len(prefix):]: args[0] for address, args in messages
+                      if address.startswith(prefix) and len(args) == 1}
+            if values:
+                self.store.update(self.names.get(sender[0], sender[0]), values)
+
+    def close(self):
+        self.running = False
+        self.sock.close()
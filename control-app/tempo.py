@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Tempo engine: tap tempo, beat detection and BPM-locked LFOs.
+
+`Tempo` keeps a beat grid (BPM plus the time of one downbeat). Tapping
+fits the grid to the taps; `detect_beats` estimates it from the music file
+(onset envelope, comb-filtered autocorrelation for the BPM, then the best
+phase). Changing the BPM keeps the current beat position, so modulation
+never jumps.
+
+LFOs map the beat position to a control value:
+
+    speed:sine:1:0.5:3.0        field:shape:beats per cycle:low:high[:phase]
+
+Their values are computed from the clock at each tick rather than
+accumulated, so they stay phase-accurate over a whole set however late a
+tick runs. Ticks run at `tick_rate` and only the modulated fields are
+published, through the engine's coalescing writer (control.txt and shared
+memory keep every other field as the panel last set it), so this can run
+next to the panel like pico_bridge.py:
+
+    python3 tempo.py --bpm 128 --lfo intensity:sine:1:0.5:2.5
+    python3 tempo.py --detect ../openframeworks-visualizer/bin/data/music.wav --play \\
+                     --lfo speed:saw:4:1:3 --lfo rgb_b:square:2:0:255
+
+While running, Enter taps the tempo; `bpm 128`, `sync` (downbeat now) and
+`quit` are also read from stdin.
+"""
+import argparse
+import array
+import math
+import operator
+import sys
+import threading
+import time
+import wave
+
+from control_protocol import CONTROL_TYPES
+from control_writer import DEFAULT_MAX_RATE, thread_scheduler
+from ramps import DISCRETE_FIELDS
+
+DEFAULT_BPM = 120.0
+TAP_TIMEOUT = 2.0   # a longer pause starts a new tap sequence
+MAX_TAPS = 8
+
+WAVES = {
+    'sine': lambda p: 0.5 + 0.5 * math.cos(2 * math.pi * p),  # peak on the beat
+    'square': lambda p: 1.0 if p % 1.0 < 0.5 else 0.0,
+    'saw': lambda p: p % 1.0,
+    'triangle': lambda p: 1.0 - abs(2.0 * (p % 1.0) - 1.0),
+}
+
+# Beat detection
+ENVELOPE_HOP = 128      # samples per onset-envelope step (~345 Hz at 44.1 kHz)
+ENERGY_STRIDE = 4       # only every 4th sample enters the energy sum
+COMB_BEATS = 4          # autocorrelation summed over 1..4 beat lags
+
+
+class TempoError(Exception):
+    pass
+
+
+class Tempo:
+    """Beat grid: `bpm` and `origin`, the clock time of a downbeat."""
+
+    def __init__(self, bpm=DEFAULT_BPM, clock=time.monotonic):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.bpm = bpm
+        self.origin = clock()
+
+    def beats_at(self, when=None):
+        """Beat position (beats since the origin, fractional) at clock time `when`."""
+        with self.lock:
+            when = self.clock() if when is None else when
+            return (when - self.origin) * self.bpm / 60.0
+
+    def set_bpm(self, bpm, keep_phase=True):
+        if not 20.0 <= bpm <= 300.0:
+            raise TempoError(f"BPM out of range: {bpm}")
+        with self.lock:
+            if keep_phase:
+                # Same beat position now, new slope from here on
+                now = self.clock()
+                beats = (now - self.origin) * self.bpm / 60.0
+                self.origin = now - beats * 60.0 / bpm
+            self.bpm = bpm
+
+    def align(self, downbeat):
+        """Put a beat at clock time `downbeat`, keeping the BPM."""
+        with self.lock:
+            self.origin = downbeat
+
+    def set_grid(self, bpm, downbeat):
+        with self.lock:
+            self.bpm = bpm
+            self.origin = downbeat
+
+
+class TapTempo:
+    """Fits a beat grid to the last taps (least squares over tap times)."""
+
+    def __init__(self, tempo, max_taps=MAX_TAPS, timeout=TAP_TIMEOUT):
+        self.tempo = tempo
+        self.max_taps = max_taps
+        self.timeout = timeout
+        self.taps = []
+
+    def tap(self, when=None):
+        """Register a tap; returns the new BPM once there are two taps, else None."""
+        when = self.tempo.clock() if when is None else when
+        if self.taps and when - self.taps[-1] > self.timeout:
+            self.taps = []
+        self.taps = (self.taps + [when])[-self.max_taps:]
+        count = len(self.taps)
+        if count < 2:
+            return None
+
+        # Regression of tap time on tap index: slope = beat period, and the
+        # fitted last tap becomes the downbeat (one sloppy tap moves it less)
+        mean_i = (count - 1) / 2.0
+        mean_t = sum(self.taps) / count
+        covariance = sum((i - mean_i) * (t - mean_t) for i, t in enumerate(self.taps))
+        variance = sum((i - mean_i) ** 2 for i in range(count))
+        period = covariance / variance
+        if period <= 0:
+            return None
+        bpm = 60.0 / period
+        if not 20.0 <= bpm <= 300.0:
+            return None
+        self.tempo.set_grid(bpm, mean_t + (count - 1 - mean_i) * period)
+        return bpm
+
+
+class Lfo:
+    def __init__(self, field, shape='sine', beats=1.0, low=0.0, high=1.0, phase=0.0):
+        if field not in CONTROL_TYPES or field in DISCRETE_FIELDS:
+            raise TempoError(f"cannot modulate {field}")
+        if shape not in WAVES:
+            raise TempoError(f"unknown shape: {shape} (choose from {', '.join(WAVES)})")
+        if beats <= 0:
+            raise TempoError("beats per cycle must be positive")
+        self.field = field
+        self.shape = shape
+        self.wave = WAVES[shape]
+        self.beats = beats
+        self.low = low
+        self.high = high
+        self.phase = phase
+
+    @classmethod
+    def parse(cls, spec):
+        """'field:shape:beats:low:high[:phase]'"""
+        parts = spec.split(":")
+        if len(parts) not in (5, 6):
+            raise TempoError(f"bad LFO spec: {spec} (field:shape:beats:low:high[:phase])")
+        try:
+            numbers = [float(part) for part in parts[2:]]
+        except ValueError:
+            raise TempoError(f"bad LFO spec: {spec}")
+        return cls(parts[0], parts[1], *numbers)
+
+    def value(self, beats):
+        return self.low + (self.high - self.low) * self.wave(beats / self.beats + self.phase)
+
+
+class Modulator:
+    """Writes the LFO values into the engine state at `tick_rate`."""
+
+    def __init__(self, engine, tempo, tick_rate=DEFAULT_MAX_RATE, schedule=None):
+        self.engine = engine
+        self.tempo = tempo
+        self.tick_interval = 1.0 / tick_rate
+        self.schedule = schedule or thread_scheduler
+
+        self.lock = threading.Lock()
+        self.lfos = {}
+        self.running = False
+        self.ticks = 0
+
+    def add(self, lfo):
+        with self.lock:
+            self.lfos[lfo.field] = lfo
+
+    def remove(self, field):
+        with self.lock:
+            self.lfos.pop(field, None)
+
+    def modulated(self):
+        with self.lock:
+            return set(self.lfos)
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self._tick()
+
+    def stop(self):
+        self.running = False
+
+    def _tick(self):
+        if not self.running:
+            return
+        beats = self.tempo.beats_at()
+        with self.lock:
+            values = {field: lfo.value(beats) for field, lfo in self.lfos.items()}
+        for name, value in values.items():
+            if CONTROL_TYPES[name] is int:
+                value = round(value)
+            self.engine.state.set(name, value)
+        if values:
+            self.ticks += 1
+            self.engine.request()
+        self.schedule(self.tick_interval, self._tick)
+
+
+def read_mono(path, seconds=None):
+    """First channel of a 16-bit PCM WAV as an int array, and its sample rate."""
+    try:
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise TempoError(f"{path}: only 16-bit PCM is supported")
+            rate = wav.getframerate()
+            channels = wav.getnchannels()
+            frames = wav.getnframes() if seconds is None else min(wav.getnframes(), int(seconds * rate))
+            samples = array.array("h")
+            samples.frombytes(wav.readframes(frames))
+    except (wave.Error, EOFError) as e:
+        raise TempoError(f"{path}: {e}")
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples[::channels] if channels > 1 else samples, rate
+
+
+def onset_envelope(samples, hop=ENVELOPE_HOP):
+    """Positive log-energy differences, mean removed."""
+    energies = []
+    for start in range(0, len(samples) - hop + 1, hop):
+        chunk = samples[start:start + hop:ENERGY_STRIDE]
+        energies.append(math.log1p(sum(map(operator.mul, chunk, chunk))))
+    onsets = [max(0.0, b - a) for a, b in zip(energies, energies[1:])]
+    mean = sum(onsets) / len(onsets) if onsets else 0.0
+    return [onset - mean for onset in onsets]
+
+
+def detect_beats(path, min_bpm=80.0, max_bpm=160.0, seconds=60.0):
+    """(bpm, first beat offset in seconds, confidence) from the start of a WAV file."""
+    samples, rate = read_mono(path, seconds)
+    envelope = onset_envelope(samples)
+    steps_per_second = rate / ENVELOPE_HOP
+    if len(envelope) < steps_per_second * 4:
+        raise TempoError(f"{path}: too short for beat detection")
+
+    acf_cache = {}
+
+    def acf(lag):
+        if lag not in acf_cache:
+            acf_cache[lag] = sum(map(operator.mul, envelope, envelope[lag:])) / (len(envelope) - lag)
+        return acf_cache[lag]
+
+    def comb(bpm):
+        # Interpolated autocorrelation at 1..COMB_BEATS beat periods
+        period = 60.0 / bpm * steps_per_second
+        score = 0.0
+        for beat in range(1, COMB_BEATS + 1):
+            lag = period * beat
+            base = int(lag)
+            frac = lag - base
+            score += acf(base) * (1 - frac) + acf(base + 1) * frac
+        return score
+
+    # Coarse 1 BPM grid, then 0.05 BPM around the best candidate
+    candidates = [min_bpm + i for i in range(int(max_bpm - min_bpm) + 1)]
+    scores = {bpm: comb(bpm) for bpm in candidates}
+    coarse = max(scores, key=scores.get)
+    fine = [coarse - 1 + i * 0.05 for i in range(41)]
+    bpm = max(fine, key=comb)
+    positive = [score for score in scores.values() if score > 0]
+    confidence = scores[coarse] / (sum(positive) / len(positive)) if positive else 0.0
+
+    # Phase: the offset whose beat train collects the most onset energy
+    period = 60.0 / bpm * steps_per_second
+    best_offset, best_score = 0, -math.inf
+    for offset in range(int(period)):
+        score = 0.0
+        position = float(offset)
+        while position < len(envelope):
+            score += envelope[int(position)]
+            position += period
+        if score > best_score:
+            best_offset, best_score = offset, score
+    # The envelope is a difference: step i is the change into hop i + 1
+    return bpm, (best_offset + 1) * ENVELOPE_HOP / rate, confidence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tap tempo and BPM-locked LFOs for LUMIUS")
+    parser.add_argument("--transport", action="append", default=[],
+                        help="file[:path] (default), shm[:path] or udp:host[:port]; repeatable")
+    parser.add_argument("--bpm", type=float, default=DEFAULT_BPM)
+    parser.add_argument("--detect", metavar="WAV", help="estimate BPM and beat phase from a music file")
+    parser.add_argument("--range", default="80:160", metavar="MIN:MAX", help="BPM search range for --detect")
+    parser.add_argument("--play", action="store_true",
+                        help="send music play and lock the beat grid to the playback start")
+    parser.add_argument("--lfo", action="append", default=[], metavar="SPEC",
+                        help="field:shape:beats:low:high[:phase], shapes: " + ", ".join(WAVES))
+    parser.add_argument("--rate", type=float, default=DEFAULT_MAX_RATE, help="LFO ticks per second")
+    args = parser.parse_args()
+
+    try:
+        lfos = [Lfo.parse(spec) for spec in args.lfo]
+        tempo = Tempo(args.bpm)
+        offset = 0.0
+        if args.detect:
+            low, _, high = args.range.partition(":")
+            started = time.perf_counter()
+            bpm, offset, confidence = detect_beats(args.detect, float(low), float(high))
+            print(f"Detected {bpm:.2f} BPM, first beat at {offset * 1000:.0f} ms "
+                  f"(confidence {confidence:.1f}, {time.perf_counter() - started:.1f} s)")
+            tempo.set_bpm(bpm, keep_phase=False)
+    except (OSError, TempoError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    from control_engine import ControlEngine, make_transport
+    # Only the modulated fields are ever sent: the rest belong to the panel, and the
+    # snapshot transports re-read them before every publication
+    owned = tuple(lfo.field for lfo in lfos)
+    engine = ControlEngine([make_transport(spec, owned) for spec in args.transport or ["file"]],
+                           full_interval=float("inf"))
+    for transport in engine.transports:
+        current = transport.current_values()
+        if current:
+            engine.state.update(current)
+    engine.state.mark_synced()
+
+    if args.play:
+        engine.music("play")
+        tempo.align(tempo.clock() + offset)
+
+    modulator = Modulator(engine, tempo, tick_rate=args.rate)
+    for lfo in lfos:
+        modulator.add(lfo)
+    modulator.start()
+
+    taps = TapTempo(tempo)
+    print(f"◢ LUMIUS TEMPO ◣ {tempo.bpm:.2f} BPM - Enter to tap, 'bpm N', 'sync', 'quit'")
+    try:
+        for line in sys.stdin:
+            command = line.split()
+            if not command:
+                bpm = taps.tap()
+                if bpm:
+                    print(f"{bpm:.2f} BPM")
+            elif command[0] == "bpm" and len(command) == 2:
+                try:
+                    tempo.set_bpm(float(command[1]))
+                except (TempoError, ValueError) as e:
+                    print(e)
+            elif command[0] == "sync":
+                tempo.align(tempo.clock())
+            elif command[0] == "quit":
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        modulator.stop()
+        engine.flush_now()
+        engine.close()
+        stats = engine.stats()
+        print(f"LFO ticks: {modulator.ticks}, writes: {stats['writes']} ({stats['suppressed']} suppressed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
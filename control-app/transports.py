@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Control transports: where a ControlEngine publishes its updates.
+
+Every transport receives the same update - whether it is a full snapshot,
+the changed fields, the complete current values and an optional one-shot
+music action - and uses whichever part suits its medium. `send_at` adds a
+target time on the consumer's clock; the visualizer holds such an update
+until its first frame at or after that time. Snapshot readers
+(control.txt, shared memory) write the complete values; network
+transports (SSH stream, OSC/UDP) only send the changed fields.
+
+A snapshot transport built with `owned_fields` shares the consumer with
+another writer (the panel): before each publication it re-reads what the
+consumer holds and only replaces its own fields, so the Pico bridge or
+the tempo LFOs never revert the panel's effect, speed etc.
+
+None of these import Tk; SSH support needs paramiko and is imported lazily.
+"""
+import os
+
+from control_protocol import AtomicControlFile, CONTROL_FIELDS, format_control_lines, parse_control_lines
+
+
+class TransportError(Exception):
+    pass
+
+
+class Transport:
+    name = "transport"
+    owned_fields = None
+
+    def send(self, full, delta, values, music_action=None):
+        raise NotImplementedError
+
+    def send_at(self, apply_at, full, delta, values, music_action=None):
+        """Deliver an update to be applied at Unix time `apply_at` (far end's clock); default: now."""
+        self.send(full, delta, values, music_action)
+
+    def ping(self):
+        """The far end's clock reading (Unix time) for clock_sync, or None if unsupported."""
+        return None
+
+    def send_staged(self, stage_id, full, delta, values, music_action=None):
+        """Deliver an update that the far end holds until commit(stage_id); default: apply now."""
+        self.send(full, delta, values, music_action)
+
+    def commit(self, stage_id):
+        """Apply every staged update up to `stage_id`."""
+        pass
+
+    def send_system(self, command):
+        pass
+
+    def resync_needed(self):
+        """True once after the far end lost its state (e.g. reconnect)."""
+        return False
+
+    def current_values(self):
+        """Values the consumer currently holds, if the transport can tell."""
+        return None
+
+    def owned_snapshot(self, values):
+        """`values` for a snapshot consumer: everything, or only our fields over what it holds now."""
+        if self.owned_fields is None:
+            return values
+        snapshot = self.current_values()
+        if snapshot is None:
+            # Nothing published yet: there is nobody to overwrite
+            snapshot = dict(values)
+        snapshot.update({name: values[name] for name in self.owned_fields if name in values})
+        return snapshot
+
+    def close(self):
+        pass
+
+
+class FileTransport(Transport):
+    name = "file"
+
+    def __init__(self, path, owned_fields=None):
+        self.path = path
+        self.publisher = AtomicControlFile(path)
+        self.owned_fields = owned_fields
+
+    def send(self, full, delta, values, music_action=None):
+        # Temp file + rename: the visualizer never sees a half-written snapshot
+        self.publisher.publish(format_control_lines(self.owned_snapshot(values), music_action))
+
+    def send_at(self, apply_at, full, delta, values, music_action=None):
+        self.publisher.publish(format_control_lines(self.owned_snapshot(values), music_action) +
+                               [f"apply_at:{apply_at:.6f}"])
+
+    def send_system(self, command):
+        self.publisher.publish([f"system:{command}"])
+
+    def current_values(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return parse_control_lines(f.read())
+
+
+class ShmTransport(Transport):
+    name = "shm"
+
+    def __init__(self, path=None, owned_fields=None):
+        from control_shm import ShmControlWriter, SHM_PATH
+        self.writer = ShmControlWriter(path or SHM_PATH)
+        self.owned_fields = owned_fields
+
+    def send(self, full, delta, values, music_action=None):
+        self.writer.publish(self.owned_snapshot(values), music_action)
+
+    def send_at(self, apply_at, full, delta, values, music_action=None):
+        self.writer.publish(self.owned_snapshot(values), music_action, apply_at)
+
+    def current_values(self):
+        block = self.writer.read()
+        if block['seq'] == 0:
+            # Fresh block, all zeros: nothing published yet
+            return None
+        return {name: block[name] for name in CONTROL_FIELDS}
+
+    def close(self):
+        self.writer.close()
+
+
+class UdpTransport(Transport):
+    name = "udp"
+
+    def __init__(self, host, port=None):
+        from osc import DEFAULT_PORT, OscClient
+        self.client = OscClient(host, port or DEFAULT_PORT)
+        self.ping_seq = 0
+
+    def send(self, full, delta, values, music_action=None):
+        from osc import control_messages
+        # One datagram per update; the Pi coalesces to its frame rate
+        try:
+            self.client.send_bundle(control_messages(delta, music_action))
+        except OSError as e:
+            raise TransportError(str(e))
+
+    def send_at(self, apply_at, full, delta, values, music_action=None):
+        from osc import control_messages, to_timetag
+        try:
+            self.client.send_bundle(control_messages(delta, music_action), to_timetag(apply_at))
+        except OSError as e:
+            raise TransportError(str(e))
+
+    def ping(self):
+        from osc import OscError
+        self.ping_seq = (self.ping_seq + 1) & 0x7FFFFFFF
+        try:
+            return self.client.ping(self.ping_seq)
+        except (OSError, OscError):
+            return None
+
+    def subscribe_telemetry(self, listener, name):
+        """Ask the listener on the Pi to stream telemetry to `listener` (renew within the lease)."""
+        try:
+            listener.watch(self.client.address[0], name)
+            self.client.send("/lumius/telemetry", listener.port)
+        except OSError as e:
+            raise TransportError(str(e))
+
+    def send_staged(self, stage_id, full, delta, values, music_action=None):
+        from osc import control_messages
+        try:
+            self.client.send_bundle([("/lumius/stage", (stage_id,))] + control_messages(delta, music_action))
+        except OSError as e:
+            raise TransportError(str(e))
+
+    def commit(self, stage_id):
+        try:
+            self.client.send("/lumius/commit", stage_id)
+        except OSError as e:
+            raise TransportError(str(e))
+
+    def send_system(self, command):
+        self.client.send("/lumius/system", command)
+
+    def close(self):
+        self.client.close()
+
+
+class SshTransport(Transport):
+    name = "ssh"
+
+    def __init__(self, host, user, password, control_file, on_telemetry=None):
+        from ssh_channel import PersistentControlChannel
+        # One long-lived channel for the whole session; updates are streamed down it
+        self.channel = PersistentControlChannel(host, user, password, control_file,
+                                                on_telemetry=on_telemetry)
+        self.channel.open()
+        self.reconnected = False
+
+    def send(self, full, delta, values, music_action=None):
+        lines = format_control_lines(delta, music_action)
+        if full:
+            lines.insert(0, "full:1")
+        self._send_frame(lines)
+
+    def send_at(self, apply_at, full, delta, values, music_action=None):
+        lines = format_control_lines(delta, music_action)
+        if full:
+            lines.insert(0, "full:1")
+        # Passed through by the sink as a one-shot line of the published snapshot
+        self._send_frame(lines + [f"apply_at:{apply_at:.6f}"])
+
+    def ping(self):
+        from ssh_channel import ChannelError
+        try:
+            return self.channel.ping()
+        except ChannelError:
+            return None
+
+    def send_staged(self, stage_id, full, delta, values, music_action=None):
+        lines = format_control_lines(delta, music_action)
+        if full:
+            lines.insert(0, "full:1")
+        self._send_frame([f"stage:{stage_id}"] + lines)
+
+    def commit(self, stage_id):
+        self._send_frame([f"commit:{stage_id}"])
+
+    def _send_frame(self, lines):
+        from ssh_channel import ChannelError
+        reconnects = self.channel.reconnects
+        try:
+            self.channel.send("\n".join(lines))
+        except ChannelError as e:
+            raise TransportError(str(e))
+        if self.channel.reconnects != reconnects:
+            # The new sink starts empty and needs a full snapshot
+            self.reconnected = True
+
+    def send_system(self, command):
+        self.channel.send(f"system:{command}")
+
+    def exec(self, command):
+        return self.channel.exec(command)
+
+    def resync_needed(self):
+        reconnected, self.reconnected = self.reconnected, False
+        return reconnected
+
+    def close(self):
+        self.channel.close()
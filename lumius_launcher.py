@@ -5,10 +5,342 @@ import subprocess
 import threading
 import time
 import os
+import json
+import queue
+from collections import namedtuple
+import shutil
+import signal
 import sys
 
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+VISUALIZER_DIR = os.path.join(PROJECT_DIR, "openframeworks-visualizer")
+VISUALIZER_BIN = os.path.join(VISUALIZER_DIR, "bin", "openframeworks-visualizer")
+DATA_DIR = os.path.join(VISUALIZER_DIR, "bin", "data")
+CONTROL_PANEL = os.path.join(PROJECT_DIR, "control-app", "control_panel.py")
+GOVERNOR = os.path.join(PROJECT_DIR, "control-app", "governor.py")
+VISUALIZER_STATUS = os.path.join(DATA_DIR, "visualizer_status.txt")
+SUPERVISOR_STATUS = "/tmp/lumius_supervisor.json"
+BOOT_TRACE = "/tmp/lumius_boot_trace.jsonl"    # spans appended by every component
+BOOT_REPORT = "/tmp/lumius_boot_report.json"
+TRACE_ENV = "LUMIUS_BOOT_TRACE"                # same names as control-app/boot_trace.py
+SPAWN_ENV = "LUMIUS_BOOT_SPAWN"
+
+VISUALIZER_READY_TIMEOUT = 30   # shader compilation and camera probing on a cold Pi
+HEARTBEAT_TIMEOUT = 10          # visualizer writes its status file twice a second
+PROGRESS_DRAIN_MS = 30          # splash picks up progress events at ~30 Hz
+
+# One step of the loading pipeline; `time` is wall clock, `elapsed` since launch
+ProgressEvent = namedtuple("ProgressEvent", "time elapsed phase value status detail")
+
+# Files that go into the visualizer binary (shaders are loaded at runtime)
+BUILD_INPUTS = ["src", "Makefile", "config.make", "addons.make"]
+
+def newest_mtime(paths):
+    newest = 0
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for name in filenames:
+                    newest = max(newest, os.stat(os.path.join(dirpath, name)).st_mtime)
+        elif os.path.exists(path):
+            newest = max(newest, os.stat(path).st_mtime)
+    return newest
+
+def needs_build():
+    # Same rule as make, without paying for openFrameworks' makefile evaluation
+    if not os.path.exists(VISUALIZER_BIN):
+        return True
+    inputs = [os.path.join(VISUALIZER_DIR, name) for name in BUILD_INPUTS]
+    return newest_mtime(inputs) > os.stat(VISUALIZER_BIN).st_mtime
+
+def wait_until(predicate, timeout, interval=0.05):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+def read_status_file(path):
+    values = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                key, sep, value = line.strip().partition(":")
+                if sep:
+                    values[key] = value
+    except OSError:
+        pass
+    return values
+
+def visualizer_ready(process):
+    # First frame drawn by this process (a stale file from a previous run has another pid)
+    return read_status_file(VISUALIZER_STATUS).get("pid") == str(process.pid)
+
+def visualizer_healthy(process):
+    status = read_status_file(VISUALIZER_STATUS)
+    if status.get("pid") != str(process.pid):
+        return True
+    try:
+        return time.time() - float(status.get("time", 0)) < HEARTBEAT_TIMEOUT
+    except ValueError:
+        return True
+
+class SupervisedProcess:
+    def __init__(self, name, command, cwd=None, ready_check=None, health_check=None, exit_stops_all=False):
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.ready_check = ready_check      # None: ready once it survives start-up
+        self.health_check = health_check    # False while running: hung, gets restarted
+        self.exit_stops_all = exit_stops_all  # clean exit (code 0) ends the show
+        
+        self.process = None
+        self.started_at = None
+        self.ready = False
+        self.restarts = 0
+        self.last_exit = None
+        self.backoff = 0
+        self.restart_at = None
+        self.stopped = False
+        
+    def start(self):
+        # Spawn time lets the child report its own start-up cost in the boot report
+        env = dict(os.environ, **{SPAWN_ENV: repr(time.time())})
+        self.process = subprocess.Popen(self.command, cwd=self.cwd, env=env)
+        self.started_at = time.time()
+        self.ready = False
+        self.restart_at = None
+        self.stopped = False
+        
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+        
+    def uptime(self):
+        return time.time() - self.started_at if self.running() else 0.0
+        
+class ProcessSupervisor:
+    def __init__(self, status_path=SUPERVISOR_STATUS, poll_interval=0.1,
+                 min_backoff=0.5, max_backoff=10.0, stable_after=30.0, startup_settle=0.5):
+        self.processes = {}
+        self.status_path = status_path
+        self.poll_interval = poll_interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.startup_settle = startup_settle
+        self.lock = threading.RLock()
+        self.stopping = False
+        
+    def add(self, child):
+        self.processes[child.name] = child
+        return child
+        
+    def start(self, name):
+        with self.lock:
+            self.processes[name].start()
+            self.write_status()
+        
+    def check_ready(self, child):
+        if child.ready_check:
+            return child.ready_check(child.process)
+        return time.time() - child.started_at >= self.startup_settle
+        
+    def wait_ready(self, name, timeout):
+        """True once the child reports ready; False if it exits or times out."""
+        child = self.processes[name]
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                if not child.running():
+                    return False
+                if child.ready or self.check_ready(child):
+                    if not child.ready:
+                        child.ready = True
+                        self.write_status()
+                    return True
+            time.sleep(self.poll_interval / 2)
+        return False
+        
+    def poll_once(self):
+        with self.lock:
+            now = time.monotonic()
+            for child in self.processes.values():
+                if child.process is None or child.stopped or self.stopping:
+                    continue
+                
+                if child.restart_at is not None:
+                    if now >= child.restart_at:
+                        child.restarts += 1
+                        print(f"[supervisor] restarting {child.name} (restart #{child.restarts})")
+                        child.start()
+                        self.write_status()
+                    continue
+                
+                code = child.process.poll()
+                if code is None:
+                    if not child.ready and self.check_ready(child):
+                        child.ready = True
+                        self.write_status()
+                    elif child.ready and child.health_check and not child.health_check(child.process):
+                        print(f"[supervisor] {child.name} stopped responding, killing it")
+                        child.process.kill()
+                    continue
+                
+                # Exited
+                uptime = time.time() - child.started_at
+                child.last_exit = code
+                # Clean exit or pkill (the panel's shutdown) is deliberate, not a crash
+                if code in (0, -signal.SIGTERM, -signal.SIGINT):
+                    child.stopped = True
+                    self.write_status()
+                    if child.exit_stops_all:
+                        print(f"[supervisor] {child.name} closed, shutting down")
+                        self.stopping = True
+                        break
+                    print(f"[supervisor] {child.name} stopped")
+                    continue
+                
+                # Crash loops back off; a child that ran for a while restarts at once
+                if uptime >= self.stable_after:
+                    child.backoff = 0
+                child.restart_at = now + child.backoff
+                print(f"[supervisor] {child.name} exited with {code} after {uptime:.1f}s, "
+                      f"restarting in {child.backoff:.1f}s")
+                child.backoff = min(max(child.backoff * 2, self.min_backoff), self.max_backoff)
+                self.write_status()
+                
+    def run(self):
+        while not self.stopping:
+            self.poll_once()
+            time.sleep(self.poll_interval)
+        self.stop()
+        
+    def stop(self):
+        with self.lock:
+            self.stopping = True
+            children = [child for child in self.processes.values() if child.running()]
+            for child in children:
+                child.process.terminate()
+            for child in children:
+                try:
+                    child.process.wait(timeout=3)
+                except subprocess.TimeoutExpired:
+                    child.process.kill()
+            self.write_status()
+            
+    def status(self):
+        return {
+            name: {
+                "pid": child.process.pid if child.running() else None,
+                "running": child.running(),
+                "ready": child.ready,
+                "started_at": child.started_at,
+                "uptime": round(child.uptime(), 1),
+                "restarts": child.restarts,
+                "last_exit": child.last_exit,
+            }
+            for name, child in self.processes.items()
+        }
+        
+    def write_status(self):
+        # Written on state changes only; uptime = now - started_at for readers
+        try:
+            tmp_path = self.status_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"updated_at": time.time(), "processes": self.status()}, f, indent=2)
+            os.replace(tmp_path, self.status_path)
+        except OSError:
+            pass
+            
+def print_supervisor_status(path=SUPERVISOR_STATUS):
+    try:
+        with open(path) as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        print("No supervisor status (launcher not running?)")
+        return 1
+    for name, info in report["processes"].items():
+        uptime = time.time() - info["started_at"] if info["running"] and info["started_at"] else 0
+        state = "down" if not info["running"] else ("ready" if info["ready"] else "starting")
+        print(f"{name:<12} {state:<9} pid {info['pid'] or '-':<7} uptime {uptime:8.1f}s  "
+              f"restarts {info['restarts']}  last exit {info['last_exit']}")
+    return 0
+
+def read_trace(path):
+    spans = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    pass
+    except OSError:
+        pass
+    return spans
+
+def write_boot_report(boot_start, timeline, trace_path=BOOT_TRACE, report_path=BOOT_REPORT):
+    # Launcher phases run from one progress event to the next; children report their own spans
+    spans = []
+    if timeline:
+        spans.append({"component": "launcher", "phase": "tk_init", "start": boot_start, "end": timeline[0].time})
+    for event, following in zip(timeline, timeline[1:]):
+        spans.append({"component": "launcher", "phase": event.phase, "start": event.time, "end": following.time})
+    spans.extend(span for span in read_trace(trace_path) if span.get("start", 0) >= boot_start - 1)
+    spans.sort(key=lambda span: span["start"])
+    
+    report = {
+        "boot_start": boot_start,
+        "ready": None,
+        "time_to_first_frame": None,
+        "spans": [],
+        "phases": {},
+    }
+    for span in spans:
+        name = f"{span['component']}.{span['phase']}"
+        duration = round(span["end"] - span["start"], 4)
+        report["spans"].append({"component": span["component"], "phase": span["phase"],
+                                "offset": round(span["start"] - boot_start, 4), "duration": duration})
+        report["phases"][name] = round(report["phases"].get(name, 0) + duration, 4)
+        if name == "visualizer.first_frame" and report["time_to_first_frame"] is None:
+            report["time_to_first_frame"] = round(span["end"] - boot_start, 4)
+    ready = [event for event in timeline if event.phase == "ready"]
+    if ready:
+        report["ready"] = round(ready[0].time - boot_start, 4)
+    
+    tmp_path = report_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, report_path)
+    return report
+
+def print_boot_report(path=BOOT_REPORT):
+    try:
+        with open(path) as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        print(f"No boot report at {path}")
+        return 1
+    for span in report["spans"]:
+        bar = "#" * min(40, int(span["duration"] * 20))
+        print(f"+{span['offset']:7.3f}s  {span['component']:<11} {span['phase']:<22} "
+              f"{span['duration'] * 1000:9.1f} ms  {bar}")
+    first_frame = report.get("time_to_first_frame")
+    print(f"Time to first frame: {first_frame:.3f}s" if first_frame is not None else "Time to first frame: -")
+    print(f"System ready:        {report['ready']:.3f}s" if report.get("ready") is not None else "System ready:        -")
+    return 0
+
 class LumiusSplashScreen:
-    def __init__(self):
+    def __init__(self, supervisor):
+        self.supervisor = supervisor
+        self.launched = False
+        
+        # The loading thread never touches Tk: it queues events, the mainloop applies them
+        self.start_time = time.monotonic()
+        self.events = queue.Queue()
+        self.timeline = []
+        
         self.root = tk.Tk()
         self.root.title("LUMIUS")
         self.root.geometry("600x400")
@@ -22,6 +354,7 @@ class LumiusSplashScreen:
         self.root.overrideredirect(True)
         
         self.setup_splash()
+        self.root.after(PROGRESS_DRAIN_MS, self.drain_events)
         self.start_loading()
         
     def setup_splash(self):
@@ -89,13 +422,44 @@ class LumiusSplashScreen:
         border_frame2 = tk.Frame(self.root, bg='#00ffff', height=2)
         border_frame2.pack(side=tk.BOTTOM, fill=tk.X)
         
-    def update_progress(self, value, status, detail=""):
-        self.progress['value'] = value
-        self.status_label.config(text=status)
-        self.detail_label.config(text=detail)
-        self.root.update()
+    def update_progress(self, value, status, detail="", phase=None):
+        # Safe from any thread
+        elapsed = time.monotonic() - self.start_time
+        event = ProgressEvent(time.time(), elapsed, phase or status.strip(". ").lower(), value, status, detail)
+        self.timeline.append(event)
+        self.events.put(event)
+        
+    def drain_events(self):
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                self.log_timeline()
+                self.root.quit()
+                self.root.destroy()
+                return
+            self.progress['value'] = event.value
+            self.status_label.config(text=event.status)
+            self.detail_label.config(text=event.detail)
+        self.root.after(PROGRESS_DRAIN_MS, self.drain_events)
+        
+    def phase_durations(self):
+        """(phase, start offset, duration) for each step, measured up to the next event."""
+        phases = []
+        for event, following in zip(self.timeline, self.timeline[1:]):
+            phases.append((event.phase, event.elapsed, following.elapsed - event.elapsed))
+        return phases
+        
+    def log_timeline(self):
+        for phase, start, duration in self.phase_durations():
+            print(f"[boot] +{start:6.3f}s  {phase:<20} {duration * 1000:8.1f} ms")
+        if self.timeline:
+            print(f"[boot] total {self.timeline[-1].elapsed:.3f}s")
         
     def start_loading(self):
+        self.update_progress(0, "INITIALIZING SYSTEM...", phase="splash")
         # Start loading in separate thread
         loading_thread = threading.Thread(target=self.loading_sequence)
         loading_thread.daemon = True
@@ -104,76 +468,120 @@ class LumiusSplashScreen:
     def loading_sequence(self):
         try:
             # Step 1: Check dependencies
-            self.update_progress(10, "CHECKING DEPENDENCIES...", "Verifying system requirements")
-            time.sleep(1)
+            self.update_progress(10, "CHECKING DEPENDENCIES...", "Verifying system requirements", phase="dependencies")
+            build = needs_build()
+            missing = [path for path in (CONTROL_PANEL, DATA_DIR) if not os.path.exists(path)]
+            if build and not shutil.which("make"):
+                missing.append("make")
+            if missing:
+                self.update_progress(10, "MISSING DEPENDENCIES", ", ".join(os.path.basename(m) for m in missing), phase="error")
+                time.sleep(3)
+                self.close_splash()
+                return
             
-            # Step 2: Initialize audio system
-            self.update_progress(25, "INITIALIZING AUDIO MATRIX...", "Setting up audio processing")
-            time.sleep(1)
+            # Step 2: Launch control panel - it does not need the visualizer build,
+            # so it starts up while make runs
+            self.update_progress(25, "LAUNCHING CONTROL MATRIX...", "Starting control panel", phase="control_launch")
+            self.supervisor.start("control")
             
             # Step 3: Load shaders
-            self.update_progress(40, "LOADING NEURAL SHADERS...", "Compiling visual effects")
-            time.sleep(1)
+            shaders = [name for name in os.listdir(DATA_DIR) if name.endswith(".frag")]
+            self.update_progress(40, "LOADING NEURAL SHADERS...", f"{len(shaders)} visual effects found", phase="shaders")
             
-            # Step 4: Compile OpenFrameworks
-            self.update_progress(55, "COMPILING VISUAL ENGINE...", "Building OpenFrameworks application")
+            # Step 4: Compile OpenFrameworks, only when sources changed
+            if build:
+                self.update_progress(55, "COMPILING VISUAL ENGINE...", "Building OpenFrameworks application", phase="build")
+                result = subprocess.run(["make"], cwd=VISUALIZER_DIR, capture_output=True, text=True)
+                
+                if result.returncode != 0:
+                    print(result.stdout[-2000:], result.stderr[-2000:], sep="\n")
+                    self.update_progress(55, "COMPILATION ERROR", "Check console for details", phase="error")
+                    time.sleep(3)
+                    self.close_splash()
+                    return
+                self.update_progress(75, "VISUAL ENGINE READY...", "OpenFrameworks compiled successfully", phase="build_done")
+            else:
+                self.update_progress(75, "VISUAL ENGINE READY...", "Build up to date", phase="build_done")
             
-            # Actually compile the project
-            os.chdir("/home/adriel/picoEncoderProject/openframeworks-visualizer")
-            result = subprocess.run(["make"], capture_output=True, text=True)
+            # Step 5: Launch visualizer
+            self.update_progress(90, "LAUNCHING VISUAL ENGINE...", "Starting OpenFrameworks visualizer", phase="visualizer_launch")
+            self.supervisor.start("visualizer")
             
-            if result.returncode != 0:
-                self.update_progress(55, "COMPILATION ERROR", "Check console for details")
+            # Wait for the first frame heartbeat, not a fixed delay
+            self.update_progress(95, "LAUNCHING VISUAL ENGINE...", "Waiting for first frame", phase="visualizer_first_frame")
+            if not self.supervisor.wait_ready("visualizer", VISUALIZER_READY_TIMEOUT):
+                code = self.supervisor.processes["visualizer"].process.poll()
+                self.update_progress(95, "VISUAL ENGINE FAILED",
+                                     f"Exit code {code}" if code is not None else "No frame heartbeat",
+                                     phase="error")
+                time.sleep(3)
+                self.close_splash()
+                return
+            if not self.supervisor.wait_ready("control", VISUALIZER_READY_TIMEOUT):
+                code = self.supervisor.processes["control"].process.poll()
+                self.update_progress(95, "CONTROL MATRIX FAILED", f"Exit code {code}", phase="error")
                 time.sleep(3)
                 self.close_splash()
                 return
-                
-            self.update_progress(75, "VISUAL ENGINE READY...", "OpenFrameworks compiled successfully")
-            time.sleep(1)
-            
-            # Step 5: Launch applications
-            self.update_progress(85, "LAUNCHING CONTROL MATRIX...", "Starting control panel")
-            
-            # Launch control panel
-            control_process = subprocess.Popen([
-                sys.executable, 
-                "/home/adriel/picoEncoderProject/control-app/control_panel.py"
-            ])
-            
-            time.sleep(2)
-            
-            self.update_progress(95, "LAUNCHING VISUAL ENGINE...", "Starting OpenFrameworks visualizer")
-            
-            # Launch visualizer
-            visualizer_process = subprocess.Popen([
-                "./bin/openframeworks-visualizer"
-            ], cwd="/home/adriel/picoEncoderProject/openframeworks-visualizer")
             
-            time.sleep(1)
+            # Frame-time feedback only makes sense once frames are coming
+            self.supervisor.start("governor")
             
-            self.update_progress(100, "LUMIUS SYSTEM ACTIVE", "All systems operational")
-            time.sleep(2)
+            self.launched = True
+            self.update_progress(100, "LUMIUS SYSTEM ACTIVE", "All systems operational", phase="ready")
             
             # Close splash screen
             self.close_splash()
             
         except Exception as e:
-            self.update_progress(0, "SYSTEM ERROR", f"Error: {str(e)}")
+            self.update_progress(0, "SYSTEM ERROR", f"Error: {str(e)}", phase="error")
             time.sleep(3)
             self.close_splash()
             
     def close_splash(self):
-        self.root.quit()
-        self.root.destroy()
+        # Closed by drain_events on the Tk thread
+        self.events.put(None)
         
     def run(self):
         self.root.mainloop()
 
 if __name__ == "__main__":
+    if "--status" in sys.argv[1:]:
+        sys.exit(print_supervisor_status())
+    if "--boot-report" in sys.argv[1:]:
+        sys.exit(print_boot_report())
+        
     print("◢ LUMIUS SYSTEM LAUNCHER ◣")
     print("Starting visual system...")
     
-    splash = LumiusSplashScreen()
+    # Children append their start-up spans here (inherited environment)
+    boot_start = time.time()
+    open(BOOT_TRACE, "w").close()
+    os.environ[TRACE_ENV] = BOOT_TRACE
+    
+    supervisor = ProcessSupervisor()
+    supervisor.add(SupervisedProcess("control", [sys.executable, CONTROL_PANEL],
+                                     cwd=os.path.dirname(CONTROL_PANEL), exit_stops_all=True))
+    supervisor.add(SupervisedProcess("visualizer", [VISUALIZER_BIN], cwd=VISUALIZER_DIR,
+                                     ready_check=visualizer_ready, health_check=visualizer_healthy))
+    supervisor.add(SupervisedProcess("governor", [sys.executable, GOVERNOR], cwd=os.path.dirname(GOVERNOR)))
+    
+    splash = LumiusSplashScreen(supervisor)
     splash.run()
     
-    print("LUMIUS system launched successfully!")
\ No newline at end of file
+    report = write_boot_report(boot_start, splash.timeline)
+    if report["time_to_first_frame"] is not None:
+        print(f"[boot] first frame after {report['time_to_first_frame']:.3f}s (report: {BOOT_REPORT})")
+    
+    if not splash.launched:
+        supervisor.stop()
+        sys.exit(1)
+        
+    print("LUMIUS system launched successfully!")
+    
+    # Keep crashed components running until the control panel is closed
+    signal.signal(signal.SIGTERM, lambda signum, frame: setattr(supervisor, "stopping", True))
+    try:
+        supervisor.run()
+    except KeyboardInterrupt:
+        supervisor.stop()
\ No newline at end of file
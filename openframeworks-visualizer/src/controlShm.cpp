@@ -0,0 +1,86 @@
+#include "controlShm.h"
+
+#include <atomic>
+#include <cstring>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+//--------------------------------------------------------------
+ControlShmReader::ControlShmReader() {
+	block = nullptr;
+	lastSeq = 0;
+}
+
+//--------------------------------------------------------------
+ControlShmReader::~ControlShmReader() {
+	close();
+}
+
+//--------------------------------------------------------------
+bool ControlShmReader::open(const std::string & path) {
+	close();
+	
+	int fd = ::open(path.c_str(), O_RDONLY);
+	if(fd < 0) {
+		return false;
+	}
+	
+	struct stat st;
+	if(fstat(fd, &st) != 0 || st.st_size < (off_t)sizeof(LumiusControlBlock)) {
+		::close(fd);
+		return false;
+	}
+	
+	void * mapped = mmap(nullptr, sizeof(LumiusControlBlock), PROT_READ, MAP_SHARED, fd, 0);
+	::close(fd);
+	if(mapped == MAP_FAILED) {
+		return false;
+	}
+	
+	const LumiusControlBlock * candidate = (const LumiusControlBlock *)mapped;
+	if(candidate->magic != LUMIUS_CONTROL_MAGIC || candidate->version != LUMIUS_CONTROL_VERSION) {
+		munmap(mapped, sizeof(LumiusControlBlock));
+		return false;
+	}
+	
+	block = candidate;
+	lastSeq = 0;
+	return true;
+}
+
+//--------------------------------------------------------------
+void ControlShmReader::close() {
+	if(block != nullptr) {
+		munmap((void *)block, sizeof(LumiusControlBlock));
+		block = nullptr;
+	}
+}
+
+//--------------------------------------------------------------
+bool ControlShmReader::poll(LumiusControlBlock & out) {
+	if(block == nullptr) {
+		return false;
+	}
+	
+	// Per-frame cost when idle: one load and compare
+	uint32_t seqBefore = __atomic_load_n(&block->seq, __ATOMIC_ACQUIRE);
+	if(seqBefore == lastSeq || (seqBefore & 1u)) {
+		return false;
+	}
+	
+	LumiusControlBlock copy;
+	memcpy(&copy, (const void *)block, sizeof(copy));
+	std::atomic_thread_fence(std::memory_order_acquire);
+	
+	// Writer touched the block while we copied: try again next frame
+	uint32_t seqAfter = __atomic_load_n(&block->seq, __ATOMIC_ACQUIRE);
+	if(seqAfter != seqBefore) {
+		return false;
+	}
+	
+	lastSeq = seqBefore;
+	out = copy;
+	return true;
+}
@@ -0,0 +1,49 @@
+#pragma once
+
+#include <stdint.h>
+#include <string>
+
+// Shared-memory control block written by control-app/control_shm.py.
+// Layout must stay in sync with the Python side (little-endian, 64 bytes).
+#define LUMIUS_CONTROL_SHM_PATH "/dev/shm/lumius_control"
+#define LUMIUS_CONTROL_MAGIC 0x434D554Cu   // 'LUMC'
+#define LUMIUS_CONTROL_VERSION 1
+
+struct LumiusControlBlock {
+	uint32_t magic;
+	uint16_t version;
+	uint16_t size;
+	uint32_t seq;        // seqlock counter, odd while the panel is writing
+	int32_t effect;
+	int32_t rgbR;        // 0-255
+	int32_t rgbG;
+	int32_t rgbB;
+	float speed;
+	float intensity;
+	float volume;        // 0-100
+	uint32_t musicCmd;   // 0 none, 1 play, 2 pause
+	uint32_t musicSeq;   // bumped on every music command
+	uint32_t writerPid;
+	uint32_t applyAtSec;  // scheduled apply time (Unix seconds), 0 = apply now
+	uint32_t applyAtUsec;
+	uint8_t reserved[4];
+};
+
+static_assert(sizeof(LumiusControlBlock) == 64, "control block layout changed");
+
+class ControlShmReader {
+	public:
+		ControlShmReader();
+		~ControlShmReader();
+		
+		bool open(const std::string & path = LUMIUS_CONTROL_SHM_PATH);
+		void close();
+		bool isOpen() const { return block != nullptr; }
+		
+		// Copies a new consistent snapshot into out; false if nothing changed
+		bool poll(LumiusControlBlock & out);
+		
+	private:
+		const LumiusControlBlock * block;
+		uint32_t lastSeq;
+};
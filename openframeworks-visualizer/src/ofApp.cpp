@@ -4,6 +4,18 @@
 
 //--------------------------------------------------------------
 void ofApp::setup(){
+    // Boot report spans (only when started by lumius_launcher.py with LUMIUS_BOOT_TRACE set)
+    const char * tracePath = getenv("LUMIUS_BOOT_TRACE");
+    bootTracePath = tracePath ? tracePath : "";
+    bootFirstFrameRecorded = false;
+    bootCameraRecorded = false;
+    setupStartTime = wallClock();
+    const char * spawnTime = getenv("LUMIUS_BOOT_SPAWN");
+    if(spawnTime) {
+        // Dynamic loading, GL context and window creation before setup()
+        recordBootSpan("startup", atof(spawnTime), setupStartTime);
+    }
+    
     // OpenGL and general settings
     ofDisableArbTex(); // Force GL_TEXTURE_2D
     ofEnableAlphaBlending();
@@ -14,6 +26,8 @@ void ofApp::setup(){
     ofSetFullscreen(true);
     ofSetEscapeQuitsApp(false);
 
+    double phaseStart = wallClock();
+    
     // Load music with default OpenAL player
     if(music.load("music.wav")) {
         music.setLoop(true);
@@ -36,6 +50,8 @@ void ofApp::setup(){
     // Initialize audio analysis buffers and levels
     audioBuffer.resize(256);
     audioLevel = bassLevel = midLevel = highLevel = 0.0;
+    recordBootSpan("audio_setup", phaseStart, wallClock());
+    phaseStart = wallClock();
 
     // Load Shaders
     shader1.load("shader1");
@@ -61,6 +77,8 @@ void ofApp::setup(){
     matrixEffect.load("matrixEffect"); // Matrix ASCII effect
 
     currentShader = 1;
+    recordBootSpan("shader_compile", phaseStart, wallClock());
+    phaseStart = wallClock();
 
     // Setup plane for shader rendering
     plane.set(ofGetWidth(), ofGetHeight());
@@ -97,6 +115,7 @@ void ofApp::setup(){
     auraPing.begin(); ofClear(0,0,0,255); auraPing.end();
     auraPong.begin(); ofClear(0,0,0,255); auraPong.end();
     matrixEdgeFbo.begin(); ofClear(0,0,0,255); matrixEdgeFbo.end();
+    recordBootSpan("fbo_alloc", phaseStart, wallClock());
 
     // Initialize control variables
     speedMultiplier = 1.0;
@@ -106,6 +125,22 @@ void ofApp::setup(){
     rgbR = rgbG = rgbB = 1.0;
     cameraActive = false;
     lastMusicCommand = "";
+    lastControlSeq = -1;
+    lastMusicSeq = 0;
+    controlFileIno = 0;
+    controlFileSize = -1;
+    controlFileMtimeSec = 0;
+    controlFileMtimeNsec = 0;
+    lastStatusWrite = -1.0f;
+    requestedEffect = 1;
+    requestedIntensity = 1.0;
+    qualityLevel = 0;
+    renderScale = 1.0f;
+    intensityCap = 0.0f;
+    qualityFileMtimeSec = 0;
+    qualityFileMtimeNsec = 0;
+    renderWidth = ofGetWidth();
+    renderHeight = ofGetHeight();
     
     // Initialize audio smoothing variables
     smoothedLevel = bassSmooth = midSmooth = highSmooth = 0.0f;
@@ -138,11 +173,56 @@ void ofApp::setup(){
 
     ofLogNotice("Setup") << "Audio-reactive shader visualizer ready!";
     ofLogNotice("Controls") << "Press keys 1-6 to switch shaders or use control panel.";
+    
+    setupEndTime = wallClock();
+    recordBootSpan("setup", setupStartTime, setupEndTime);
+}
+
+//--------------------------------------------------------------
+double ofApp::wallClock() {
+	// Epoch seconds, comparable with the Python side of the boot report
+	return std::chrono::duration<double>(std::chrono::system_clock::now().time_since_epoch()).count();
+}
+
+//--------------------------------------------------------------
+void ofApp::recordBootSpan(const string & phase, double start, double end) {
+	if(bootTracePath.empty()) {
+		return;
+	}
+	// One line per span, appended like the Python components do (see control-app/boot_trace.py)
+	std::ofstream trace(bootTracePath, std::ios::app);
+	trace << std::fixed << std::setprecision(6)
+	      << "{\"component\": \"visualizer\", \"phase\": \"" << phase
+	      << "\", \"start\": " << start << ", \"end\": " << end
+	      << ", \"pid\": " << getpid() << "}\n";
 }
 //--------------------------------------------------------------
 void ofApp::update(){
+	// Frame time percentiles for telemetry; bounded if status writes stall
+	if(frameTimesMs.size() < 1024) {
+		frameTimesMs.push_back(ofGetLastFrameTime() * 1000.0f);
+	}
 	analyzeAudio();
+	
+	// Shared-memory control block (local panel with --backend shm); map lazily once the panel created it
+	if(!controlShm.isOpen() && ofGetFrameNum() % 30 == 0) {
+		if(controlShm.open()) {
+			ofLogNotice("Control") << "Shared-memory control block mapped";
+		}
+	}
+	applyDueControls(false);
+	LumiusControlBlock controlBlock;
+	if(controlShm.poll(controlBlock)) {
+		PendingControl pending;
+		pending.applyAt = controlBlock.applyAtSec + controlBlock.applyAtUsec / 1e6;
+		pending.fromShm = true;
+		pending.block = controlBlock;
+		queueControl(pending);
+	}
 	readControlFile();
+	if(ofGetFrameNum() % 15 == 0) {
+		readQualityFile();
+	}
 	
 	// Update camera only if active
 	if(cameraActive) {
@@ -161,81 +241,293 @@ highSmooth    = smoothing * highSmooth    + (1.0f - smoothing) * highLevel;
 
 //--------------------------------------------------------------
 void ofApp::readControlFile() {
-	ofFile controlFile("control.txt");
-	if(controlFile.exists()) {
-		ofBuffer buffer = controlFile.readToBuffer();
-		for(auto line : buffer.getLines()) {
-			vector<string> parts = ofSplitString(line, ":");
-			if(parts.size() == 2) {
-				if(parts[0] == "effect") {
-					int newEffect = ofToInt(parts[1]);
-					if(newEffect >= 1 && newEffect <= 8) {
-						// Check if switching to/from camera shader
-						bool needsCamera = (newEffect == 5 || newEffect == 6 || newEffect == 7 || newEffect == 8);
-						bool currentNeedsCamera = (currentShader == 5 || currentShader == 6 || currentShader == 7 || currentShader == 8);
-						
-						if(needsCamera && !currentNeedsCamera) {
-							activateCamera();
-						} else if(!needsCamera && currentNeedsCamera) {
-							deactivateCamera();
-						}
-						
-						// Map effects to shaders
-						if(newEffect <= 4) {
-							currentShader = newEffect;
-						} else if(newEffect == 5) {
-							currentShader = 5; // Camera effect
-						} else if(newEffect == 6) {
-							currentShader = 6; // Fire edge effect
-						} else if(newEffect == 7) {
-							currentShader = 7; // Matrix effect
-						} else if(newEffect == 8) {
-							currentShader = 8; // Psychedelic effect
-						} else {
-							currentShader = 1; // Other effects -> Shader1 for now
-						}
-						currentEffect = newEffect;
-					}
-				}
-				else if(parts[0] == "rgb_r") {
-					rgbR = ofClamp(ofToInt(parts[1]), 0, 255) / 255.0;
-				}
-				else if(parts[0] == "rgb_g") {
-					rgbG = ofClamp(ofToInt(parts[1]), 0, 255) / 255.0;
-				}
-				else if(parts[0] == "rgb_b") {
-					rgbB = ofClamp(ofToInt(parts[1]), 0, 255) / 255.0;
-				}
-				else if(parts[0] == "speed") {
-					speedMultiplier = ofToFloat(parts[1]);
-				}
-				else if(parts[0] == "intensity") {
-					intensityMultiplier = ofToFloat(parts[1]);
-				}
-				else if(parts[0] == "volume") {
-					volumeLevel = ofToFloat(parts[1]) / 100.0;
-					music.setVolume(volumeLevel);
-				}
-				else if(parts[0] == "music") {
-					// Only process if command changed
-					if(parts[1] != lastMusicCommand) {
-						lastMusicCommand = parts[1];
-						
-						if(parts[1] == "play") {
-							music.setPaused(false);
-							if(!music.isPlaying()) {
-								music.play();
-							}
-							ofLogNotice("Music") << "Playing";
-						}
-						else if(parts[1] == "pause") {
-							music.setPaused(true);
-							ofLogNotice("Music") << "Paused";
-						}
-					}
+	string path = ofToDataPath("control.txt");
+	struct stat st;
+	if(stat(path.c_str(), &st) != 0) {
+		return;
+	}
+	
+	// Snapshots are renamed into place, so an unchanged inode/size/mtime means nothing new to parse
+	if(st.st_ino == controlFileIno && st.st_size == controlFileSize &&
+	   st.st_mtim.tv_sec == controlFileMtimeSec && st.st_mtim.tv_nsec == controlFileMtimeNsec) {
+		return;
+	}
+	
+	ofBuffer buffer = ofBufferFromFile(path);
+	vector<pair<string, string>> entries;
+	long seq = -1;
+	long endSeq = -1;
+	double applyAt = 0.0;
+	for(auto line : buffer.getLines()) {
+		vector<string> parts = ofSplitString(line, ":");
+		if(parts.size() == 2) {
+			if(parts[0] == "seq") {
+				seq = ofToInt(parts[1]);
+			} else if(parts[0] == "end") {
+				endSeq = ofToInt(parts[1]);
+			} else if(parts[0] == "apply_at") {
+				applyAt = ofToDouble(parts[1]);
+			} else {
+				entries.push_back(make_pair(parts[0], parts[1]));
+			}
+		}
+	}
+	
+	// Framed snapshot without its matching end line: writer still busy, retry next frame
+	if(seq >= 0 && endSeq != seq) {
+		return;
+	}
+	
+	// Every rename brings a new inode: an equal seq from another writer is still a new snapshot
+	bool sameFile = st.st_ino == controlFileIno;
+	controlFileIno = st.st_ino;
+	controlFileSize = st.st_size;
+	controlFileMtimeSec = st.st_mtim.tv_sec;
+	controlFileMtimeNsec = st.st_mtim.tv_nsec;
+	
+	// Same snapshot re-published (e.g. touched): already applied
+	if(seq >= 0 && seq == lastControlSeq && sameFile) {
+		return;
+	}
+	lastControlSeq = seq;
+	
+	PendingControl pending;
+	pending.applyAt = applyAt;
+	pending.fromShm = false;
+	pending.entries = entries;
+	queueControl(pending);
+}
+
+//--------------------------------------------------------------
+void ofApp::queueControl(PendingControl pending) {
+	double now = wallClock();
+	// Seconds ahead is not a schedule but a wrong clock estimate: apply now
+	if(pending.applyAt <= 0.0 || pending.applyAt <= now || pending.applyAt > now + 2.0) {
+		// Immediate: anything still scheduled is older, so it goes first
+		applyDueControls(true);
+		applyPendingControl(pending);
+		return;
+	}
+	// Bounded: a stuck schedule never grows without limit
+	if(pendingControls.size() >= 64) {
+		applyPendingControl(pendingControls.front());
+		pendingControls.pop_front();
+	}
+	pendingControls.push_back(pending);
+}
+
+//--------------------------------------------------------------
+void ofApp::applyDueControls(bool all) {
+	if(pendingControls.empty()) {
+		return;
+	}
+	double now = wallClock();
+	// In arrival order; a later update never overtakes an earlier one
+	while(!pendingControls.empty() && (all || pendingControls.front().applyAt <= now)) {
+		applyPendingControl(pendingControls.front());
+		pendingControls.pop_front();
+	}
+}
+
+//--------------------------------------------------------------
+void ofApp::applyPendingControl(const PendingControl & pending) {
+	if(pending.fromShm) {
+		applyControlBlock(pending.block);
+		return;
+	}
+	for(auto & entry : pending.entries) {
+		applyControlValue(entry.first, entry.second);
+	}
+}
+
+//--------------------------------------------------------------
+void ofApp::applyControlValue(const string & key, const string & value) {
+	// Snapshots repeat unchanged fields: only act on values that actually differ
+	if(key == "effect") {
+		int newEffect = ofToInt(value);
+		if(newEffect != requestedEffect) {
+			requestedEffect = newEffect;
+			applyEffect(governedEffect(newEffect));
+		}
+	}
+	else if(key == "rgb_r") {
+		rgbR = ofClamp(ofToInt(value), 0, 255) / 255.0;
+	}
+	else if(key == "rgb_g") {
+		rgbG = ofClamp(ofToInt(value), 0, 255) / 255.0;
+	}
+	else if(key == "rgb_b") {
+		rgbB = ofClamp(ofToInt(value), 0, 255) / 255.0;
+	}
+	else if(key == "speed") {
+		speedMultiplier = ofToFloat(value);
+	}
+	else if(key == "intensity") {
+		requestedIntensity = ofToFloat(value);
+		intensityMultiplier = intensityCap > 0 ? min(requestedIntensity, intensityCap) : requestedIntensity;
+	}
+	else if(key == "volume") {
+		float newVolume = ofToFloat(value) / 100.0f;
+		if(newVolume != volumeLevel) {
+			volumeLevel = newVolume;
+			music.setVolume(volumeLevel);
+		}
+	}
+	else if(key == "music") {
+		applyMusicCommand(value);
+	}
+}
+
+//--------------------------------------------------------------
+void ofApp::readQualityFile() {
+	string path = ofToDataPath("quality.txt");
+	struct stat st;
+	if(stat(path.c_str(), &st) != 0) {
+		return;
+	}
+	if(st.st_mtim.tv_sec == qualityFileMtimeSec && st.st_mtim.tv_nsec == qualityFileMtimeNsec) {
+		return;
+	}
+	
+	ofBuffer buffer = ofBufferFromFile(path);
+	long seq = -1;
+	long endSeq = -1;
+	int level = 0;
+	float scale = 1.0f;
+	float cap = 0.0f;
+	map<int, int> substitutions;
+	for(auto line : buffer.getLines()) {
+		vector<string> parts = ofSplitString(line, ":");
+		if(parts.size() != 2) {
+			continue;
+		}
+		if(parts[0] == "seq") {
+			seq = ofToInt(parts[1]);
+		} else if(parts[0] == "end") {
+			endSeq = ofToInt(parts[1]);
+		} else if(parts[0] == "quality") {
+			level = ofToInt(parts[1]);
+		} else if(parts[0] == "render_scale") {
+			scale = ofClamp(ofToFloat(parts[1]), 0.25f, 1.0f);
+		} else if(parts[0] == "intensity_cap") {
+			cap = ofToFloat(parts[1]);
+		} else if(parts[0] == "effect_map") {
+			// "6=5,7=5"
+			for(auto & pair : ofSplitString(parts[1], ",", true, true)) {
+				vector<string> effects = ofSplitString(pair, "=");
+				if(effects.size() == 2) {
+					substitutions[ofToInt(effects[0])] = ofToInt(effects[1]);
 				}
+			}
+		}
+	}
+	if(seq < 0 || seq != endSeq) {
+		// Caught mid-write; the next check reads it again
+		return;
+	}
+	qualityFileMtimeSec = st.st_mtim.tv_sec;
+	qualityFileMtimeNsec = st.st_mtim.tv_nsec;
+	
+	if(level != qualityLevel) {
+		ofLogNotice("Quality") << "Level " << qualityLevel << " -> " << level
+			<< " (scale " << scale << ", intensity cap " << cap << ")";
+	}
+	qualityLevel = level;
+	renderScale = scale;
+	intensityCap = cap;
+	effectMap = substitutions;
+	applyQuality();
+}
+
+//--------------------------------------------------------------
+void ofApp::applyQuality() {
+	intensityMultiplier = intensityCap > 0 ? min(requestedIntensity, intensityCap) : requestedIntensity;
+	int effect = governedEffect(requestedEffect);
+	if(effect != currentEffect) {
+		applyEffect(effect);
+	}
+}
+
+//--------------------------------------------------------------
+int ofApp::governedEffect(int effect) {
+	auto substitute = effectMap.find(effect);
+	return substitute != effectMap.end() ? substitute->second : effect;
+}
 
+//--------------------------------------------------------------
+void ofApp::applyEffect(int newEffect) {
+	if(newEffect >= 1 && newEffect <= 8) {
+		// Check if switching to/from camera shader
+		bool needsCamera = (newEffect == 5 || newEffect == 6 || newEffect == 7 || newEffect == 8);
+		bool currentNeedsCamera = (currentShader == 5 || currentShader == 6 || currentShader == 7 || currentShader == 8);
+		
+		if(needsCamera && !currentNeedsCamera) {
+			activateCamera();
+		} else if(!needsCamera && currentNeedsCamera) {
+			deactivateCamera();
+		}
+		
+		// Map effects to shaders
+		if(newEffect <= 4) {
+			currentShader = newEffect;
+		} else if(newEffect == 5) {
+			currentShader = 5; // Camera effect
+		} else if(newEffect == 6) {
+			currentShader = 6; // Fire edge effect
+		} else if(newEffect == 7) {
+			currentShader = 7; // Matrix effect
+		} else if(newEffect == 8) {
+			currentShader = 8; // Psychedelic effect
+		} else {
+			currentShader = 1; // Other effects -> Shader1 for now
+		}
+		currentEffect = newEffect;
+	}
+}
+
+//--------------------------------------------------------------
+void ofApp::applyMusicCommand(const string & command) {
+	// Only process if command changed
+	if(command != lastMusicCommand) {
+		lastMusicCommand = command;
+		
+		if(command == "play") {
+			music.setPaused(false);
+			if(!music.isPlaying()) {
+				music.play();
 			}
+			ofLogNotice("Music") << "Playing";
+		}
+		else if(command == "pause") {
+			music.setPaused(true);
+			ofLogNotice("Music") << "Paused";
+		}
+	}
+}
+
+//--------------------------------------------------------------
+void ofApp::applyControlBlock(const LumiusControlBlock & block) {
+	if(block.effect != requestedEffect) {
+		requestedEffect = block.effect;
+		applyEffect(governedEffect(block.effect));
+	}
+	rgbR = ofClamp(block.rgbR, 0, 255) / 255.0;
+	rgbG = ofClamp(block.rgbG, 0, 255) / 255.0;
+	rgbB = ofClamp(block.rgbB, 0, 255) / 255.0;
+	speedMultiplier = block.speed;
+	requestedIntensity = block.intensity;
+	intensityMultiplier = intensityCap > 0 ? min(requestedIntensity, intensityCap) : requestedIntensity;
+	float newVolume = block.volume / 100.0f;
+	if(newVolume != volumeLevel) {
+		volumeLevel = newVolume;
+		music.setVolume(volumeLevel);
+	}
+	if(block.musicSeq != lastMusicSeq) {
+		lastMusicSeq = block.musicSeq;
+		if(block.musicCmd == 1) {
+			applyMusicCommand("play");
+		} else if(block.musicCmd == 2) {
+			applyMusicCommand("pause");
 		}
 	}
 }
@@ -304,7 +596,7 @@ void ofApp::drawShader() {
     if (currentShader <= 4) {
         currentShaderPtr->begin();
         currentShaderPtr->setUniform1f("time", ofGetElapsedTimef() * speedMultiplier);
-        currentShaderPtr->setUniform2f("resolution", ofGetWidth(), ofGetHeight());
+        currentShaderPtr->setUniform2f("resolution", renderWidth, renderHeight);
         currentShaderPtr->setUniform1f("audioLevel", audioLevel * intensityMultiplier);
         currentShaderPtr->setUniform1f("bassLevel", bassLevel * intensityMultiplier);
         currentShaderPtr->setUniform1f("midLevel", midLevel * intensityMultiplier);
@@ -317,7 +609,7 @@ void ofApp::drawShader() {
         // Render shader5 directly without bufferization
         currentShaderPtr->begin();
         currentShaderPtr->setUniform1f("time", ofGetElapsedTimef() * speedMultiplier);
-        currentShaderPtr->setUniform2f("resolution", ofGetWidth(), ofGetHeight());
+        currentShaderPtr->setUniform2f("resolution", renderWidth, renderHeight);
         currentShaderPtr->setUniform1f("audioLevel", audioLevel * intensityMultiplier);
         currentShaderPtr->setUniform1f("bassLevel", bassLevel * intensityMultiplier);
         currentShaderPtr->setUniform1f("midLevel", midLevel * intensityMultiplier);
@@ -446,7 +738,7 @@ void ofApp::drawShader() {
 		}
 		
 		psychedelic.begin();
-		psychedelic.setUniform2f("resolution", ofGetWidth(), ofGetHeight());
+		psychedelic.setUniform2f("resolution", renderWidth, renderHeight);
 		psychedelic.setUniformTexture("cameraTexture", vidGrabber.getTexture(), 0);
 		psychedelic.setUniform1f("time", ofGetElapsedTimef()); // Pure time
 		psychedelic.setUniform1f("speed", speedMultiplier); // Speed as separate uniform
@@ -462,7 +754,78 @@ void ofApp::drawShader() {
 
 //--------------------------------------------------------------
 void ofApp::draw(){
-	drawShader();
+	// Governor's render scale: single-pass shaders render into a smaller FBO stretched to the screen.
+	// The multi-pass effects (6, 7) keep their own FBO chain; the governor swaps them out instead.
+	if(renderScale < 0.99f && currentShader != 6 && currentShader != 7) {
+		int w = max(1, (int)(ofGetWidth() * renderScale));
+		int h = max(1, (int)(ofGetHeight() * renderScale));
+		if(!renderFbo.isAllocated() || (int)renderFbo.getWidth() != w || (int)renderFbo.getHeight() != h) {
+			renderFbo.allocate(w, h, GL_RGBA);
+		}
+		renderWidth = w;
+		renderHeight = h;
+		renderFbo.begin();
+		ofClear(0, 0, 0, 255);
+		ofPushMatrix();
+		ofScale(w / (float)ofGetWidth(), h / (float)ofGetHeight());
+		drawShader();
+		ofPopMatrix();
+		renderFbo.end();
+		renderFbo.draw(0, 0, ofGetWidth(), ofGetHeight());
+	} else {
+		renderWidth = ofGetWidth();
+		renderHeight = ofGetHeight();
+		drawShader();
+	}
+	
+	if(!bootFirstFrameRecorded) {
+		recordBootSpan("first_frame", setupEndTime, wallClock());
+		bootFirstFrameRecorded = true;
+	}
+	
+	// Heartbeat and telemetry: first frame immediately, then twice a second
+	float now = ofGetElapsedTimef();
+	if(lastStatusWrite < 0 || now - lastStatusWrite >= 0.5f) {
+		writeStatusFile();
+		lastStatusWrite = now;
+	}
+}
+
+//--------------------------------------------------------------
+void ofApp::writeStatusFile() {
+	string path = ofToDataPath("visualizer_status.txt");
+	string tmpPath = path + ".tmp";
+	
+	ofBuffer status;
+	status.append("pid:" + ofToString(getpid()) + "\n");
+	status.append("frame:" + ofToString(ofGetFrameNum()) + "\n");
+	status.append("time:" + ofToString(wallClock(), 3) + "\n");
+	status.append("fps:" + ofToString(ofGetFrameRate(), 1) + "\n");
+	status.append("control_seq:" + ofToString(lastControlSeq) + "\n");
+	status.append("effect:" + ofToString(currentEffect) + "\n");
+	status.append("shader:" + ofToString(currentShader) + "\n");
+	status.append("quality:" + ofToString(qualityLevel) + "\n");
+	status.append("camera:" + ofToString(cameraActive && vidGrabber.isInitialized() ? 1 : 0) + "\n");
+	status.append("music:" + string(music.isPlaying() ? "playing" : "paused") + "\n");
+	status.append("bass:" + ofToString(bassSmooth, 3) + "\n");
+	status.append("mid:" + ofToString(midSmooth, 3) + "\n");
+	status.append("high:" + ofToString(highSmooth, 3) + "\n");
+	
+	// Frame time percentiles over the frames since the last write
+	if(!frameTimesMs.empty()) {
+		std::sort(frameTimesMs.begin(), frameTimesMs.end());
+		size_t last = frameTimesMs.size() - 1;
+		status.append("frame_ms_p50:" + ofToString(frameTimesMs[last * 50 / 100], 2) + "\n");
+		status.append("frame_ms_p95:" + ofToString(frameTimesMs[last * 95 / 100], 2) + "\n");
+		status.append("frame_ms_p99:" + ofToString(frameTimesMs[last * 99 / 100], 2) + "\n");
+		status.append("frame_ms_max:" + ofToString(frameTimesMs[last], 2) + "\n");
+		frameTimesMs.clear();
+	}
+	
+	// Rename into place so readers never see a partial file
+	if(ofBufferToFile(tmpPath, status)) {
+		std::rename(tmpPath.c_str(), path.c_str());
+	}
 }
 
 //--------------------------------------------------------------
@@ -569,6 +932,8 @@ void ofApp::dragEvent(ofDragInfo dragInfo){
 //--------------------------------------------------------------
 void ofApp::activateCamera() {
 	if(!cameraActive) {
+		double cameraStart = wallClock();
+		
 		// Kill any processes using the camera
 		system("sudo pkill -f v4l2 2>/dev/null || true");
 		system("sudo fuser -k /dev/video0 2>/dev/null || true");
@@ -580,6 +945,10 @@ void ofApp::activateCamera() {
 		if(vidGrabber.setup(320, 240)) { // Lower resolution for performance
 			ofLogNotice("Camera") << "Camera activated successfully";
 			cameraActive = true;
+			if(!bootCameraRecorded) {
+				recordBootSpan("camera_setup", cameraStart, wallClock());
+				bootCameraRecorded = true;
+			}
 		} else {
 			ofLogError("Camera") << "Failed to activate camera";
 		}
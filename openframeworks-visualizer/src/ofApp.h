@@ -1,6 +1,12 @@
 #pragma once
 
 #include "ofMain.h"
+#include <sys/stat.h>
+#include <unistd.h>
+#include <fstream>
+#include <iomanip>
+#include <deque>
+#include "controlShm.h"
 
 class ofApp : public ofBaseApp{
 	
@@ -75,6 +81,61 @@ class ofApp : public ofBaseApp{
 		
 		// Control file reading
 		void readControlFile();
+		void applyControlValue(const string & key, const string & value);
+		void applyControlBlock(const LumiusControlBlock & block);
+		void applyEffect(int newEffect);
+		void applyMusicCommand(const string & command);
+		
+		// Shared-memory control transport
+		ControlShmReader controlShm;
+		uint32_t lastMusicSeq;
+		
+		// Scheduled updates (apply_at): held until the first frame at or after their time,
+		// so several Pis with synchronized clocks switch on the same frame
+		struct PendingControl {
+			double applyAt;
+			bool fromShm;
+			LumiusControlBlock block;
+			vector<pair<string, string>> entries;
+		};
+		deque<PendingControl> pendingControls;
+		void queueControl(PendingControl pending);
+		void applyPendingControl(const PendingControl & pending);
+		void applyDueControls(bool all);
+		
+		// Last consumed control snapshot (skip unchanged/duplicate files)
+		long lastControlSeq;
+		ino_t controlFileIno;
+		off_t controlFileSize;
+		time_t controlFileMtimeSec;
+		long controlFileMtimeNsec;
+		
+		// Quality caps from governor.py (quality.txt), applied on top of the panel's values
+		void readQualityFile();
+		void applyQuality();
+		int governedEffect(int effect);
+		int requestedEffect;          // what the panel asked for
+		float requestedIntensity;
+		int qualityLevel;             // 0 = full quality
+		float renderScale;            // single-pass shaders render at this fraction of the screen
+		float intensityCap;           // 0 = no cap
+		map<int, int> effectMap;      // expensive effect -> cheaper stand-in
+		time_t qualityFileMtimeSec;
+		long qualityFileMtimeNsec;
+		ofFbo renderFbo;
+		float renderWidth, renderHeight;
+		
+		// Status/heartbeat file read by lumius_launcher.py and the panel's telemetry
+		void writeStatusFile();
+		float lastStatusWrite;
+		vector<float> frameTimesMs;  // frame durations since the last status write
+		
+		// Boot report spans (LUMIUS_BOOT_TRACE)
+		double wallClock();
+		void recordBootSpan(const string & phase, double start, double end);
+		string bootTracePath;
+		double setupStartTime, setupEndTime;
+		bool bootFirstFrameRecorded, bootCameraRecorded;
 		
 		// Shader management
 		void drawShader();
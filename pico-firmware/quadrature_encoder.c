@@ -1,10 +1,30 @@
 /**
  * HSV Encoder Controller for Raspberry Pi Pico
  * 100 PPR Encoder with exclusive button selection
+ *
+ * Output framing (switch at runtime by sending one byte over USB serial):
+ *   'b' - binary packets (default), reported at up to 1 kHz
+ *   't' - text blocks for debugging, reported at up to 20 Hz:
+ *           Hue: 120.0 / S: 100.0 / V: 50.0 / Mode: HUE / ---
+ *
+ * Binary packet, 16 bytes, little endian:
+ *   0  u8[2] sync        0xA5 0x5A
+ *   2  u16   seq         increments per packet (gaps = lost packets)
+ *   4  i8    mode        0 HUE, 1 SAT, 2 VAL, -1 DISABLE
+ *   5  u8    buttons     bit0 hue, bit1 sat, bit2 val
+ *   6  i16   delta       raw encoder steps applied since the previous packet
+ *   8  u16   hue         tenths of a degree, 0-3600
+ *   10 u16   saturation  tenths of a percent, 0-1000
+ *   12 u16   value       tenths of a percent, 0-1000
+ *   14 u16   crc         CRC-16/CCITT-FALSE over bytes 2-13
+ * Mirrored by the decoder in control-app/pico_bridge.py.
  */
 
 #include <stdio.h>
+#include <stdint.h>
+#include <assert.h>
 #include "pico/stdlib.h"
+#include "pico/stdio_usb.h"
 #include "hardware/pio.h"
 #include "hardware/timer.h"
 #include "hardware/gpio.h"
@@ -14,18 +34,91 @@
 // HSV Controller for 100 PPR Encoder
 // H: 0-360 degrees, S: 0-100%, V: 0-100%
 // Only one property can be selected at a time
+// Values are kept in tenths (one encoder step) so no float drift builds up
 
 typedef struct {
-    float hue;        // 0-360 degrees
-    float saturation; // 0-100 percent
-    float value;      // 0-100 percent (brightness)
+    int hue;        // 0-3600 tenths of a degree
+    int saturation; // 0-1000 tenths of a percent
+    int value;      // 0-1000 tenths of a percent (brightness)
 } hsv_t;
 
+#define FRAME_SYNC0 0xA5
+#define FRAME_SYNC1 0x5A
+
+#define POLL_INTERVAL_US 1000          // encoder/button sampling
+#define TEXT_REPORT_INTERVAL_US 50000  // text mode keeps the old 20 Hz pace
+
+typedef struct __attribute__((packed)) {
+    uint8_t sync[2];
+    uint16_t seq;
+    int8_t mode;
+    uint8_t buttons;
+    int16_t delta;
+    uint16_t hue;
+    uint16_t saturation;
+    uint16_t value;
+    uint16_t crc;
+} hsv_packet_t;
+
+static_assert(sizeof(hsv_packet_t) == 16, "hsv_packet_t layout changed");
+
+static uint16_t crc16_ccitt(const uint8_t *data, size_t len) {
+    uint16_t crc = 0xFFFF;
+    for (size_t i = 0; i < len; i++) {
+        crc ^= (uint16_t)data[i] << 8;
+        for (int bit = 0; bit < 8; bit++) {
+            crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+        }
+    }
+    return crc;
+}
+
+static void send_packet(uint16_t seq, int mode, uint8_t buttons, int delta, const hsv_t *hsv) {
+    hsv_packet_t pkt;
+    pkt.sync[0] = FRAME_SYNC0;
+    pkt.sync[1] = FRAME_SYNC1;
+    pkt.seq = seq;
+    pkt.mode = (int8_t)mode;
+    pkt.buttons = buttons;
+    // Clamp: a huge spin between packets must not wrap around
+    pkt.delta = (int16_t)(delta > INT16_MAX ? INT16_MAX : (delta < INT16_MIN ? INT16_MIN : delta));
+    pkt.hue = (uint16_t)hsv->hue;
+    pkt.saturation = (uint16_t)hsv->saturation;
+    pkt.value = (uint16_t)hsv->value;
+    pkt.crc = crc16_ccitt((const uint8_t *)&pkt + 2, sizeof(pkt) - 4);
+
+    fwrite(&pkt, 1, sizeof(pkt), stdout);
+    fflush(stdout);
+}
+
+static void print_text(int mode, const hsv_t *hsv) {
+    printf("Hue: %.1f\n", hsv->hue / 10.0);
+    printf("S: %.1f\n", hsv->saturation / 10.0);
+    printf("V: %.1f\n", hsv->value / 10.0);
+    
+    if (mode >= 0) {
+        const char* modes[] = {"HUE", "SAT", "VAL"};
+        printf("Mode: %s\n", modes[mode]);
+    } else {
+        printf("Mode: DISABLE\n");
+    }
+    printf("---\n");
+}
+
+static int clamp(int v, int lo, int hi) {
+    return v < lo ? lo : (v > hi ? hi : v);
+}
+
 int main() {
-    hsv_t hsv = {0.0, 100.0, 50.0};
+    hsv_t hsv = {0, 1000, 500};
     int delta, old_encoder = 0;
-    float last_hue = -1, last_sat = -1, last_val = -1;
+    int pending_delta = 0;
+    hsv_t last = {-1, -1, -1};
     int last_mode = -1;
+    int reported_mode = -2;
+    bool binary = true;
+    uint16_t seq = 0;
+    absolute_time_t next_text_report = get_absolute_time();
     
     const uint PIN_AB = 20;
     const uint BT_HUE = 13;        // RED - Hue control
@@ -33,7 +126,8 @@ int main() {
     const uint BT_VALUE = 11;      // YELLOW - Value control
 
     stdio_init_all();
-    printf("HSV Controller Ready\n");
+    // Binary packets may contain 0x0A: no LF -> CRLF translation
+    stdio_set_translate_crlf(&stdio_usb, false);
 
     gpio_init(BT_HUE);
     gpio_set_dir(BT_HUE, GPIO_IN);
@@ -53,6 +147,16 @@ int main() {
     quadrature_encoder_program_init(pio, sm, PIN_AB, 0);
 
     while (1) {
+        // Host commands: 'b' binary, 't' text
+        int cmd = getchar_timeout_us(0);
+        if (cmd == 'b' || cmd == 't') {
+            binary = (cmd == 'b');
+            if (!binary) {
+                printf("HSV Controller Ready\n");
+            }
+            reported_mode = -2; // report current state in the new framing
+        }
+        
         bool hue_btn = gpio_get(BT_HUE);
         bool sat_btn = gpio_get(BT_SATURATION);
         bool val_btn = gpio_get(BT_VALUE);
@@ -71,53 +175,46 @@ int main() {
             current_mode = last_mode; // Keep previous mode when multiple buttons
         }
         
+        // Always track the counter so turns made with no button held are not
+        // applied in one jump when a button is pressed later
+        int raw_encoder = quadrature_encoder_get_count(pio, sm);
+        delta = raw_encoder - old_encoder;
+        old_encoder = raw_encoder;
+        
         // Process encoder only when exactly one button is active
-        if (active_count == 1) {
-            int raw_encoder = quadrature_encoder_get_count(pio, sm);
-            delta = raw_encoder - old_encoder;
-            old_encoder = raw_encoder;
-            
-            if (delta != 0) {
-                switch (current_mode) {
-                    case 0: // Hue: 0.1° per step
-                        hsv.hue += delta * 0.1;
-                        if (hsv.hue < 0) hsv.hue = 0;
-                        if (hsv.hue > 360) hsv.hue = 360;
-                        break;
-                    case 1: // Saturation: 0.1% per step
-                        hsv.saturation += delta * 0.1;
-                        if (hsv.saturation < 0) hsv.saturation = 0;
-                        if (hsv.saturation > 100) hsv.saturation = 100;
-                        break;
-                    case 2: // Value: 0.1% per step
-                        hsv.value += delta * 0.1;
-                        if (hsv.value < 0) hsv.value = 0;
-                        if (hsv.value > 100) hsv.value = 100;
-                        break;
-                }
+        if (active_count == 1 && delta != 0) {
+            pending_delta += delta;
+            switch (current_mode) {
+                case 0: // Hue: 0.1° per step
+                    hsv.hue = clamp(hsv.hue + delta, 0, 3600);
+                    break;
+                case 1: // Saturation: 0.1% per step
+                    hsv.saturation = clamp(hsv.saturation + delta, 0, 1000);
+                    break;
+                case 2: // Value: 0.1% per step
+                    hsv.value = clamp(hsv.value + delta, 0, 1000);
+                    break;
             }
         }
+        last_mode = current_mode;
         
         // Output when values or mode changes
-        if (hsv.hue != last_hue || hsv.saturation != last_sat || hsv.value != last_val || current_mode != last_mode) {
-            printf("Hue: %.1f\n", hsv.hue);
-            printf("S: %.1f\n", hsv.saturation);
-            printf("V: %.1f\n", hsv.value);
-            
-            if (current_mode >= 0) {
-                const char* modes[] = {"HUE", "SAT", "VAL"};
-                printf("Mode: %s\n", modes[current_mode]);
-            } else {
-                printf("Mode: DISABLE\n");
-            }
-            printf("---\n");
-            
-            last_hue = hsv.hue;
-            last_sat = hsv.saturation;
-            last_val = hsv.value;
-            last_mode = current_mode;
+        bool changed = hsv.hue != last.hue || hsv.saturation != last.saturation ||
+                       hsv.value != last.value || current_mode != reported_mode;
+        if (changed && binary) {
+            uint8_t buttons = hue_btn | (sat_btn << 1) | (val_btn << 2);
+            send_packet(seq++, current_mode, buttons, pending_delta, &hsv);
+            pending_delta = 0;
+            last = hsv;
+            reported_mode = current_mode;
+        } else if (changed && time_reached(next_text_report)) {
+            print_text(current_mode, &hsv);
+            next_text_report = make_timeout_time_us(TEXT_REPORT_INTERVAL_US);
+            pending_delta = 0;
+            last = hsv;
+            reported_mode = current_mode;
         }
         
-        sleep_ms(50);
+        sleep_us(POLL_INTERVAL_US);
     }
 }
\ No newline at end of file